@@ -0,0 +1,150 @@
+# Per-client admission control for expensive endpoints
+# Token bucket per client (known API key, else IP): ADMISSION_RATE tokens/second up
+# to ADMISSION_BURST. Each route costs a number of tokens, so a chain scan or
+# an AI verification drains the bucket faster than a lookup. Over-budget
+# requests get 429 with Retry-After before the view runs.
+# Only keys listed in ADMISSION_API_KEYS get their own bucket; any other key is
+# ignored, so a client can't mint fresh buckets by sending random keys.
+# Behind proxies, ADMISSION_TRUST_PROXY is the number of them in front of the
+# app; the client is the X-Forwarded-For entry the outermost one appended.
+# Entries to its left are written by the client and never used.
+# Buckets live in an LRU dict: O(1) per request, bounded by max_clients, and
+# idle clients (whose bucket would be full again anyway) are dropped.
+
+import collections
+import math
+import os
+import threading
+import time
+
+from flask import jsonify, request
+
+ENABLED = os.environ.get('ADMISSION_ENABLED', '1').lower() not in ('0', 'false', 'no')
+DEFAULT_RATE = float(os.environ.get('ADMISSION_RATE', 10))
+DEFAULT_BURST = float(os.environ.get('ADMISSION_BURST', 30))
+MAX_CLIENTS = 100000
+API_KEY_HEADER = 'X-API-Key'
+API_KEYS = frozenset(key.strip() for key in os.environ.get('ADMISSION_API_KEYS', '').split(',') if key.strip())
+
+
+class TokenBuckets:
+    """
+    Token buckets keyed by client, least recently used first
+    A client idle for burst / rate seconds has a full bucket, which is the
+    same as having no entry, so those entries are expired from the LRU end
+    """
+
+    def __init__(self, rate=DEFAULT_RATE, burst=DEFAULT_BURST, max_clients=MAX_CLIENTS):
+        self.rate = rate
+        self.burst = burst
+        self.max_clients = max_clients
+        self.idle_seconds = burst / rate
+        self._buckets = collections.OrderedDict()  # key -> [tokens, updated]
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._buckets)
+
+    def take(self, key, cost, now=None):
+        """0.0 if admitted (tokens deducted), else seconds until `cost` tokens are available"""
+        now = time.monotonic() if now is None else now
+        cost = min(cost, self.burst)  # Otherwise the request could never be admitted
+        with self._lock:
+            self._expire(now)
+            bucket = self._buckets.get(key)
+            if bucket is None:
+                bucket = self._buckets[key] = [self.burst, now]
+                if len(self._buckets) > self.max_clients:
+                    self._buckets.popitem(last=False)
+            else:
+                self._buckets.move_to_end(key)
+                bucket[0] = min(self.burst, bucket[0] + (now - bucket[1]) * self.rate)
+                bucket[1] = now
+            if bucket[0] >= cost:
+                bucket[0] -= cost
+                return 0.0
+            return (cost - bucket[0]) / self.rate
+
+    def _expire(self, now):
+        # Only the oldest entries can be idle; stops at the first recent one
+        cutoff = now - self.idle_seconds
+        while self._buckets:
+            key, (_, updated) = next(iter(self._buckets.items()))
+            if updated > cutoff:
+                break
+            del self._buckets[key]
+
+
+class AdmissionController:
+    """
+    before_request hook enforcing per-client token buckets
+    costs: { endpoint: tokens }; unlisted endpoints cost default_cost, 0 is free
+    """
+
+    def __init__(self, app=None, costs=None, default_cost=1, rate=DEFAULT_RATE, burst=DEFAULT_BURST,
+                 max_clients=MAX_CLIENTS, enabled=None, trust_proxy=None, api_keys=None):
+        self.enabled = ENABLED if enabled is None else enabled
+        self.api_keys = API_KEYS if api_keys is None else frozenset(api_keys)
+        self.costs = dict(costs or {})
+        self.default_cost = default_cost
+        self.buckets = TokenBuckets(rate, burst, max_clients)
+        if trust_proxy is None:
+            trust_proxy = os.environ.get('ADMISSION_TRUST_PROXY', '0').lower()
+            trust_proxy = 1 if trust_proxy in ('true', 'yes') else 0 if trust_proxy in ('false', 'no') else int(trust_proxy)
+        # Number of trusted proxies (True means one)
+        self.trust_proxy = int(trust_proxy)
+        self._stats = collections.defaultdict(collections.Counter)
+        self._stats_lock = threading.Lock()
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        if not self.enabled:
+            return
+        for endpoint in ('admission_stats', 'metrics', 'profiler_status', 'profiler_arm', 'profiler_profile'):
+            self.costs.setdefault(endpoint, 0)
+        app.before_request(self.before_request)
+        app.add_url_rule('/api/admission/stats', 'admission_stats', self.stats_view)
+
+    def client_key(self):
+        api_key = request.headers.get(API_KEY_HEADER)
+        if api_key and api_key in self.api_keys:
+            return 'key:' + api_key
+        if self.trust_proxy:
+            forwarded = [hop.strip() for hop in request.headers.get('X-Forwarded-For', '').split(',') if hop.strip()]
+            if len(forwarded) >= self.trust_proxy:
+                return 'ip:' + forwarded[-self.trust_proxy]
+        return 'ip:' + (request.remote_addr or 'unknown')
+
+    def before_request(self):
+        if request.method == 'OPTIONS':
+            return None  # CORS preflights are answered without running the view
+        endpoint = request.endpoint or 'unmatched'
+        cost = self.costs.get(endpoint, self.default_cost)
+        if cost <= 0:
+            return None
+        wait = self.buckets.take(self.client_key(), cost)
+        with self._stats_lock:
+            self._stats[endpoint]['rejected' if wait else 'admitted'] += 1
+        if not wait:
+            return None
+        retry_after = max(1, math.ceil(wait))
+        response = jsonify({"error": "Too many requests", "retry_after": retry_after})
+        response.status_code = 429
+        response.headers['Retry-After'] = str(retry_after)
+        return response
+
+    def stats(self):
+        with self._stats_lock:
+            endpoints = {name: dict(counter) for name, counter in self._stats.items()}
+        return {
+            "rate": self.buckets.rate,
+            "burst": self.buckets.burst,
+            "active_clients": len(self.buckets),
+            "costs": self.costs,
+            "default_cost": self.default_cost,
+            "endpoints": endpoints
+        }
+
+    def stats_view(self):
+        return jsonify(self.stats())
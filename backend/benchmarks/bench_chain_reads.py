@@ -0,0 +1,100 @@
+# Benchmark: server_fixed on-chain read endpoints against a populated chain
+# Builds the chain_fixture dataset at each size, points server_fixed at it and
+# times the list / stats / per-project endpoints, counting JSON-RPC calls per
+# request so the per-item call loops are visible next to their latency.
+#
+# Requires web3 with eth-tester (pip install "web3[tester]"), or a Hardhat
+# node via --rpc-url.
+#
+# Usage: python benchmarks/bench_chain_reads.py [--projects 10,50] [--rounds 20]
+#            [--rpc-url http://127.0.0.1:8545]
+
+import argparse
+import os
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+os.environ.setdefault('LOG_LEVEL', 'WARNING')
+# Measures handler cost; repeated scans from one client would be rate limited
+os.environ.setdefault('ADMISSION_ENABLED', '0')
+# Every request should do its chain reads, not answer from the aggregate cache
+os.environ.setdefault('SWR_ENABLED', '0')
+
+import server_fixed  # noqa: E402
+from chain_fixture import DEFAULT_MANIFEST, build  # noqa: E402
+
+
+class RpcCounter:
+    """web3 middleware counting JSON-RPC requests"""
+
+    def __init__(self):
+        self.calls = 0
+
+    def __call__(self, make_request, w3):
+        def middleware(method, params):
+            self.calls += 1
+            return make_request(method, params)
+        return middleware
+
+
+def attach(fixture):
+    """Point server_fixed's module globals at the fixture chain"""
+    counter = RpcCounter()
+    fixture.w3.middleware_onion.add(counter, name='bench_rpc_counter')
+    server_fixed.w3 = fixture.w3
+    server_fixed.contracts.bind(fixture.w3)
+    server_fixed.monitor.bind(fixture.w3)
+    server_fixed.contracts.register('FundTracker', abi=fixture.abi, address=fixture.address)
+    return counter
+
+
+def endpoints(project_ids):
+    yield 'GET /api/projects', '/api/projects'
+    yield 'GET /api/stats', '/api/stats'
+    for project_id in project_ids:
+        yield 'GET /api/projects/<id>', f'/api/projects/{project_id}'
+        yield 'GET /api/tenders/<id>', f'/api/tenders/{project_id}'
+        yield 'GET /api/milestones/<id>', f'/api/milestones/{project_id}'
+    yield 'GET /api/export/projects', '/api/export/projects'
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--projects', default='10,50', help='Comma-separated dataset sizes')
+    parser.add_argument('--rounds', type=int, default=20)
+    parser.add_argument('--rpc-url', help='Hardhat node instead of in-process eth-tester')
+    args = parser.parse_args()
+
+    client = server_fixed.app.test_client()
+    print(f"{'projects':>8} {'endpoint':<28} {'median ms':>10} {'rpc calls':>10}")
+    for size in [int(n) for n in args.projects.split(',')]:
+        started = time.perf_counter()
+        fixture = build(args.rpc_url, str(DEFAULT_MANIFEST) if args.rpc_url else None,
+                        projects=size, tenders=2, milestones=3, expenditures=2, seed=1)
+        print(f"# {size} projects ready in {time.perf_counter() - started:.1f}s ({fixture.counts})")
+        counter = attach(fixture)
+
+        results = {}
+        for label, path in endpoints([1, max(1, size // 2), size]):
+            samples, calls = results.setdefault(label, ([], []))
+            for _ in range(args.rounds):
+                before = counter.calls
+                started = time.perf_counter()
+                response = client.get(path)
+                response.get_data()
+                samples.append(time.perf_counter() - started)
+                calls.append(counter.calls - before)
+                if response.status_code != 200:
+                    raise SystemExit(f"{path}: HTTP {response.status_code} {response.get_data(as_text=True)[:200]}")
+        for label, (samples, calls) in results.items():
+            print(f"{size:>8} {label:<28} {statistics.median(samples) * 1000:>10.2f} "
+                  f"{statistics.median(calls):>10.0f}")
+
+
+if __name__ == '__main__':
+    main()
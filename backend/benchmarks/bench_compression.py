@@ -0,0 +1,79 @@
+# Benchmark: response compression cost vs bytes saved
+# Builds server_simple-style project lists (document metadata arrays included)
+# at several sizes and measures ratio and CPU time for each encoder setting.
+#
+# Only Flask, orjson and (optionally) Brotli needed.
+#
+# Usage: python benchmarks/bench_compression.py [--projects 10,100,1000] [--rounds 10]
+
+import argparse
+import gzip
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from compression import brotli  # noqa: E402
+from json_provider import dumps_bytes  # noqa: E402
+
+
+def document(i, k, kind):
+    return {
+        'name': f'{kind} {k + 1} for project {i}.pdf',
+        'url': f'https://gateway.pinata.cloud/ipfs/Qm{(i * 31 + k) % 10 ** 12:044d}',
+        'type': 'application/pdf',
+        'ipfsHash': f'Qm{(i * 31 + k) % 10 ** 12:044d}',
+        'size': 10000 + (i * k) % 90000
+    }
+
+
+def make_projects(count):
+    return [
+        {
+            'id': f'proj-{i}',
+            'name': f'Project {i}',
+            'description': 'Road resurfacing, drainage and street lighting works',
+            'category': 'Infrastructure',
+            'location': f'Ward {i % 50}',
+            'budget': 500000 + i,
+            'status': 'Created',
+            'tender_documents': [document(i, k, 'Tender') for k in range(5)],
+            'design_files': [document(i, k, 'Design') for k in range(3)],
+            'geo_tagged_photos': [document(i, k, 'Photo') for k in range(8)],
+            'expected_quality_report': [document(i, k, 'Quality') for k in range(2)],
+            'created_at': '2025-10-01T10:00:00'
+        }
+        for i in range(1, count + 1)
+    ]
+
+
+def encoders():
+    yield 'gzip-1', lambda data: gzip.compress(data, compresslevel=1, mtime=0)
+    yield 'gzip-6', lambda data: gzip.compress(data, compresslevel=6, mtime=0)
+    yield 'gzip-9', lambda data: gzip.compress(data, compresslevel=9, mtime=0)
+    if brotli is not None:
+        for quality in (1, 5, 7):
+            yield f'br-{quality}', lambda data, q=quality: brotli.compress(data, quality=q)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='response compression benchmark')
+    parser.add_argument('--projects', default='10,100,1000', help='comma-separated list sizes')
+    parser.add_argument('--rounds', type=int, default=10)
+    args = parser.parse_args()
+
+    for count in (int(n) for n in args.projects.split(',')):
+        body = dumps_bytes(make_projects(count))
+        print(f"{count} projects: {len(body) / 1024:.1f} KiB uncompressed")
+        for name, encode in encoders():
+            started = time.process_time()
+            for _ in range(args.rounds):
+                out = encode(body)
+            cpu = (time.process_time() - started) / args.rounds
+            print(f"   {name:8s} {len(out) / 1024:9.1f} KiB   ratio {len(out) / len(body):6.3f}   "
+                  f"cpu {cpu * 1000:8.2f} ms   ({len(body) / cpu / 2 ** 20:7.1f} MiB/s)")
+
+
+if __name__ == '__main__':
+    main()
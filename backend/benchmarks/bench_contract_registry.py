@@ -0,0 +1,100 @@
+# Benchmark: per-request contract overhead, rebuilt vs cached vs registry codecs
+# A canned JSON-RPC provider answers every eth_call with an encoded FundTracker
+# project, so only the Python side is measured: building the web3 contract,
+# encoding the call and decoding the result. One "request" is what
+# /api/projects/<id> does: get the contract, then --calls getProject calls.
+#
+# Only web3 needed (the ABI comes from the Hardhat artifact).
+#
+# Usage: python benchmarks/bench_contract_registry.py [--requests 100] [--calls 1]
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from eth_abi import encode  # noqa: E402
+from web3 import Web3  # noqa: E402
+from web3.providers.base import JSONBaseProvider  # noqa: E402
+
+from contract_registry import ContractRegistry, FunctionCodec, artifact_path, read_abi  # noqa: E402
+
+ADDRESS = Web3.to_checksum_address('0x' + '11' * 20)
+PROJECT = (1, 'Ward 12 drainage', 10 ** 19, 10 ** 19, 3 * 10 ** 18, '0x' + '22' * 20, b'\x01' * 32, 1,
+           'Ward 12, Pune', 'Maharashtra', 'Pune', 'Pune', '411001', 18520400, 73856700, 1700000000, 2,
+           True, 'Site preparation', 'Foundation', 'Structure', 'Utilities', 'Finishing & handover')
+
+
+class CannedProvider(JSONBaseProvider):
+    """Answers eth_call with one fixed result"""
+
+    def __init__(self, result):
+        super().__init__()
+        self.result = '0x' + result.hex()
+
+    def make_request(self, method, params):
+        if method == 'eth_chainId':
+            return {'jsonrpc': '2.0', 'id': 1, 'result': '0x539'}
+        return {'jsonrpc': '2.0', 'id': 1, 'result': self.result}
+
+    def is_connected(self, show_traceback=False):
+        return True
+
+
+def per_request_us(fn, requests, repeats=5):
+    """Best of `repeats` runs, microseconds per call"""
+    fn()
+    best = float('inf')
+    for _ in range(repeats):
+        started = time.perf_counter()
+        for _ in range(requests):
+            fn()
+        best = min(best, time.perf_counter() - started)
+    return best / requests * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--requests', type=int, default=100)
+    parser.add_argument('--calls', type=int, default=1, help='getProject calls per request')
+    args = parser.parse_args()
+
+    abi = read_abi(artifact_path('FundTracker'))
+    get_project = FunctionCodec(next(item for item in abi if item.get('name') == 'getProject'))
+    w3 = Web3(CannedProvider(encode(get_project.output_types, [PROJECT])))
+    registry = ContractRegistry(w3)
+    registry.register('FundTracker', abi=abi, address=ADDRESS)
+    cached = w3.eth.contract(address=ADDRESS, abi=abi)
+
+    def rebuilt():
+        contract = w3.eth.contract(address=ADDRESS, abi=abi)
+        for i in range(args.calls):
+            contract.functions.getProject(i + 1).call()
+
+    def cached_instance():
+        for i in range(args.calls):
+            cached.functions.getProject(i + 1).call()
+
+    def registry_call():
+        contract = registry.get('FundTracker')
+        for i in range(args.calls):
+            contract.call('getProject', i + 1)
+
+    assert cached.functions.getProject(1).call() == registry.get('FundTracker').call('getProject', 1)
+
+    print(f"{len(abi)} ABI entries, {args.calls} getProject call(s) per request, {args.requests} requests")
+    baseline = None
+    for label, fn in (('w3.eth.contract per request', rebuilt),
+                      ('cached contract instance', cached_instance),
+                      ('registry entry + codec', registry_call)):
+        us = per_request_us(fn, args.requests)
+        baseline = baseline or us
+        print(f"  {label:<30} {us:>10.1f} us/request  ({baseline / us:.1f}x)")
+    lookups = per_request_us(lambda: registry.get('FundTracker'), args.requests * 100)
+    print(f"  {'registry.get() lookup':<30} {lookups:>10.2f} us")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,67 @@
+# Benchmark: geofence lookups ("which project sites is this photo near")
+# Generates project sites across India and random submission points, then
+# times single lookups, batched lookups and a brute-force scan.
+#
+# No database needed; only NumPy.
+#
+# Usage: python benchmarks/bench_geofence.py [--sites 50000] [--points 20000]
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from geofence import GeofenceIndex, haversine_meters  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description='geofence lookup benchmark')
+    parser.add_argument('--sites', type=int, default=50000)
+    parser.add_argument('--points', type=int, default=20000)
+    parser.add_argument('--radius', type=float, default=500, help='site radius in metres')
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(args.seed)
+    site_lats = rng.uniform(8, 35, args.sites)
+    site_lons = rng.uniform(68, 97, args.sites)
+
+    # Half the submissions are taken close to a site, the rest anywhere
+    near = rng.integers(0, args.sites, args.points // 2)
+    point_lats = np.concatenate([site_lats[near] + rng.normal(0, 0.003, len(near)),
+                                 rng.uniform(8, 35, args.points - len(near))])
+    point_lons = np.concatenate([site_lons[near] + rng.normal(0, 0.003, len(near)),
+                                 rng.uniform(68, 97, args.points - len(near))])
+
+    started = time.perf_counter()
+    index = GeofenceIndex(range(args.sites), site_lats, site_lons, np.full(args.sites, args.radius))
+    print(f"Indexed {args.sites} sites in {(time.perf_counter() - started) * 1000:.1f} ms")
+
+    started = time.perf_counter()
+    single = [index.nearby(lat, lon) for lat, lon in zip(point_lats.tolist(), point_lons.tolist())]
+    single_s = time.perf_counter() - started
+
+    started = time.perf_counter()
+    batched = index.nearby_many(point_lats, point_lons)
+    batched_s = time.perf_counter() - started
+
+    sample = min(args.points, 500)
+    started = time.perf_counter()
+    for lat, lon in zip(point_lats[:sample], point_lons[:sample]):
+        haversine_meters(lat, lon, site_lats, site_lons)
+    brute_s = (time.perf_counter() - started) * args.points / sample
+
+    assert single == batched
+    matched = sum(1 for hits in single if hits)
+    print(f"   {matched} of {args.points} points inside a site radius")
+    print(f"   single lookups:  {args.points / single_s:10.0f} points/s")
+    print(f"   batched lookups: {args.points / batched_s:10.0f} points/s")
+    print(f"   brute force:     {args.points / brute_s:10.0f} points/s (estimated from {sample})")
+
+
+if __name__ == '__main__':
+    main()
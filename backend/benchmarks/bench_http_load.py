@@ -0,0 +1,549 @@
+# Benchmark: HTTP load test for the Flask servers
+# Seeds a synthetic dataset through the app's own write endpoints, then runs
+# concurrent clients through a mixed workload of user sessions:
+#   citizen     - dashboard polling (conditional GETs), project details, opinions
+#   supervisor  - pending tender queue, approvals / rejections
+#   contractor  - registration, tender submission (and milestone work on the demo server)
+# and reports requests/sec and p50 / p95 / p99 latency per route.
+#
+# Modes:
+#   inprocess  Flask test client per worker (no sockets; handler + WSGI cost only)
+#   server     werkzeug threaded server on a free local port, keep-alive HTTP clients
+#   --url      an already running server (gunicorn etc.); seeding goes over HTTP too
+#
+# Each client sends its own X-API-Key (bench-client-<n>). Imported apps are
+# started with those keys in ADMISSION_API_KEYS; a --url server needs them
+# configured too, or admission control sees every client as one IP.
+#
+# --output writes the JSON report; --baseline compares against an earlier one
+# and exits 1 when a route regresses past --max-regression percent.
+#
+# server_fixed only gets the read-only citizen workload. It reads whatever
+# contract RPC_URL / CONTRACT_ADDRESS point at, or with --chain a FundTracker
+# deployed and populated by chain_fixture.py (--chain tester for in-process
+# eth-tester, or a Hardhat node URL).
+#
+# Usage: python benchmarks/bench_http_load.py [--app simple|demo|fixed] [--mode inprocess|server]
+#            [--url http://127.0.0.1:5000] [--chain tester|RPC_URL] [--clients 16] [--duration 10] [--workload mixed]
+#            [--projects 200] [--contractors 50] [--opinions 500] [--seed 1]
+#            [--output report.json] [--baseline baseline.json] [--max-regression 10]
+
+import argparse
+import http.client
+import importlib
+import json
+import math
+import os
+import random
+import sys
+import threading
+import time
+from pathlib import Path
+from urllib.parse import urlsplit
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+# Keep per-request logging out of the measurement
+os.environ.setdefault('LOG_LEVEL', 'WARNING')
+
+APPS = {'simple': 'server_simple', 'demo': 'server_demo', 'fixed': 'server_fixed'}
+WORKLOADS = {
+    'mixed': {'citizen': 80, 'supervisor': 10, 'contractor': 10},
+    'citizen': {'citizen': 1},
+    'supervisor': {'supervisor': 1},
+    'contractor': {'contractor': 1},
+}
+CATEGORIES = ['Infrastructure', 'Water Supply', 'Roads', 'Sanitation', 'Education', 'Health']
+CITIES = [('Mumbai', 'Maharashtra', 18.9750, 72.8258), ('Pune', 'Maharashtra', 18.5204, 73.8567),
+          ('Bangalore', 'Karnataka', 12.9716, 77.5946), ('Chennai', 'Tamil Nadu', 13.0827, 80.2707)]
+
+
+# ============ Transports ============
+
+class InProcessClient:
+    def __init__(self, app, headers):
+        self.client = app.test_client()
+        self.headers = headers
+
+    def request(self, method, path, body=None, headers=None):
+        response = self.client.open(path, method=method, json=body, headers={**self.headers, **(headers or {})})
+        data = response.get_data()
+        return response.status_code, response.headers, data
+
+
+class HttpClient:
+    """One keep-alive connection per worker, reopened after errors"""
+
+    def __init__(self, base_url, headers):
+        parts = urlsplit(base_url)
+        self.host, self.port = parts.hostname, parts.port or 80
+        self.headers = headers
+        self.conn = None
+
+    def request(self, method, path, body=None, headers=None):
+        headers = {**self.headers, **(headers or {})}
+        payload = None
+        if body is not None:
+            payload = json.dumps(body).encode()
+            headers['Content-Type'] = 'application/json'
+        for attempt in range(2):
+            if self.conn is None:
+                self.conn = http.client.HTTPConnection(self.host, self.port, timeout=30)
+            try:
+                self.conn.request(method, path, body=payload, headers=headers)
+                response = self.conn.getresponse()
+                return response.status, response.headers, response.read()
+            except (http.client.HTTPException, OSError):
+                self.conn.close()
+                self.conn = None
+                if attempt:
+                    raise
+
+
+def serve_locally(app):
+    """Threaded werkzeug server on a free port; returns (base_url, server)"""
+    from werkzeug.serving import make_server
+    server = make_server('127.0.0.1', 0, app, threaded=True)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return f"http://127.0.0.1:{server.server_port}", server
+
+
+def decode_json(headers, data):
+    if not data or headers.get('Content-Encoding'):
+        return None  # Seeding/session steps only need uncompressed JSON bodies
+    try:
+        return json.loads(data)
+    except ValueError:
+        return None
+
+
+# ============ Recording ============
+
+class Recorder:
+    """Per-worker latency lists by route label; merged once the run ends"""
+
+    def __init__(self, transport):
+        self.transport = transport
+        self.samples = {}
+        self.errors = {}
+        self.not_modified = {}
+        self.etags = {}
+
+    def call(self, label, method, path, body=None, conditional=False):
+        headers = None
+        if conditional and path in self.etags:
+            headers = {'If-None-Match': self.etags[path]}
+        started = time.perf_counter()
+        try:
+            status, response_headers, data = self.transport.request(method, path, body, headers)
+        except Exception:
+            self.errors[label] = self.errors.get(label, 0) + 1
+            return None
+        self.samples.setdefault(label, []).append(time.perf_counter() - started)
+        if status == 304:
+            self.not_modified[label] = self.not_modified.get(label, 0) + 1
+            return None
+        if status >= 400:
+            self.errors[label] = self.errors.get(label, 0) + 1
+            return None
+        if conditional and response_headers.get('ETag'):
+            self.etags[path] = response_headers['ETag']
+        return decode_json(response_headers, data)
+
+
+def percentile(ordered, fraction):
+    """Nearest-rank percentile of a sorted list"""
+    if not ordered:
+        return 0.0
+    return ordered[min(len(ordered) - 1, max(0, math.ceil(fraction * len(ordered)) - 1))]
+
+
+def summarize(recorders, elapsed):
+    labels = set()
+    for recorder in recorders:
+        labels.update(recorder.samples, recorder.errors)
+    routes = {}
+    all_samples = []
+    for label in sorted(labels):
+        samples = sorted(s for r in recorders for s in r.samples.get(label, []))
+        all_samples.extend(samples)
+        routes[label] = {
+            'requests': len(samples),
+            'errors': sum(r.errors.get(label, 0) for r in recorders),
+            'not_modified': sum(r.not_modified.get(label, 0) for r in recorders),
+            'rps': round(len(samples) / elapsed, 1),
+            'mean_ms': round(sum(samples) / len(samples) * 1000, 3) if samples else 0.0,
+            'p50_ms': round(percentile(samples, 0.50) * 1000, 3),
+            'p95_ms': round(percentile(samples, 0.95) * 1000, 3),
+            'p99_ms': round(percentile(samples, 0.99) * 1000, 3),
+        }
+    all_samples.sort()
+    total = {
+        'requests': len(all_samples),
+        'errors': sum(v['errors'] for v in routes.values()),
+        'rps': round(len(all_samples) / elapsed, 1),
+        'p50_ms': round(percentile(all_samples, 0.50) * 1000, 3),
+        'p95_ms': round(percentile(all_samples, 0.95) * 1000, 3),
+        'p99_ms': round(percentile(all_samples, 0.99) * 1000, 3),
+    }
+    return routes, total
+
+
+# ============ Synthetic data ============
+
+def documents(rng, kind, count):
+    return [
+        {
+            'name': f'{kind} {k + 1}.pdf',
+            'url': f'https://gateway.pinata.cloud/ipfs/Qm{rng.getrandbits(160):044x}',
+            'type': 'application/pdf',
+            'size': rng.randint(10000, 900000)
+        }
+        for k in range(count)
+    ]
+
+
+def project_payload(rng, i):
+    city, state, latitude, longitude = rng.choice(CITIES)
+    return {
+        'name': f'{rng.choice(CATEGORIES)} works #{i}',
+        'description': 'Road resurfacing, drainage and street lighting works',
+        'category': rng.choice(CATEGORIES),
+        'location': city,
+        'city': city,
+        'state': state,
+        'pincode': f'{rng.randint(400001, 600099)}',
+        'budget': rng.randint(5, 500) * 100000,
+        'manager_address': f'0x{rng.getrandbits(160):040x}',
+        'center_latitude': round(latitude + rng.uniform(-0.2, 0.2), 6),
+        'center_longitude': round(longitude + rng.uniform(-0.2, 0.2), 6),
+        'tender_documents': documents(rng, 'Tender', rng.randint(1, 5)),
+        'design_files': documents(rng, 'Design', rng.randint(0, 3)),
+    }
+
+
+def contractor_payload(rng, i):
+    return {
+        'blockchain_id': f'CNTR-{i:06d}-{rng.getrandbits(32):08x}',
+        'company_name': f'Contractor {i} Pvt Ltd',
+        'email': f'contractor{i}@example.com',
+        'username': f'contractor_{i}_{rng.getrandbits(32):08x}',
+        'password': 'bench',
+        'wallet_address': f'0x{rng.getrandbits(160):040x}',
+        'city': rng.choice(CITIES)[0],
+    }
+
+
+def opinion_payload(rng, project_id):
+    return {
+        'project_id': project_id,
+        'citizen_name': f'Citizen {rng.randint(1, 10000)}',
+        'opinion': 'Work is progressing but the diversion signage is poor',
+        'difficulty': rng.choice(['', 'Traffic', 'Noise', 'Dust']),
+        'suggestion': rng.choice(['', 'Add night work lighting', 'Publish weekly progress']),
+        'issueType': rng.choice(['general', 'safety', 'quality']),
+        'rating': rng.randint(1, 5),
+    }
+
+
+# ============ Targets ============
+
+class SimpleTarget:
+    """server_simple: string ids, in-memory contractors / projects / tenders / opinions"""
+
+    def seed(self, call, args, rng):
+        state = {'projects': [], 'tenders': [], 'counter': args.contractors}
+        for i in range(args.contractors):
+            call('POST /api/contractors/register', 'POST', '/api/contractors/register', contractor_payload(rng, i))
+        for i in range(args.projects):
+            created = call('POST /api/projects', 'POST', '/api/projects', project_payload(rng, i))
+            if created:
+                state['projects'].append(created['id'])
+                submitted = call('POST /api/supervisor/tenders', 'POST', '/api/supervisor/tenders',
+                                 {'project_id': created['id'], 'tender_documents': documents(rng, 'Bid', 2)})
+                if submitted:
+                    state['tenders'].append((submitted['tender_id'], created['id']))
+        for _ in range(args.opinions if state['projects'] else 0):
+            call('POST /api/opinions', 'POST', '/api/opinions', opinion_payload(rng, rng.choice(state['projects'])))
+        return state
+
+    def citizen(self, r, state, rng):
+        r.call('GET /api/projects', 'GET', '/api/projects', conditional=True)
+        r.call('GET /api/stats', 'GET', '/api/stats', conditional=True)
+        if state['projects']:
+            project_id = rng.choice(state['projects'])
+            r.call('GET /api/projects/<id>', 'GET', f'/api/projects/{project_id}')
+            r.call('GET /api/milestones/<id>', 'GET', f'/api/milestones/{project_id}', conditional=True)
+            r.call('GET /api/expenditures/<id>', 'GET', f'/api/expenditures/{project_id}')
+            if rng.random() < 0.05:
+                r.call('POST /api/opinions', 'POST', '/api/opinions', opinion_payload(rng, project_id))
+        if rng.random() < 0.2:
+            r.call('GET /api/transactions', 'GET', '/api/transactions', conditional=True)
+
+    def supervisor(self, r, state, rng):
+        r.call('GET /api/supervisor/pending-tenders', 'GET', '/api/supervisor/pending-tenders')
+        if state['tenders']:
+            tender_id, project_id = rng.choice(state['tenders'])
+            if rng.random() < 0.8:
+                r.call('POST /api/supervisor/approve-tender', 'POST', '/api/supervisor/approve-tender',
+                       {'tender_id': tender_id, 'project_id': project_id, 'supervisor_address': '0x' + '2' * 40})
+            else:
+                r.call('POST /api/supervisor/reject-tender', 'POST', '/api/supervisor/reject-tender',
+                       {'tender_id': tender_id, 'project_id': project_id, 'reason': 'Incomplete documents'})
+
+    def contractor(self, r, state, rng):
+        if rng.random() < 0.2:
+            state['counter'] += 1
+            r.call('POST /api/contractors/register', 'POST', '/api/contractors/register',
+                   contractor_payload(rng, state['counter']))
+        if state['projects']:
+            project_id = rng.choice(state['projects'])
+            submitted = r.call('POST /api/supervisor/tenders', 'POST', '/api/supervisor/tenders',
+                               {'project_id': project_id, 'tender_documents': documents(rng, 'Bid', 2)})
+            if submitted:
+                state['tenders'].append((submitted['tender_id'], project_id))
+
+
+class DemoTarget:
+    """server_demo: integer project ids, milestone / oracle flow after approval"""
+
+    def seed(self, call, args, rng):
+        state = {'projects': [], 'tenders': [], 'active_milestones': []}
+        for i in range(args.projects):
+            created = call('POST /api/projects', 'POST', '/api/projects', project_payload(rng, i))
+            if created:
+                state['projects'].append(created['id'])
+                submitted = call('POST /api/supervisor/tenders', 'POST', '/api/supervisor/tenders',
+                                 {'project_id': created['id'], 'tender_documents': documents(rng, 'Bid', 2)})
+                if submitted:
+                    state['tenders'].append((submitted['tender_id'], created['id']))
+        # Approve half up front so milestone reads and submissions have data
+        for tender_id, project_id in state['tenders'][::2]:
+            call('POST /api/supervisor/approve-tender', 'POST', '/api/supervisor/approve-tender',
+                 {'tender_id': tender_id, 'project_id': project_id, 'approved_at': '2025-10-01T10:00:00Z'})
+            state['active_milestones'].append(project_id)
+        return state
+
+    def citizen(self, r, state, rng):
+        r.call('GET /api/projects', 'GET', '/api/projects')
+        r.call('GET /api/stats', 'GET', '/api/stats')
+        if state['projects']:
+            project_id = rng.choice(state['projects'])
+            r.call('GET /api/projects/<id>', 'GET', f'/api/projects/{project_id}')
+            r.call('GET /api/projects/<id>/milestones', 'GET', f'/api/projects/{project_id}/milestones')
+            r.call('GET /api/expenditures/<id>', 'GET', f'/api/expenditures/{project_id}')
+        if rng.random() < 0.2:
+            city = rng.choice(CITIES)
+            r.call('GET /api/geofence/nearby', 'GET', f'/api/geofence/nearby?gps={city[2]},{city[3]}')
+
+    def supervisor(self, r, state, rng):
+        r.call('GET /api/supervisor/pending-tenders', 'GET', '/api/supervisor/pending-tenders')
+        r.call('GET /api/oracle/verifications', 'GET', '/api/oracle/verifications')
+        if state['tenders']:
+            tender_id, project_id = state['tenders'][rng.randrange(len(state['tenders']))]
+            r.call('POST /api/supervisor/approve-tender', 'POST', '/api/supervisor/approve-tender',
+                   {'tender_id': tender_id, 'project_id': project_id, 'approved_at': '2025-10-01T10:00:00Z'})
+            state['active_milestones'].append(project_id)
+
+    def contractor(self, r, state, rng):
+        if state['projects']:
+            project_id = rng.choice(state['projects'])
+            submitted = r.call('POST /api/supervisor/tenders', 'POST', '/api/supervisor/tenders',
+                               {'project_id': project_id, 'tender_documents': documents(rng, 'Bid', 2)})
+            if submitted:
+                state['tenders'].append((submitted['tender_id'], project_id))
+        if state['active_milestones']:
+            # Milestone 1 is the active one right after approval; resubmissions are accepted
+            project_id = rng.choice(state['active_milestones'])
+            city = rng.choice(CITIES)
+            r.call('POST /api/projects/<id>/milestones/<id>/submit', 'POST',
+                   f'/api/projects/{project_id}/milestones/1/submit',
+                   {'gps_coordinates': f'{city[2]},{city[3]}', 'notes': 'Foundation complete',
+                    'submission_files': documents(rng, 'Photo', 3)})
+
+
+class FixedTarget:
+    """server_fixed: on-chain reads only; data comes from the configured contract"""
+
+    def seed(self, call, args, rng):
+        listing = call('GET /api/projects', 'GET', '/api/projects') or {}
+        return {'projects': [p['id'] for p in listing.get('projects', [])]}
+
+    def citizen(self, r, state, rng):
+        r.call('GET /api/projects', 'GET', '/api/projects', conditional=True)
+        r.call('GET /api/stats', 'GET', '/api/stats', conditional=True)
+        if state['projects']:
+            project_id = rng.choice(state['projects'])
+            r.call('GET /api/projects/<id>', 'GET', f'/api/projects/{project_id}')
+            r.call('GET /api/milestones/<id>', 'GET', f'/api/milestones/{project_id}', conditional=True)
+            r.call('GET /api/tenders/<id>', 'GET', f'/api/tenders/{project_id}')
+
+    supervisor = contractor = None
+
+
+TARGETS = {'simple': SimpleTarget, 'demo': DemoTarget, 'fixed': FixedTarget}
+
+
+# ============ Runner ============
+
+def api_keys(clients):
+    return [f'bench-client-{i}' for i in range(clients)]
+
+
+def run(target, make_transport, headers, state, args):
+    mix = {persona: weight for persona, weight in WORKLOADS[args.workload].items()
+           if getattr(target, persona) is not None}
+    if not mix:
+        raise SystemExit(f"--workload {args.workload} has no sessions for --app {args.app}")
+    personas, weights = list(mix), list(mix.values())
+    # Distinct API keys, so admission control sees N clients rather than one IP
+    recorders = [Recorder(make_transport({**headers, 'X-API-Key': key})) for key in api_keys(args.clients)]
+    start_barrier = threading.Barrier(args.clients + 1)
+    deadline = [0.0]
+
+    def worker(index, recorder):
+        rng = random.Random(args.seed * 1000 + index)
+        start_barrier.wait()
+        while time.perf_counter() < deadline[0]:
+            persona = rng.choices(personas, weights)[0]
+            getattr(target, persona)(recorder, state, rng)
+
+    threads = [threading.Thread(target=worker, args=(i, r), daemon=True) for i, r in enumerate(recorders)]
+    for thread in threads:
+        thread.start()
+    started = time.perf_counter()
+    deadline[0] = started + args.duration
+    start_barrier.wait()
+    for thread in threads:
+        thread.join()
+    return summarize(recorders, time.perf_counter() - started)
+
+
+def attach_chain_fixture(module, args):
+    """Point server_fixed at a populated FundTracker (see chain_fixture.py)"""
+    sys.path.insert(0, str(Path(__file__).resolve().parent))
+    from chain_fixture import DEFAULT_MANIFEST, build
+    rpc_url = None if args.chain == 'tester' else args.chain
+    started = time.perf_counter()
+    fixture = build(rpc_url, str(DEFAULT_MANIFEST) if rpc_url else None, projects=args.projects,
+                    tenders=2, milestones=3, expenditures=2, seed=args.seed)
+    print(f"chain fixture ready in {time.perf_counter() - started:.1f}s: {fixture.counts}")
+    module.w3 = fixture.w3
+    module.metrics.instrument_web3(fixture.w3)
+    module.contracts.bind(fixture.w3)
+    module.monitor.bind(fixture.w3)
+    module.contracts.register('FundTracker', abi=fixture.abi, address=fixture.address)
+
+
+def compare(report, baseline, max_regression):
+    """Print per-route deltas; returns the routes that regressed"""
+    regressions = []
+    for key in ('app', 'mode', 'workload', 'clients'):
+        if baseline.get('meta', {}).get(key) != report['meta'][key]:
+            print(f"warning: baseline {key} is {baseline.get('meta', {}).get(key)!r}, "
+                  f"this run is {report['meta'][key]!r}")
+    print(f"\n{'route':<48} {'rps':>10} {'Δrps':>8} {'p95 ms':>9} {'Δp95':>8}")
+    for label, current in report['routes'].items():
+        before = baseline.get('routes', {}).get(label)
+        if not before or not before['requests']:
+            print(f"{label:<48} {current['rps']:>10.1f} {'new':>8} {current['p95_ms']:>9.2f}")
+            continue
+        rps_delta = (current['rps'] - before['rps']) / before['rps'] * 100 if before['rps'] else 0.0
+        p95_delta = (current['p95_ms'] - before['p95_ms']) / before['p95_ms'] * 100 if before['p95_ms'] else 0.0
+        flag = ''
+        if p95_delta > max_regression or rps_delta < -max_regression:
+            regressions.append(label)
+            flag = '  REGRESSION'
+        print(f"{label:<48} {current['rps']:>10.1f} {rps_delta:>+7.1f}% {current['p95_ms']:>9.2f} "
+              f"{p95_delta:>+7.1f}%{flag}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--app', choices=sorted(APPS), default='simple')
+    parser.add_argument('--mode', choices=['inprocess', 'server'], default='inprocess')
+    parser.add_argument('--url', help='Benchmark a running server instead of importing the app')
+    parser.add_argument('--chain', help="--app fixed: chain_fixture backend, 'tester' or a Hardhat node URL")
+    parser.add_argument('--workload', choices=sorted(WORKLOADS), default='mixed')
+    parser.add_argument('--clients', type=int, default=16)
+    parser.add_argument('--duration', type=float, default=10.0, help='Seconds')
+    parser.add_argument('--projects', type=int, default=200)
+    parser.add_argument('--contractors', type=int, default=50)
+    parser.add_argument('--opinions', type=int, default=500)
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--accept-encoding', default='gzip, br',
+                        help="Sent by every client; '' to disable response compression")
+    parser.add_argument('--output', help='Write the JSON report here')
+    parser.add_argument('--baseline', help='Earlier JSON report to compare against')
+    parser.add_argument('--max-regression', type=float, default=10.0, help='Percent')
+    args = parser.parse_args()
+
+    headers = {'Accept-Encoding': args.accept_encoding} if args.accept_encoding else {}
+    server = None
+    if args.url:
+        base_url = args.url.rstrip('/')
+        make_transport = lambda h: HttpClient(base_url, h)  # noqa: E731
+    else:
+        os.environ.setdefault('ADMISSION_API_KEYS', ','.join(api_keys(args.clients)))
+        module = importlib.import_module(APPS[args.app])
+        app = module.app
+        if args.app == 'fixed' and args.chain:
+            attach_chain_fixture(module, args)
+        if args.mode == 'server':
+            base_url, server = serve_locally(app)
+            make_transport = lambda h: HttpClient(base_url, h)  # noqa: E731
+        else:
+            make_transport = lambda h: InProcessClient(app, h)  # noqa: E731
+
+    target = TARGETS[args.app]()
+    # Seeding reads ids from the responses, so it asks for them uncompressed
+    seeder = Recorder(make_transport({}))
+    seed_started = time.perf_counter()
+    state = target.seed(seeder.call, args, random.Random(args.seed))
+    seed_errors = sum(seeder.errors.values())
+    print(f"seeded {args.app} in {time.perf_counter() - seed_started:.2f}s "
+          f"({sum(len(v) for v in seeder.samples.values())} requests, {seed_errors} errors)")
+
+    routes, total = run(target, make_transport, headers, state, args)
+    if server is not None:
+        server.shutdown()
+
+    print(f"\n{'route':<48} {'requests':>9} {'err':>5} {'304':>6} {'rps':>9} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8}")
+    for label, values in routes.items():
+        print(f"{label:<48} {values['requests']:>9} {values['errors']:>5} {values['not_modified']:>6} "
+              f"{values['rps']:>9.1f} {values['p50_ms']:>8.2f} {values['p95_ms']:>8.2f} {values['p99_ms']:>8.2f}")
+    print(f"{'total':<48} {total['requests']:>9} {total['errors']:>5} {'':>6} "
+          f"{total['rps']:>9.1f} {total['p50_ms']:>8.2f} {total['p95_ms']:>8.2f} {total['p99_ms']:>8.2f}")
+
+    report = {
+        'meta': {
+            'app': args.app,
+            'mode': 'url' if args.url else args.mode,
+            'workload': args.workload,
+            'clients': args.clients,
+            'duration': args.duration,
+            'dataset': {'projects': args.projects, 'contractors': args.contractors, 'opinions': args.opinions},
+            'seed': args.seed,
+            'accept_encoding': args.accept_encoding,
+            'python': sys.version.split()[0],
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime()),
+        },
+        'total': total,
+        'routes': routes,
+    }
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+        print(f"\nreport written to {args.output}")
+
+    if args.baseline:
+        with open(args.baseline, encoding='utf-8') as f:
+            regressions = compare(report, json.load(f), args.max_regression)
+        if regressions:
+            print(f"\n{len(regressions)} route(s) regressed by more than {args.max_regression}%")
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,87 @@
+# Benchmark: Flask's default JSON provider vs the orjson provider
+# Encodes project-list responses shaped like server_fixed's /api/projects
+# (wei amounts, tender commitments as bytes, timestamps) through jsonify.
+#
+# Only Flask and orjson needed; no chain or database.
+#
+# Usage: python benchmarks/bench_json_provider.py [--projects 10000] [--rounds 20]
+
+import argparse
+import json
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+from flask import Flask, jsonify
+from flask.json.provider import DefaultJSONProvider
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from json_provider import OrjsonProvider  # noqa: E402
+
+WEI = 10 ** 18
+
+
+def make_projects(count, big_wei):
+    """Projects with ~2-2000 ETH budgets; big_wei=False keeps amounts under 2**64"""
+    scale = WEI if big_wei else 1000
+    started = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    return [
+        {
+            "id": i,
+            "name": f"Project {i}",
+            "description": "Road resurfacing and drainage work for ward " + str(i % 200),
+            "location": f"Ward {i % 200}",
+            "budget": (2 + i % 2000) * scale,
+            "allocatedFunds": (1 + i % 1000) * scale,
+            "spentFunds": (i % 500) * scale,
+            "admin": f"0x{i:040x}",
+            "status": i % 4,
+            "createdAt": 1698153600 + i,
+            "contractorCommitment": i.to_bytes(32, 'big'),
+            "updatedAt": started + timedelta(minutes=i)
+        }
+        for i in range(1, count + 1)
+    ]
+
+
+def time_jsonify(app, payload, rounds):
+    with app.app_context():
+        jsonify(payload)  # warm up
+        started = time.perf_counter()
+        for _ in range(rounds):
+            body = jsonify(payload).get_data()
+        return (time.perf_counter() - started) / rounds, body
+
+
+def main():
+    parser = argparse.ArgumentParser(description='JSON provider benchmark')
+    parser.add_argument('--projects', type=int, default=10000)
+    parser.add_argument('--rounds', type=int, default=20)
+    args = parser.parse_args()
+
+    default_app = Flask('default')
+    fast_app = Flask('fast')
+    fast_app.json = OrjsonProvider(fast_app)
+
+    print(f"Encoding {args.projects}-project responses ({args.rounds} rounds each)")
+    for label, big_wei in (('amounts < 2**64', False), ('wei amounts', True)):
+        projects = make_projects(args.projects, big_wei)
+        # The default provider can't encode bytes; give it what the endpoints hand it today
+        legacy = [dict(p, contractorCommitment=p['contractorCommitment'].hex(),
+                       updatedAt=p['updatedAt'].isoformat()) for p in projects]
+        default_s, default_body = time_jsonify(default_app, {"projects": legacy, "total": len(legacy)},
+                                               args.rounds)
+        fast_s, fast_body = time_jsonify(fast_app, {"projects": projects, "total": len(projects)},
+                                         args.rounds)
+
+        decoded = json.loads(fast_body)
+        assert decoded['projects'][-1]['budget'] == projects[-1]['budget']
+        assert len(decoded['projects']) == len(json.loads(default_body)['projects'])
+        print(f"   {label:16s} default: {default_s * 1000:8.2f} ms   orjson: {fast_s * 1000:7.2f} ms   "
+              f"speedup: {default_s / fast_s:5.1f}x   ({len(fast_body) / 1024:.0f} KiB)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,105 @@
+# Benchmark: list endpoint serialization at 10k documents
+# Old path: ISO strings -> datetime.fromisoformat per row -> pydantic response_model
+# New path: native datetimes -> FastJSONResponse (orjson, no per-row validation)
+#
+# Usage: python benchmarks/bench_list_serialization.py [--docs 10000] [--rounds 20]
+
+import argparse
+import sys
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import List, Optional
+
+from pydantic import BaseModel, ConfigDict, Field, TypeAdapter
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from mongo_serialization import FastJSONResponse  # noqa: E402
+
+
+# Mirrors the Transaction model in server_old.py
+class Transaction(BaseModel):
+    model_config = ConfigDict(extra="ignore")
+    id: str = Field(default_factory=lambda: str(uuid.uuid4()))
+    tx_hash: str
+    type: str
+    project_id: Optional[str] = None
+    details: dict
+    timestamp: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+    block_number: Optional[int] = None
+    verified: bool = False
+
+
+def make_docs(count):
+    """Generate transaction documents the way Motor returns them (naive UTC datetimes)"""
+    start = datetime(2025, 1, 1)
+    types = ['project_create', 'fund_allocation', 'milestone_create', 'expenditure']
+    return [
+        {
+            'id': str(uuid.uuid4()),
+            'tx_hash': f"0x{i:064x}",
+            'type': types[i % len(types)],
+            'project_id': f"project-{i % 250}",
+            'details': {'amount': 1000 + i, 'purpose': 'Benchmark allocation'},
+            'timestamp': start + timedelta(seconds=i * 37),
+            'block_number': 12_000_000 + i,
+            'verified': i % 3 == 0,
+        }
+        for i in range(count)
+    ]
+
+
+def old_path(string_docs, adapter):
+    # Reproduce the handler: copy (Motor returns fresh dicts), re-parse, validate, dump
+    docs = [dict(doc) for doc in string_docs]
+    for doc in docs:
+        if isinstance(doc['timestamp'], str):
+            doc['timestamp'] = datetime.fromisoformat(doc['timestamp'])
+    return adapter.dump_json(adapter.validate_python(docs))
+
+
+def new_path(native_docs):
+    docs = [dict(doc) for doc in native_docs]
+    return FastJSONResponse(docs).body
+
+
+def timed(fn, rounds):
+    samples = []
+    for _ in range(rounds):
+        started = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - started)
+    samples.sort()
+    return samples[len(samples) // 2]
+
+
+def main():
+    parser = argparse.ArgumentParser(description='List endpoint serialization benchmark')
+    parser.add_argument('--docs', type=int, default=10000)
+    parser.add_argument('--rounds', type=int, default=20)
+    args = parser.parse_args()
+
+    native_docs = make_docs(args.docs)
+    string_docs = [dict(doc, timestamp=doc['timestamp'].replace(tzinfo=timezone.utc).isoformat())
+                   for doc in native_docs]
+    adapter = TypeAdapter(List[Transaction])
+
+    # Warm up both paths once
+    old_path(string_docs, adapter)
+    new_path(native_docs)
+
+    old_seconds = timed(lambda: old_path(string_docs, adapter), args.rounds)
+    new_seconds = timed(lambda: new_path(native_docs), args.rounds)
+
+    print(f"List endpoint serialization - {args.docs} documents, median of {args.rounds} rounds")
+    print(f"   old (fromisoformat + response_model): {old_seconds * 1000:8.2f} ms  "
+          f"{1 / old_seconds:8.1f} req/s  {args.docs / old_seconds:12.0f} docs/s")
+    print(f"   new (native datetime + orjson):       {new_seconds * 1000:8.2f} ms  "
+          f"{1 / new_seconds:8.1f} req/s  {args.docs / new_seconds:12.0f} docs/s")
+    print(f"   speedup: {old_seconds / new_seconds:.1f}x")
+
+
+if __name__ == '__main__':
+    main()
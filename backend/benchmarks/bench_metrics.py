@@ -0,0 +1,69 @@
+# Benchmark: per-request cost of the metrics hooks
+# Runs the same trivial Flask view with Metrics disabled and enabled through
+# the test client, plus the raw cost of Histogram.observe and /metrics render.
+#
+# Only Flask needed.
+#
+# Usage: python benchmarks/bench_metrics.py [--requests 20000] [--endpoints 20]
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from flask import Flask, jsonify  # noqa: E402
+
+from metrics import Metrics  # noqa: E402
+
+
+def make_app(enabled, endpoints):
+    app = Flask(__name__)
+    metrics = Metrics(app, enabled=enabled)
+    for i in range(endpoints):
+        app.add_url_rule(f'/r{i}', f'route_{i}', lambda: jsonify({"ok": True}))
+    return app, metrics
+
+
+def time_requests(app, count, endpoints):
+    client = app.test_client()
+    paths = [f'/r{i % endpoints}' for i in range(count)]
+    started = time.perf_counter()
+    for path in paths:
+        client.get(path)
+    return (time.perf_counter() - started) / count * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--requests', type=int, default=20000)
+    parser.add_argument('--endpoints', type=int, default=20)
+    args = parser.parse_args()
+
+    print(f"{'metrics':<10} {'us/request':>12}")
+    results = {}
+    for enabled in (False, True):
+        app, metrics = make_app(enabled, args.endpoints)
+        time_requests(app, 500, args.endpoints)  # warm-up
+        results[enabled] = time_requests(app, args.requests, args.endpoints)
+        print(f"{'on' if enabled else 'off':<10} {results[enabled]:>12.1f}")
+    print(f"overhead: {results[True] - results[False]:.1f} us/request")
+
+    _, metrics = make_app(True, 1)
+    histogram = metrics.histogram('bench_seconds', 'bench', ('endpoint',))
+    rounds = 200000
+    started = time.perf_counter()
+    for i in range(rounds):
+        histogram.observe(0.003 * (i % 50), 'route')
+    print(f"Histogram.observe: {(time.perf_counter() - started) / rounds * 1e9:.0f} ns")
+
+    app, metrics = make_app(True, args.endpoints)
+    time_requests(app, args.requests, args.endpoints)
+    started = time.perf_counter()
+    body = metrics.render()
+    print(f"render: {(time.perf_counter() - started) * 1e3:.2f} ms for {len(body)} bytes")
+
+
+if __name__ == '__main__':
+    main()
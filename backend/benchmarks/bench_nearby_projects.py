@@ -0,0 +1,163 @@
+# Benchmark: get_nearby_projects before/after the stored-geography rework
+# Generates projects clustered around the sample pincodes in a scratch
+# schema and times the original function against the current one.
+#
+# Requires PostgreSQL with PostGIS and psycopg2.
+# Connection uses DB_HOST / DB_PORT / DB_USER / DB_PASSWORD / DB_NAME.
+#
+# Usage: python benchmarks/bench_nearby_projects.py [--projects 100000] [--radius 20000]
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from pg_common import connect, schema_section, timed  # noqa: E402
+
+SCHEMA = 'bench_nearby_projects'
+
+BASE_TABLES = '''
+CREATE TABLE pincodes (
+    pincode VARCHAR(6) PRIMARY KEY,
+    geom GEOMETRY(Point, 4326)
+);
+CREATE TABLE projects (
+    project_id INTEGER PRIMARY KEY,
+    project_name VARCHAR(255) NOT NULL,
+    budget NUMERIC(30, 0) NOT NULL,
+    status INTEGER NOT NULL,
+    location VARCHAR(255),
+    geom GEOMETRY(Point, 4326),
+    geog GEOGRAPHY(Point, 4326) GENERATED ALWAYS AS (geom::geography) STORED
+);
+CREATE INDEX idx_projects_geom ON projects USING GIST(geom);
+CREATE INDEX idx_projects_geog ON projects USING GIST(geog);
+INSERT INTO pincodes (pincode, geom) VALUES
+('110001', ST_SetSRID(ST_MakePoint(77.2090, 28.6139), 4326)),
+('110002', ST_SetSRID(ST_MakePoint(77.2300, 28.6600), 4326)),
+('110003', ST_SetSRID(ST_MakePoint(77.2250, 28.6700), 4326)),
+('400001', ST_SetSRID(ST_MakePoint(72.8354, 18.9388), 4326)),
+('560001', ST_SetSRID(ST_MakePoint(77.5946, 12.9716), 4326));
+'''
+
+# The function as it was before the rework. The original returned float8 for a
+# NUMERIC column and ordered by a name that clashes with the OUT parameter, so
+# the cast and the ordinal ORDER BY are needed for it to run at all.
+LEGACY_FUNCTION = '''
+CREATE OR REPLACE FUNCTION get_nearby_projects_legacy(
+    input_pincode VARCHAR(6),
+    radius_meters INTEGER DEFAULT 20000
+)
+RETURNS TABLE (
+    project_id INTEGER,
+    project_name VARCHAR(255),
+    budget NUMERIC,
+    status INTEGER,
+    location VARCHAR(255),
+    distance_meters NUMERIC
+) AS $$
+BEGIN
+    RETURN QUERY
+    SELECT
+        p.project_id,
+        p.project_name,
+        p.budget,
+        p.status,
+        p.location,
+        ST_Distance(
+            p.geom::geography,
+            (SELECT geom::geography FROM pincodes WHERE pincode = input_pincode)
+        )::NUMERIC as distance_meters
+    FROM projects p
+    WHERE ST_DWithin(
+        p.geom::geography,
+        (SELECT geom::geography FROM pincodes WHERE pincode = input_pincode),
+        radius_meters
+    )
+    ORDER BY 6;
+END;
+$$ LANGUAGE plpgsql;
+'''
+
+# 70% of projects scattered within ~0.5 degrees of a sample pincode, the rest across India
+LOAD_PROJECTS = '''
+INSERT INTO projects (project_id, project_name, budget, status, location, geom)
+SELECT
+    i,
+    'Project ' || i,
+    1000000 + i,
+    i %% 4,
+    'Generated',
+    CASE WHEN random() < 0.7 THEN
+        ST_SetSRID(ST_MakePoint(
+            ST_X(c.centers[1 + i %% 5]) + (random() - 0.5),
+            ST_Y(c.centers[1 + i %% 5]) + (random() - 0.5)
+        ), 4326)
+    ELSE
+        ST_SetSRID(ST_MakePoint(68 + random() * 29, 8 + random() * 27), 4326)
+    END
+FROM generate_series(1, %(projects)s) i,
+     (SELECT ARRAY(SELECT geom FROM pincodes ORDER BY pincode) AS centers) c
+'''
+
+
+def main():
+    parser = argparse.ArgumentParser(description='get_nearby_projects benchmark')
+    parser.add_argument('--projects', type=int, default=100000)
+    parser.add_argument('--radius', type=int, default=20000)
+    parser.add_argument('--limit', type=int, default=50, help='max_results for the KNN variant')
+    parser.add_argument('--rounds', type=int, default=5)
+    args = parser.parse_args()
+
+    conn = connect()
+    conn.autocommit = True
+    cur = conn.cursor()
+    try:
+        cur.execute(f'DROP SCHEMA IF EXISTS {SCHEMA} CASCADE')
+        cur.execute(f'CREATE SCHEMA {SCHEMA}')
+        cur.execute(f'SET search_path TO {SCHEMA}, public')
+        cur.execute(BASE_TABLES)
+        cur.execute(LEGACY_FUNCTION)
+        cur.execute(schema_section('-- Function to get projects near a location',
+                                   '-- Function to calculate project completion percentage'))
+
+        cur.execute('SELECT setseed(0.42)')
+        started = time.perf_counter()
+        cur.execute(LOAD_PROJECTS, {'projects': args.projects})
+        print(f"Loaded {args.projects} projects in {time.perf_counter() - started:.2f} s")
+        cur.execute('ANALYZE')
+
+        cur.execute('SELECT pincode FROM pincodes ORDER BY pincode')
+        pincodes = [row[0] for row in cur.fetchall()]
+
+        totals = {'legacy': 0.0, 'reworked': 0.0, 'knn': 0.0}
+        for pincode in pincodes:
+            legacy_s, legacy_rows = timed(cur, 'SELECT * FROM get_nearby_projects_legacy(%s, %s)',
+                                          (pincode, args.radius), args.rounds)
+            new_s, new_rows = timed(cur, 'SELECT * FROM get_nearby_projects(%s, %s)',
+                                    (pincode, args.radius), args.rounds)
+            knn_s, knn_rows = timed(cur, 'SELECT * FROM get_nearby_projects(%s, %s, %s)',
+                                    (pincode, args.radius, args.limit), args.rounds)
+
+            assert {r[0] for r in legacy_rows} == {r[0] for r in new_rows}, pincode
+            assert len(knn_rows) == min(args.limit, len(new_rows)), pincode
+            assert {r[0] for r in knn_rows} <= {r[0] for r in new_rows}, pincode
+
+            totals['legacy'] += legacy_s
+            totals['reworked'] += new_s
+            totals['knn'] += knn_s
+            print(f"   {pincode}: {len(new_rows):6d} matches   legacy {legacy_s * 1000:9.2f} ms   "
+                  f"reworked {new_s * 1000:8.2f} ms   top-{args.limit} {knn_s * 1000:7.2f} ms")
+
+        print(f"   total: legacy {totals['legacy'] * 1000:.1f} ms, reworked {totals['reworked'] * 1000:.1f} ms "
+              f"({totals['legacy'] / totals['reworked']:.1f}x), top-{args.limit} {totals['knn'] * 1000:.1f} ms "
+              f"({totals['legacy'] / totals['knn']:.1f}x)")
+    finally:
+        cur.execute(f'DROP SCHEMA IF EXISTS {SCHEMA} CASCADE')
+        conn.close()
+
+
+if __name__ == '__main__':
+    main()
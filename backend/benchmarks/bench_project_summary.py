@@ -0,0 +1,154 @@
+# Benchmark: materialized project_summary vs the original fan-out view
+# Builds a scratch schema on a generated dataset, loads it through the
+# maintenance triggers, then times both summaries.
+#
+# Requires PostgreSQL (PostGIS not needed) and psycopg2.
+# Connection uses DB_HOST / DB_PORT / DB_USER / DB_PASSWORD / DB_NAME.
+#
+# Usage: python benchmarks/bench_project_summary.py [--projects 2000] [--opinions 50]
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from pg_common import connect, schema_section, timed  # noqa: E402
+
+SCHEMA = 'bench_project_summary'
+
+# Base tables from database_schema.sql without the PostGIS columns
+BASE_TABLES = '''
+CREATE TABLE projects (
+    project_id INTEGER PRIMARY KEY,
+    project_name VARCHAR(255) NOT NULL,
+    budget NUMERIC(30, 0) NOT NULL,
+    status INTEGER NOT NULL,
+    location VARCHAR(255)
+);
+CREATE TABLE milestones (
+    milestone_id SERIAL PRIMARY KEY,
+    project_id INTEGER NOT NULL REFERENCES projects(project_id),
+    tender_id INTEGER,
+    status VARCHAR(20)
+);
+CREATE INDEX idx_milestones_project ON milestones(project_id);
+CREATE TABLE tenders (
+    tender_id SERIAL PRIMARY KEY,
+    project_id INTEGER NOT NULL REFERENCES projects(project_id),
+    status VARCHAR(20)
+);
+CREATE INDEX idx_tenders_project ON tenders(project_id);
+CREATE TABLE citizen_opinions (
+    id SERIAL PRIMARY KEY,
+    project_id INTEGER NOT NULL,
+    opinion_text TEXT NOT NULL,
+    rating INTEGER CHECK (rating BETWEEN 1 AND 5),
+    upvotes INTEGER DEFAULT 0
+);
+CREATE INDEX idx_opinions_project ON citizen_opinions(project_id);
+'''
+
+# The view as it was before the summary was materialized
+LEGACY_VIEW = '''
+CREATE VIEW project_summary_legacy AS
+SELECT
+    p.project_id,
+    p.project_name,
+    p.budget,
+    p.status,
+    p.location,
+    COUNT(DISTINCT m.milestone_id) as total_milestones,
+    COUNT(DISTINCT CASE WHEN m.status = 'Approved' THEN m.milestone_id END) as approved_milestones,
+    COUNT(DISTINCT t.tender_id) as total_tenders,
+    COALESCE(AVG(co.rating), 0) as avg_rating,
+    COUNT(co.id) as total_opinions
+FROM projects p
+LEFT JOIN milestones m ON p.project_id = m.project_id
+LEFT JOIN tenders t ON p.project_id = t.project_id
+LEFT JOIN citizen_opinions co ON p.project_id = co.project_id
+GROUP BY p.project_id, p.project_name, p.budget, p.status, p.location;
+'''
+
+
+def summary_ddl():
+    """Materialized summary section of database_schema.sql (table, triggers, view)"""
+    return schema_section('-- ==================== PROJECT SUMMARY (MATERIALIZED)', '-- Milestone progress view')
+
+
+def load_dataset(cur, projects, milestones, tenders, opinions):
+    cur.execute('''
+        INSERT INTO projects (project_id, project_name, budget, status, location)
+        SELECT i, 'Project ' || i, 1000000 + i, i %% 4, 'Ward ' || (i %% 50)
+        FROM generate_series(1, %(projects)s) i
+    ''', {'projects': projects})
+    cur.execute('''
+        INSERT INTO milestones (project_id, tender_id, status)
+        SELECT p, 1, CASE WHEN k <= 2 THEN 'Approved' ELSE 'Submitted' END
+        FROM generate_series(1, %(projects)s) p, generate_series(1, %(per)s) k
+    ''', {'projects': projects, 'per': milestones})
+    cur.execute('''
+        INSERT INTO tenders (project_id, status)
+        SELECT p, 'Submitted'
+        FROM generate_series(1, %(projects)s) p, generate_series(1, %(per)s) k
+    ''', {'projects': projects, 'per': tenders})
+    cur.execute('''
+        INSERT INTO citizen_opinions (project_id, opinion_text, rating)
+        SELECT p, 'Generated opinion', CASE WHEN k %% 10 = 0 THEN NULL ELSE 1 + (p + k) %% 5 END
+        FROM generate_series(1, %(projects)s) p, generate_series(1, %(per)s) k
+    ''', {'projects': projects, 'per': opinions})
+
+
+def main():
+    parser = argparse.ArgumentParser(description='project_summary benchmark')
+    parser.add_argument('--projects', type=int, default=2000)
+    parser.add_argument('--milestones', type=int, default=5, help='milestones per project')
+    parser.add_argument('--tenders', type=int, default=3, help='tenders per project')
+    parser.add_argument('--opinions', type=int, default=50, help='opinions per project')
+    parser.add_argument('--rounds', type=int, default=5)
+    args = parser.parse_args()
+
+    conn = connect()
+    conn.autocommit = True
+    cur = conn.cursor()
+    try:
+        cur.execute(f'DROP SCHEMA IF EXISTS {SCHEMA} CASCADE')
+        cur.execute(f'CREATE SCHEMA {SCHEMA}')
+        cur.execute(f'SET search_path TO {SCHEMA}')
+        cur.execute(BASE_TABLES)
+        cur.execute(summary_ddl())
+        cur.execute(LEGACY_VIEW)
+
+        started = time.perf_counter()
+        load_dataset(cur, args.projects, args.milestones, args.tenders, args.opinions)
+        load_seconds = time.perf_counter() - started
+        cur.execute('ANALYZE')
+
+        fanout = args.milestones * args.tenders * args.opinions
+        print(f"Dataset: {args.projects} projects, {args.milestones} milestones / {args.tenders} tenders / "
+              f"{args.opinions} opinions each ({fanout} joined rows per project in the legacy view)")
+        print(f"   load through maintenance triggers: {load_seconds:.2f} s")
+
+        checks = [
+            ('all projects', 'SELECT * FROM {view} ORDER BY project_id', None),
+            ('one project', 'SELECT * FROM {view} WHERE project_id = %s', (args.projects // 2,)),
+        ]
+        for label, query, params in checks:
+            legacy_s, legacy_rows = timed(cur, query.format(view='project_summary_legacy'), params, args.rounds)
+            new_s, new_rows = timed(cur, query.format(view='project_summary'), params, args.rounds)
+            print(f"   {label:13s} legacy view: {legacy_s * 1000:10.2f} ms   "
+                  f"materialized: {new_s * 1000:8.2f} ms   speedup: {legacy_s / new_s:8.1f}x")
+
+            # Milestone/tender counts and averages must agree; legacy total_opinions is
+            # inflated by the fan-out (COUNT(co.id) over the joined rows)
+            for old, new in zip(legacy_rows, new_rows):
+                assert old[:8] == new[:8], (old, new)
+                assert abs(float(old[8]) - float(new[8])) < 1e-9, (old, new)
+    finally:
+        cur.execute(f'DROP SCHEMA IF EXISTS {SCHEMA} CASCADE')
+        conn.close()
+
+
+if __name__ == '__main__':
+    main()
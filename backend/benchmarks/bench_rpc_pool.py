@@ -0,0 +1,110 @@
+# Benchmark: tail latency of a single RPC node vs the RpcPool, with and without hedging
+# Starts local stub JSON-RPC nodes that answer eth_call after a base delay,
+# with an occasional slow response (the tail we want to cut), and issues the
+# same reads through a plain HTTPProvider and through RpcPool.
+#
+# Only web3 needed.
+#
+# Usage: python benchmarks/bench_rpc_pool.py [--calls 1000] [--nodes 3]
+#            [--base-ms 2] [--slow-ms 150] [--slow-rate 0.02] [--dead]
+
+import argparse
+import json
+import math
+import random
+import socket
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from web3 import HTTPProvider  # noqa: E402
+
+from rpc_pool import RpcPool  # noqa: E402
+
+
+def stub_node(base_seconds, slow_seconds, slow_rate, seed):
+    """JSON-RPC stub on a free port; returns (server, url)"""
+    rng = random.Random(seed)
+    lock = threading.Lock()
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+
+        def setup(self):
+            super().setup()
+            # Headers and body go out in separate writes; don't let Nagle hold the body back
+            self.connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
+        def do_POST(self):
+            body = json.loads(self.rfile.read(int(self.headers['Content-Length'])))
+            with lock:
+                slow = rng.random() < slow_rate
+            time.sleep(slow_seconds if slow else base_seconds)
+            payload = json.dumps({"jsonrpc": "2.0", "id": body["id"], "result": "0x" + "00" * 32}).encode()
+            self.send_response(200)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_port}"
+
+
+def percentile(ordered, p):
+    return ordered[max(0, math.ceil(p / 100 * len(ordered)) - 1)]
+
+
+def run(provider, calls):
+    params = [{"to": "0x" + "11" * 20, "data": "0x36fbad26"}, "latest"]
+    samples = []
+    for _ in range(calls):
+        started = time.perf_counter()
+        provider.make_request('eth_call', params)
+        samples.append(time.perf_counter() - started)
+    return sorted(samples)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--calls', type=int, default=1000)
+    parser.add_argument('--nodes', type=int, default=3)
+    parser.add_argument('--base-ms', type=float, default=2)
+    parser.add_argument('--slow-ms', type=float, default=150)
+    parser.add_argument('--slow-rate', type=float, default=0.02)
+    parser.add_argument('--dead', action='store_true', help='Add an unreachable node to the pool')
+    args = parser.parse_args()
+
+    urls = [stub_node(args.base_ms / 1000, args.slow_ms / 1000, args.slow_rate, seed)[1]
+            for seed in range(args.nodes)]
+    if args.dead:
+        urls.insert(1, 'http://127.0.0.1:9')
+
+    providers = [
+        ('single node', HTTPProvider(urls[0])),
+        ('pool, no hedging', RpcPool(urls, timeout=5, hedge_percentile=0)),
+        ('pool, hedged at p95', RpcPool(urls, timeout=5, hedge_percentile=95)),
+    ]
+    print(f"{args.nodes} stub nodes: {args.base_ms}ms, {args.slow_rate:.0%} at {args.slow_ms}ms"
+          f"{' + 1 dead node' if args.dead else ''}; {args.calls} sequential eth_call")
+    print(f"{'provider':<22} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'max ms':>8}")
+    for label, provider in providers:
+        run(provider, min(50, args.calls))  # Warm connections and the latency windows
+        samples = run(provider, args.calls)
+        print(f"{label:<22} {percentile(samples, 50) * 1000:>8.2f} {percentile(samples, 95) * 1000:>8.2f} "
+              f"{percentile(samples, 99) * 1000:>8.2f} {samples[-1] * 1000:>8.2f}")
+        if isinstance(provider, RpcPool):
+            print(f"{'':<22} {provider.snapshot()['counts']}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,118 @@
+# Benchmark: /api/stats polled across cache expiries
+# A canned JSON-RPC provider answers FundTracker view calls after --rpc-ms, so a
+# full project scan costs (projects + 1) round trips. One client polls
+# /api/stats every --interval seconds for --seconds, once per mode:
+#   no cache           every request scans
+#   expiring cache     scan kept for --ttl seconds, the first request after expiry scans
+#   stale-while-reval  expired scan served while a background sweep replaces it,
+#                      hot keys refreshed before they expire
+# Requests slower than half the scan's RPC time are counted as having paid for one.
+#
+# Only web3 needed (the ABI comes from the Hardhat artifact).
+#
+# Usage: python benchmarks/bench_swr_cache.py [--projects 50] [--rpc-ms 2] [--ttl 1] [--seconds 6]
+
+import argparse
+import logging
+import math
+import os
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+os.environ.setdefault('LOG_LEVEL', 'ERROR')
+os.environ.setdefault('ADMISSION_ENABLED', '0')
+
+from eth_abi import encode  # noqa: E402
+from web3 import Web3  # noqa: E402
+from web3.providers.base import JSONBaseProvider  # noqa: E402
+
+import server_fixed  # noqa: E402
+import swr_cache  # noqa: E402
+from contract_registry import FunctionCodec, artifact_path, read_abi  # noqa: E402
+
+ADDRESS = Web3.to_checksum_address('0x' + '11' * 20)
+PROJECT = (1, 'Ward 12 drainage', 10 ** 19, 10 ** 19, 3 * 10 ** 18, '0x' + '22' * 20, b'\x01' * 32, 1,
+           'Ward 12, Pune', 'Maharashtra', 'Pune', 'Pune', '411001', 18520400, 73856700, 1700000000, 2,
+           True, 'Site preparation', 'Foundation', 'Structure', 'Utilities', 'Finishing & handover')
+
+
+class SlowProvider(JSONBaseProvider):
+    """Answers projectCount / getProject eth_calls after a fixed delay"""
+
+    def __init__(self, results, delay):
+        super().__init__()
+        self.results = {'0x' + selector.hex(): '0x' + result.hex() for selector, result in results.items()}
+        self.delay = delay
+
+    def make_request(self, method, params):
+        if method == 'eth_chainId':
+            return {'jsonrpc': '2.0', 'id': 1, 'result': '0x539'}
+        time.sleep(self.delay)
+        data = params[0]['data']
+        return {'jsonrpc': '2.0', 'id': 1, 'result': self.results[data[:10]]}
+
+    def is_connected(self, show_traceback=False):
+        return True
+
+
+def poll(client, seconds, interval):
+    samples = []
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        started = time.perf_counter()
+        response = client.get('/api/stats')
+        response.get_data()
+        samples.append(time.perf_counter() - started)
+        if response.status_code != 200:
+            raise SystemExit(f"/api/stats: HTTP {response.status_code} {response.get_data(as_text=True)[:200]}")
+        time.sleep(interval)
+    return samples
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--projects', type=int, default=50)
+    parser.add_argument('--rpc-ms', type=float, default=2.0)
+    parser.add_argument('--ttl', type=float, default=1.0, help='Soft TTL (expiring cache: the only TTL)')
+    parser.add_argument('--seconds', type=float, default=6.0)
+    parser.add_argument('--interval', type=float, default=0.02)
+    args = parser.parse_args()
+
+    # RPC_URL is not running: chain_version() fails and responses go untagged
+    logging.getLogger('circuit_breaker').setLevel(logging.ERROR)
+    abi = read_abi(artifact_path('FundTracker'))
+    codecs = {item['name']: FunctionCodec(item) for item in abi
+              if item.get('name') in ('projectCount', 'getProject')}
+    w3 = Web3(SlowProvider({
+        codecs['projectCount'].selector: encode(codecs['projectCount'].output_types, [args.projects]),
+        codecs['getProject'].selector: encode(codecs['getProject'].output_types, [PROJECT])
+    }, args.rpc_ms / 1000))
+    server_fixed.contracts.bind(w3)
+    server_fixed.contracts.register('FundTracker', abi=abi, address=ADDRESS)
+    client = server_fixed.app.test_client()
+    scan_ms = (args.projects + 1) * args.rpc_ms
+
+    print(f"{args.projects} projects, {args.rpc_ms} ms per call ({args.projects + 1} calls per scan), "
+          f"soft TTL {args.ttl}s, polling every {args.interval * 1000:.0f} ms for {args.seconds}s")
+    print(f"{'mode':<20} {'requests':>8} {'p50 ms':>8} {'p99 ms':>8} {'max ms':>8} {'scans paid':>10}")
+    hot_hits = swr_cache.HOT_HITS
+    for label, enabled, hard_ttl, hot in (('no cache', False, args.ttl, hot_hits),
+                                          ('expiring cache', True, args.ttl, math.inf),
+                                          ('stale-while-reval', True, args.ttl * 30, hot_hits)):
+        swr_cache.HOT_HITS = hot
+        server_fixed.aggregates = swr_cache.SwrCache(enabled=enabled)
+        server_fixed.AGGREGATE_TTLS['get_stats'] = (args.ttl, hard_ttl)
+        samples = [s * 1000 for s in poll(client, args.seconds, args.interval)]
+        ordered = sorted(samples)
+        paid = sum(1 for s in samples if s > scan_ms / 2)
+        print(f"{label:<20} {len(samples):>8} {statistics.median(samples):>8.2f} "
+              f"{ordered[int(len(ordered) * 0.99) - 1]:>8.2f} {ordered[-1]:>8.2f} {paid:>10}")
+    swr_cache.HOT_HITS = hot_hits
+
+
+if __name__ == '__main__':
+    main()
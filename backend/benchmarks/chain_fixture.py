@@ -0,0 +1,268 @@
+# Deterministic local chain for the on-chain read benchmarks
+# Deploys FundTracker from the Hardhat artifacts and fills it with projects,
+# tenders, milestones and expenditures through the real contract functions,
+# then snapshots the chain so every benchmark run starts from identical data.
+#
+# Backends:
+#   eth-tester   in-process py-evm chain (pip install "web3[tester]"); the
+#                snapshot lives as long as the process
+#   --rpc-url    a local Hardhat node (npx hardhat node); the snapshot id and
+#                contract address are written to a manifest so later processes
+#                reuse the populated chain without redeploying
+#
+# Usage: python benchmarks/chain_fixture.py [--rpc-url http://127.0.0.1:8545]
+#            [--projects 50] [--tenders 2] [--milestones 3] [--expenditures 2]
+#            [--seed 1] [--manifest chain_fixture.json]
+
+import argparse
+import json
+import random
+import sys
+import time
+from pathlib import Path
+
+from web3 import Web3
+
+ROOT_DIR = Path(__file__).resolve().parent.parent.parent
+ARTIFACT_PATH = ROOT_DIR / 'artifacts' / 'contracts' / 'FundTracker.sol' / 'FundTracker.json'
+DEFAULT_MANIFEST = Path(__file__).resolve().parent / 'chain_fixture.json'
+
+# Explicit gas limits skip an eth_estimateGas round trip per transaction
+DEPLOY_GAS = 8_000_000
+TX_GAS = 3_000_000
+
+MILESTONE_PERCENTAGES = (20, 40, 60, 80, 100)
+CITIES = [('Mumbai', 'Maharashtra', 18975000, 72825800), ('Pune', 'Maharashtra', 18520400, 73856700),
+          ('Bangalore', 'Karnataka', 12971600, 77594600), ('Chennai', 'Tamil Nadu', 13082700, 80270700)]
+
+
+def load_artifact(path=ARTIFACT_PATH):
+    with open(path, encoding='utf-8') as f:
+        artifact = json.load(f)
+    return artifact['abi'], artifact['bytecode']
+
+
+class ChainFixture:
+    """
+    FundTracker on a local chain with a reproducible dataset
+    Accounts: [0] admin, [1] supervisor, [2:] contractors
+    """
+
+    def __init__(self, rpc_url=None):
+        if rpc_url:
+            self.w3 = Web3(Web3.HTTPProvider(rpc_url, request_kwargs={'timeout': 60}))
+            self.tester = None
+        else:
+            from web3 import EthereumTesterProvider
+            provider = EthereumTesterProvider()
+            self.w3 = Web3(provider)
+            self.tester = provider.ethereum_tester
+        self.rpc_url = rpc_url
+        self.abi, self.bytecode = load_artifact()
+        accounts = self.w3.eth.accounts
+        if len(accounts) < 3:
+            raise RuntimeError("Need at least 3 unlocked accounts (admin, supervisor, contractor)")
+        self.admin, self.supervisor, self.contractors = accounts[0], accounts[1], accounts[2:]
+        self.contract = None
+        self.snapshot_id = None
+        self.sizes = {}
+        self.counts = {}
+        self.transactions = 0
+
+    @property
+    def address(self):
+        return self.contract.address if self.contract else None
+
+    def _transact(self, function, sender, value=0):
+        tx_hash = function.transact({'from': sender, 'gas': TX_GAS, 'value': value})
+        receipt = self.w3.eth.wait_for_transaction_receipt(tx_hash)
+        if receipt['status'] != 1:
+            raise RuntimeError(f"{function.fn_name} reverted (tx {tx_hash.hex()})")
+        self.transactions += 1
+        return receipt
+
+    def deploy(self):
+        factory = self.w3.eth.contract(abi=self.abi, bytecode=self.bytecode)
+        tx_hash = factory.constructor().transact({'from': self.admin, 'gas': DEPLOY_GAS})
+        receipt = self.w3.eth.wait_for_transaction_receipt(tx_hash)
+        self.contract = self.w3.eth.contract(address=receipt['contractAddress'], abi=self.abi)
+        return self.contract
+
+    def populate(self, projects=50, tenders=2, milestones=3, expenditures=2, seed=1):
+        """
+        Per project: allocate the budget, `tenders` anonymous bids (one approved),
+        `milestones` submissions by the winner (all but the last verified) and
+        `expenditures` records per verified milestone
+        """
+        if self.contract is None:
+            self.deploy()
+        self.sizes = {'projects': projects, 'tenders': tenders, 'milestones': milestones,
+                      'expenditures': expenditures, 'seed': seed}
+        rng = random.Random(seed)
+        functions = self.contract.functions
+        milestones = max(0, min(milestones, len(MILESTONE_PERCENTAGES)))
+        supervisor_commitment = Web3.solidity_keccak(['address'], [self.supervisor])
+
+        for index, contractor in enumerate(self.contractors):
+            self._transact(functions.registerContractor(f'Contractor {index + 1} Pvt Ltd'), contractor)
+
+        project_ids = []
+        for i in range(projects):
+            city, state, latitude, longitude = rng.choice(CITIES)
+            latitude += rng.randint(-100000, 100000)
+            longitude += rng.randint(-100000, 100000)
+            budget = rng.randint(1, 50) * 10 ** 18
+            self._transact(functions.createProject(
+                f'Project {i + 1}', budget, supervisor_commitment, f'Ward {rng.randint(1, 200)}, {city}',
+                state, city, city, str(rng.randint(400001, 600099)), latitude, longitude,
+                'Site preparation', 'Foundation', 'Structure', 'Utilities', 'Finishing & handover'
+            ), self.admin)
+            project_id = functions.projectCount().call()
+            self._transact(functions.allocateFunds(project_id), self.admin, value=budget)
+            project_ids.append((project_id, latitude, longitude))
+
+        # Approved contractors are ineligible for new bids, so every bid goes in first
+        bids = {}
+        for project_id, _, _ in project_ids:
+            bidders = rng.sample(self.contractors, min(tenders, len(self.contractors)))
+            for contractor in bidders:
+                nonce = rng.getrandbits(256).to_bytes(32, 'big')
+                commitment = Web3.solidity_keccak(['address', 'bytes32'], [contractor, nonce])
+                self._transact(functions.submitAnonymousTender(
+                    project_id, commitment, f'Qm{rng.getrandbits(160):044x}',
+                    f'Qm{rng.getrandbits(160):044x}', f'Qm{rng.getrandbits(160):044x}'
+                ), contractor)
+                bids.setdefault(project_id, []).append((functions.tenderCount().call(), contractor, nonce))
+
+        for project_id, latitude, longitude in project_ids:
+            if not bids.get(project_id):
+                continue
+            tender_id, contractor, nonce = bids[project_id][0]
+            self._transact(functions.approveTender(tender_id, contractor, nonce), self.supervisor)
+
+            for step, percentage in enumerate(MILESTONE_PERCENTAGES[:milestones]):
+                # Within a few metres of the center, so the contract's GPS check passes
+                lat = latitude + rng.randint(-20, 20)
+                lon = longitude + rng.randint(-20, 20)
+                self._transact(functions.submitMilestone(
+                    tender_id, percentage, f'Milestone {percentage}% complete',
+                    f'Qm{rng.getrandbits(160):044x}', f'{lat / 1e6:.6f},{lon / 1e6:.6f}', lat, lon,
+                    f'Qm{rng.getrandbits(160):044x}', rng.getrandbits(256).to_bytes(32, 'big')
+                ), contractor)
+                milestone_id = functions.milestoneCount().call()
+                if step == milestones - 1:
+                    continue  # Latest submission stays pending verification
+                self._transact(functions.verifyAndReleaseFunds(milestone_id, True, True, True), self.supervisor)
+                for k in range(expenditures):
+                    self._transact(functions.recordExpenditure(
+                        project_id, milestone_id, rng.randint(1, 100) * 10 ** 15,
+                        rng.choice(['Materials', 'Labour', 'Equipment hire', 'Transport']) + f' batch {k + 1}',
+                        rng.choice(self.contractors)
+                    ), self.admin)
+
+        self.counts = {
+            'projects': functions.projectCount().call(),
+            'tenders': functions.tenderCount().call(),
+            'milestones': functions.milestoneCount().call(),
+            'expenditures': functions.expenditureCount().call(),
+            'contractors': len(self.contractors),
+        }
+        return self.counts
+
+    # ============ Snapshots ============
+
+    def snapshot(self):
+        if self.tester is not None:
+            self.snapshot_id = self.tester.take_snapshot()
+        else:
+            self.snapshot_id = self.w3.provider.make_request('evm_snapshot', [])['result']
+        return self.snapshot_id
+
+    def revert(self):
+        """Back to the populated state; benchmarks that write call this between runs"""
+        if self.snapshot_id is None:
+            raise RuntimeError("No snapshot taken")
+        if self.tester is not None:
+            self.tester.revert_to_snapshot(self.snapshot_id)
+            return
+        result = self.w3.provider.make_request('evm_revert', [self.snapshot_id])
+        if not result.get('result'):
+            raise RuntimeError(f"evm_revert failed: {result}")
+        # Hardhat drops a snapshot once it is reverted to; take it again
+        self.snapshot()
+
+    def manifest(self):
+        return {
+            'rpc_url': self.rpc_url,
+            'contract_address': self.address,
+            'snapshot_id': self.snapshot_id,
+            'sizes': self.sizes,
+            'counts': self.counts,
+        }
+
+    @classmethod
+    def from_manifest(cls, path=DEFAULT_MANIFEST):
+        """Reattach to a populated Hardhat node; None if the snapshot is gone"""
+        with open(path, encoding='utf-8') as f:
+            manifest = json.load(f)
+        if not manifest.get('rpc_url'):
+            return None
+        fixture = cls(manifest['rpc_url'])
+        if not fixture.w3.is_connected():
+            return None
+        fixture.contract = fixture.w3.eth.contract(address=manifest['contract_address'], abi=fixture.abi)
+        fixture.snapshot_id = manifest['snapshot_id']
+        fixture.sizes = manifest['sizes']
+        fixture.counts = manifest['counts']
+        try:
+            fixture.revert()
+        except RuntimeError:
+            return None  # Node restarted since the manifest was written
+        return fixture
+
+
+def build(rpc_url=None, manifest=None, **sizes):
+    """
+    Populated, snapshotted fixture
+    With a Hardhat node and a manifest whose sizes match, the existing chain is reused
+    """
+    if rpc_url and manifest and Path(manifest).exists():
+        fixture = ChainFixture.from_manifest(manifest)
+        if fixture is not None and fixture.rpc_url == rpc_url and fixture.sizes == sizes:
+            return fixture
+    fixture = ChainFixture(rpc_url)
+    fixture.deploy()
+    fixture.populate(**sizes)
+    fixture.snapshot()
+    if rpc_url and manifest:
+        with open(manifest, 'w', encoding='utf-8') as f:
+            json.dump(fixture.manifest(), f, indent=2)
+    return fixture
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--rpc-url', help='Hardhat node; in-process eth-tester when omitted')
+    parser.add_argument('--projects', type=int, default=50)
+    parser.add_argument('--tenders', type=int, default=2, help='Bids per project')
+    parser.add_argument('--milestones', type=int, default=3, help='Milestone submissions per project (max 5)')
+    parser.add_argument('--expenditures', type=int, default=2, help='Per verified milestone')
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--manifest', default=str(DEFAULT_MANIFEST))
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    fixture = build(args.rpc_url, args.manifest if args.rpc_url else None, projects=args.projects,
+                    tenders=args.tenders, milestones=args.milestones, expenditures=args.expenditures,
+                    seed=args.seed)
+    elapsed = time.perf_counter() - started
+    print(f"FundTracker at {fixture.address} ({'Hardhat ' + args.rpc_url if args.rpc_url else 'eth-tester'})")
+    print(f"  {fixture.transactions} transactions in {elapsed:.1f}s, snapshot {fixture.snapshot_id}")
+    for name, count in fixture.counts.items():
+        print(f"  {name:<13} {count}")
+    if args.rpc_url:
+        print(f"  manifest: {args.manifest}")
+
+
+if __name__ == '__main__':
+    sys.exit(main())
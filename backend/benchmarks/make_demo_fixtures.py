@@ -0,0 +1,122 @@
+# Generate a synthetic demo fixture dataset for load tests
+# Same shape as demo_fixtures.json, scaled up; point server_simple at it with
+#   DEMO_FIXTURES=/tmp/fixtures.json python server_simple.py
+#
+# Usage: python benchmarks/make_demo_fixtures.py -o /tmp/fixtures.json [--projects 5000]
+
+import argparse
+import json
+import random
+from datetime import datetime, timedelta, timezone
+
+PROJECT_NAMES = ['Road Construction', 'School Building', 'Water Supply Upgrade', 'Drainage Repair',
+                 'Street Lighting', 'Community Hall', 'Bridge Maintenance', 'Park Renovation']
+STATUSES = ['Planning', 'In Progress', 'Completed']
+LOCATIONS = ['Downtown', 'East District', 'West Zone', 'North Ward', 'South Ward']
+TX_TYPES = ['project_create', 'fund_allocation', 'expenditure', 'milestone_create']
+
+
+def tx_hash(rng):
+    return '0x' + ''.join(rng.choice('0123456789abcdef') for _ in range(40))
+
+
+def make_projects(rng, count, started):
+    projects = []
+    for i in range(1, count + 1):
+        budget = rng.randrange(100000, 5000000, 10000)
+        allocated = rng.randrange(0, budget + 1, 10000)
+        projects.append({
+            'id': f'demo-{i}',
+            'name': f"{rng.choice(PROJECT_NAMES)} #{i}",
+            'description': 'Synthetic project for load testing',
+            'budget': budget,
+            'allocated': allocated,
+            'spent': rng.randrange(0, allocated + 1, 10000) if allocated else 0,
+            'status': rng.choice(STATUSES),
+            'location': rng.choice(LOCATIONS),
+            'created_at': (started + timedelta(days=i % 365)).strftime('%Y-%m-%d'),
+            'tx_hash': tx_hash(rng)
+        })
+    return projects
+
+
+def make_transactions(rng, count, projects, started):
+    transactions = []
+    block = 12345678
+    for i in range(1, count + 1):
+        block += rng.randint(1, 300)
+        project = rng.choice(projects)
+        kind = rng.choice(TX_TYPES)
+        details = {'project_name': project['name']}
+        if kind == 'project_create':
+            details.update(budget=project['budget'], created_by='Admin')
+        elif kind == 'fund_allocation':
+            details.update(amount=rng.randrange(10000, 500000, 10000), allocated_by='Supervisor')
+        elif kind == 'expenditure':
+            details.update(amount=rng.randrange(10000, 500000, 10000), contractor='ABC Contractors',
+                           description='Material procurement')
+        else:
+            details.update(milestone=f"Milestone {rng.randint(1, 5)}", target_amount=rng.randrange(10000, 500000, 10000))
+        transactions.append({
+            'id': f'tx-{i}',
+            'type': kind,
+            'tx_hash': tx_hash(rng),
+            'timestamp': (started + timedelta(minutes=7 * i)).strftime('%Y-%m-%dT%H:%M:%SZ'),
+            'block_number': block,
+            'status': 'confirmed' if rng.random() < 0.95 else 'pending',
+            'details': details
+        })
+    return transactions
+
+
+def make_verifications(rng, count, projects, started):
+    verifications = []
+    for i in range(1, count + 1):
+        project = rng.choice(projects)
+        files = [{'name': f'Proof {k + 1}.pdf', 'url': f'/uploads/verify{i}-{k + 1}.pdf', 'type': 'pdf'}
+                 for k in range(rng.randint(1, 3))]
+        verifications.append({
+            'id': f'verify-{i}',
+            'project_id': project['id'],
+            'project_name': project['name'],
+            'milestone_id': f'milestone-{i}',
+            'milestone_name': f"Milestone {rng.randint(1, 5)}",
+            'contractor_id': f'CNTR-{rng.randint(10000, 99999)}',
+            'contractor_name': 'ABC Contractors',
+            'contractor_address': tx_hash(rng),
+            'submitted_at': (started + timedelta(hours=i)).strftime('%Y-%m-%dT%H:%M:%SZ'),
+            'status': 'pending_verification',
+            'percentage_complete': rng.choice([20, 25, 50, 75, 100]),
+            'amount_requested': rng.randrange(10000, 500000, 5000),
+            'proof_documents': files,
+            'gps_coordinates': f"{rng.uniform(8, 35):.4f}° N, {rng.uniform(68, 97):.4f}° E",
+            'completion_proof': 'Work completed as per specifications',
+            'submission_files': files
+        })
+    return verifications
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Generate synthetic demo fixtures')
+    parser.add_argument('-o', '--output', required=True)
+    parser.add_argument('--projects', type=int, default=5000)
+    parser.add_argument('--transactions', type=int, default=20000)
+    parser.add_argument('--verifications', type=int, default=1000)
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    started = datetime(2025, 1, 1, tzinfo=timezone.utc)
+    projects = make_projects(rng, args.projects, started)
+    fixtures = {
+        'projects': projects,
+        'transactions': make_transactions(rng, args.transactions, projects, started),
+        'verifications': make_verifications(rng, args.verifications, projects, started)
+    }
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(fixtures, f, ensure_ascii=False)
+    print(f"✅ Wrote {args.output}: " + ', '.join(f"{len(v)} {k}" for k, v in fixtures.items()))
+
+
+if __name__ == '__main__':
+    main()
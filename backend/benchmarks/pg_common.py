@@ -0,0 +1,43 @@
+# Shared PostgreSQL helpers for the database benchmarks
+
+import os
+import time
+from pathlib import Path
+
+import psycopg2
+from dotenv import load_dotenv
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+SCHEMA_FILE = BACKEND_DIR.parent / 'database_schema.sql'
+
+
+def connect():
+    """Connect with the DB_* settings from backend/.env"""
+    load_dotenv(BACKEND_DIR / '.env')
+    return psycopg2.connect(
+        host=os.environ.get('DB_HOST', 'localhost'),
+        port=os.environ.get('DB_PORT', 5432),
+        user=os.environ.get('DB_USER', 'postgres'),
+        password=os.environ.get('DB_PASSWORD', ''),
+        dbname=os.environ.get('DB_NAME', 'municipal_fund_tracker'),
+    )
+
+
+def schema_section(start_marker, end_marker):
+    """Slice of database_schema.sql between two comment markers"""
+    sql = SCHEMA_FILE.read_text(encoding='utf-8')
+    start = sql.index(start_marker)
+    return sql[start:sql.index(end_marker, start)]
+
+
+def timed(cur, query, params, rounds):
+    """Median wall time of a query over `rounds` runs, plus the rows of the last run"""
+    samples = []
+    rows = None
+    for _ in range(rounds):
+        started = time.perf_counter()
+        cur.execute(query, params)
+        rows = cur.fetchall()
+        samples.append(time.perf_counter() - started)
+    samples.sort()
+    return samples[len(samples) // 2], rows
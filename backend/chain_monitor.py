@@ -0,0 +1,132 @@
+# Background chain health monitor
+# A daemon thread polls the node every MONITOR_INTERVAL seconds (latest block,
+# sync state, peers, accounts) and swaps in an immutable snapshot, so status
+# and health endpoints answer from memory instead of making RPC calls per hit.
+# Polls go through the same w3 (metrics, circuit breaker), which also makes the
+# monitor the periodic probe that closes an open circuit without user traffic.
+#
+# The thread starts on first use rather than at import, so it runs in each
+# worker process after a pre-fork server has forked.
+
+import logging
+import os
+import threading
+import time
+
+MONITOR_INTERVAL = float(os.environ.get('MONITOR_INTERVAL', 2.0))
+# Health checks fail when the newest block is older than this (0 disables)
+MAX_BLOCK_AGE = float(os.environ.get('MONITOR_MAX_BLOCK_AGE', 0))
+# Node details that only change when the node does; re-read every this many polls
+STATIC_EVERY = 30
+
+log = logging.getLogger(__name__)
+
+
+def _optional(fn):
+    """Value or None; dev nodes don't implement every net_/eth_ method"""
+    try:
+        return fn()
+    except Exception:
+        return None
+
+
+class ChainMonitor:
+    """Polls w3 in the background; snapshot() is a dict that is never mutated"""
+
+    def __init__(self, w3, interval=MONITOR_INTERVAL, max_block_age=MAX_BLOCK_AGE):
+        self.w3 = w3
+        self.interval = interval
+        self.max_block_age = max_block_age
+        self.polls = 0
+        self._snapshot = None
+        self._static = {}
+        self._thread = None
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+
+    def start(self):
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name='chain-monitor', daemon=True)
+            self._thread.start()
+
+    def bind(self, w3):
+        """Watch another Web3 instance; the next snapshot() polls it first"""
+        self.w3 = w3
+        self._static = {}
+        self._snapshot = None
+
+    def stop(self):
+        self._stop.set()
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self.poll()
+
+    def poll(self):
+        """One round of RPC calls; replaces the snapshot"""
+        started = time.perf_counter()
+        previous = self._snapshot or {}
+        status = {"connected": False, "error": None}
+        try:
+            block = self.w3.eth.get_block('latest')
+        except Exception as e:
+            status["error"] = str(e) or type(e).__name__
+            status["consecutive_failures"] = previous.get("consecutive_failures", 0) + 1
+            # Keep the last known chain position so callers can see how far behind it is
+            for key in ("latest_block", "block_hash", "block_timestamp", "accounts"):
+                status[key] = previous.get(key)
+            if previous.get("connected"):
+                log.warning("Chain monitor: node unreachable: %s", status["error"])
+            self._static = {}
+        else:
+            if not self._static or self.polls % STATIC_EVERY == 0:
+                self._static = {
+                    "chain_id": _optional(lambda: self.w3.eth.chain_id),
+                    "client_version": _optional(lambda: self.w3.client_version)
+                }
+            syncing = _optional(lambda: self.w3.eth.syncing)
+            status.update(self._static)
+            status.update({
+                "connected": True,
+                "consecutive_failures": 0,
+                "latest_block": block['number'],
+                "block_hash": block['hash'].hex(),
+                "block_timestamp": block['timestamp'],
+                "syncing": dict(syncing) if syncing else False,
+                "peer_count": _optional(lambda: self.w3.net.peer_count),
+                "accounts": _optional(lambda: list(self.w3.eth.accounts)) or []
+            })
+            if previous and not previous.get("connected"):
+                log.warning("Chain monitor: node reachable again at block %s", block['number'])
+        status["checked_at"] = time.time()
+        status["poll_ms"] = round((time.perf_counter() - started) * 1000, 2)
+        self.polls += 1
+        self._snapshot = status
+        return status
+
+    def snapshot(self):
+        """Latest status; the first call polls synchronously and starts the thread"""
+        if self._snapshot is None:
+            self.poll()
+        if self._thread is None or not self._thread.is_alive():
+            self.start()
+        status = dict(self._snapshot)
+        now = time.time()
+        status["age_seconds"] = round(now - status["checked_at"], 3)
+        if status.get("block_timestamp"):
+            status["block_age_seconds"] = round(now - status["block_timestamp"], 1)
+        return status
+
+    def healthy(self, status=None):
+        status = status or self.snapshot()
+        if not status["connected"] or status.get("syncing"):
+            return False
+        # A stopped monitor thread leaves an old snapshot behind; don't report it as healthy
+        if status["age_seconds"] > max(3 * self.interval, 10):
+            return False
+        if self.max_block_age and status.get("block_age_seconds", 0) > self.max_block_age:
+            return False
+        return True
@@ -0,0 +1,214 @@
+# Circuit breaker for RPC node access, with last-known-good fallback
+# Every JSON-RPC request goes through the breaker's web3 middleware. Transport
+# errors and calls slower than CIRCUIT_SLOW_SECONDS count as failures; after
+# CIRCUIT_FAILURES of them in a row the circuit opens and chain calls fail
+# immediately instead of waiting for the HTTP timeout. Once CIRCUIT_RESET_SECONDS
+# have passed a single probe call is let through: success closes the circuit,
+# failure keeps it open for another period.
+#
+# Read views decorated with StaleCache.fallback remember their last successful
+# body and serve it, marked `"stale": true` with its age, while the node is
+# unreachable. With nothing remembered they answer 503 with Retry-After.
+# JSON-RPC error responses (reverts, bad params) mean the node is up and are
+# not failures.
+
+import collections
+import functools
+import json
+import logging
+import math
+import os
+import threading
+import time
+
+from flask import jsonify, make_response, request
+
+FAILURE_THRESHOLD = int(os.environ.get('CIRCUIT_FAILURES', 5))
+SLOW_CALL_SECONDS = float(os.environ.get('CIRCUIT_SLOW_SECONDS', 2.0))
+RESET_SECONDS = float(os.environ.get('CIRCUIT_RESET_SECONDS', 10.0))
+STALE_ENTRIES = 1024
+
+CLOSED = 'closed'
+OPEN = 'open'
+HALF_OPEN = 'half_open'
+
+log = logging.getLogger(__name__)
+
+
+class ChainUnavailableError(Exception):
+    """The RPC node could not be reached (or answered too slowly)"""
+
+    def __init__(self, message, retry_after=None):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class CircuitOpenError(ChainUnavailableError):
+    """Raised without contacting the node while the circuit is open"""
+
+
+class CircuitBreaker:
+    """
+    Consecutive-failure breaker: closed -> open -> half_open (one probe) -> closed
+    allow() before a call and record() after it; call() and middleware() do both
+    """
+
+    def __init__(self, name='rpc', failure_threshold=FAILURE_THRESHOLD, slow_call_seconds=SLOW_CALL_SECONDS,
+                 reset_seconds=RESET_SECONDS):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.slow_call_seconds = slow_call_seconds
+        self.reset_seconds = reset_seconds
+        self.state = CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self.last_error = None
+        self.counts = collections.Counter()
+        self._probing = False
+        self._lock = threading.Lock()
+
+    def retry_after(self, now=None):
+        """Seconds until the next probe is allowed; 0 unless open"""
+        if self.state != OPEN:
+            return 0.0
+        now = time.monotonic() if now is None else now
+        return max(0.0, self.opened_at + self.reset_seconds - now)
+
+    def allow(self, now=None):
+        """True if a call may go to the node; an allowed half-open call is the probe"""
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            if self.state == CLOSED:
+                return True
+            if self.state == OPEN and now - self.opened_at >= self.reset_seconds:
+                self.state = HALF_OPEN
+                self._probing = False
+            if self.state == HALF_OPEN and not self._probing:
+                self._probing = True
+                self.counts['probes'] += 1
+                return True
+            self.counts['rejected'] += 1
+            return False
+
+    def record(self, duration, error=None, now=None):
+        """Outcome of an allowed call; slow successes count as failures"""
+        now = time.monotonic() if now is None else now
+        failed = error is not None or duration > self.slow_call_seconds
+        with self._lock:
+            self._probing = False
+            if not failed:
+                self.counts['succeeded'] += 1
+                self.failures = 0
+                if self.state != CLOSED:
+                    self.state = CLOSED
+                    log.warning("Circuit %s closed", self.name)
+                return
+            self.counts['failed' if error is not None else 'slow'] += 1
+            self.failures += 1
+            self.last_error = str(error) if error is not None else f"call took {duration:.2f}s"
+            if self.state == HALF_OPEN or (self.state == CLOSED and self.failures >= self.failure_threshold):
+                if self.state == CLOSED:
+                    log.warning("Circuit %s opened after %d failures: %s", self.name, self.failures,
+                                self.last_error)
+                self.state = OPEN
+                self.opened_at = now
+                self.counts['opened'] += 1
+
+    def _reject(self):
+        retry_after = self.retry_after()
+        return CircuitOpenError(f"Circuit {self.name} open, retry in {retry_after:.0f}s", retry_after)
+
+    def call(self, fn, *args, **kwargs):
+        """fn(*args, **kwargs) through the breaker; OSError (any transport error) is a failure"""
+        if not self.allow():
+            raise self._reject()
+        started = time.perf_counter()
+        try:
+            result = fn(*args, **kwargs)
+        except OSError as e:
+            self.record(time.perf_counter() - started, e)
+            raise ChainUnavailableError(str(e), self.retry_after()) from e
+        except BaseException:
+            # The node answered; the error is the caller's (decoding, reverts)
+            self.record(time.perf_counter() - started)
+            raise
+        self.record(time.perf_counter() - started)
+        return result
+
+    def middleware(self, make_request, w3):
+        """web3 middleware: w3.middleware_onion.add(breaker.middleware, name='circuit_breaker')"""
+        def middleware(method, params):
+            return self.call(make_request, method, params)
+        return middleware
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                "name": self.name,
+                "state": self.state,
+                "consecutive_failures": self.failures,
+                "retry_after": round(self.retry_after(), 1),
+                "last_error": self.last_error,
+                "counts": dict(self.counts)
+            }
+
+
+def unavailable_response(error):
+    """503 for a chain read that has nothing to fall back on"""
+    retry_after = max(1, math.ceil(getattr(error, 'retry_after', None) or 1))
+    response = jsonify({"error": "Blockchain unavailable", "detail": str(error), "retry_after": retry_after})
+    response.status_code = 503
+    response.headers['Retry-After'] = str(retry_after)
+    return response
+
+
+class StaleCache:
+    """
+    Last successful 200 body per URL, bounded LRU
+    Bodies are stored as sent; they are only parsed again when served stale
+    """
+
+    def __init__(self, max_entries=STALE_ENTRIES):
+        self.max_entries = max_entries
+        self.served = 0
+        self._entries = collections.OrderedDict()  # full_path -> (body, stored_at)
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def put(self, key, body, now=None):
+        with self._lock:
+            self._entries[key] = (body, time.time() if now is None else now)
+            self._entries.move_to_end(key)
+            if len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def get(self, key):
+        with self._lock:
+            return self._entries.get(key)
+
+    def fallback(self, view):
+        """Decorator for JSON read views that let ChainUnavailableError propagate"""
+        @functools.wraps(view)
+        def wrapper(*args, **kwargs):
+            key = request.full_path
+            try:
+                response = make_response(view(*args, **kwargs))
+            except ChainUnavailableError as e:
+                entry = self.get(key)
+                if entry is None:
+                    return unavailable_response(e)
+                body, stored_at = entry
+                age = max(0.0, time.time() - stored_at)
+                payload = json.loads(body)
+                payload.update(stale=True, stale_age=round(age, 1))
+                self.served += 1
+                response = jsonify(payload)
+                response.headers['Age'] = str(int(age))
+                response.headers['Cache-Control'] = 'no-store'
+                return response
+            if response.status_code == 200 and response.is_json:
+                self.put(key, response.get_data())
+            return response
+        return wrapper
@@ -0,0 +1,210 @@
+# Response compression for the Flask servers
+# gzip / brotli negotiated from Accept-Encoding, skipped for small bodies,
+# streamed for streaming responses, and cached for responses with an ETag
+
+import collections
+import gzip
+import os
+import threading
+import time
+import zlib
+
+from flask import jsonify, request
+
+try:
+    import brotli
+except ImportError:  # Brotli is optional; gzip alone still works
+    brotli = None
+
+MIN_SIZE = int(os.environ.get('COMPRESS_MIN_SIZE', 1024))
+GZIP_LEVEL = 6
+BROTLI_QUALITY = 5  # Higher qualities cost far more CPU than they save on JSON
+CACHE_MAX_BYTES = 32 * 1024 * 1024
+
+COMPRESSIBLE_TYPES = ('application/json', 'application/x-ndjson', 'text/csv', 'text/plain', 'text/html',
+                      'application/javascript', 'text/css')
+
+
+def supported_encodings():
+    return ('br', 'gzip') if brotli is not None else ('gzip',)
+
+
+def choose_encoding(accept_encodings):
+    """Best encoding the client accepts ('br' preferred), or None"""
+    best, best_quality = None, 0
+    for encoding in supported_encodings():
+        quality = accept_encodings[encoding]
+        if quality > best_quality:
+            best, best_quality = encoding, quality
+    return best
+
+
+def compress(data, encoding):
+    if encoding == 'br':
+        return brotli.compress(data, quality=BROTLI_QUALITY)
+    return gzip.compress(data, compresslevel=GZIP_LEVEL, mtime=0)
+
+
+def _stream_compressor(encoding):
+    """(compress(chunk), finish()) pair for incremental compression"""
+    if encoding == 'br':
+        compressor = brotli.Compressor(quality=BROTLI_QUALITY)
+        return compressor.process, compressor.finish
+    compressor = zlib.compressobj(GZIP_LEVEL, zlib.DEFLATED, 31)  # wbits 31 = gzip container
+    return compressor.compress, compressor.flush
+
+
+class CompressedCache:
+    """LRU of compressed bodies keyed by (path, ETag, encoding), bounded by total bytes"""
+
+    def __init__(self, max_bytes=CACHE_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self.size = 0
+        self._entries = collections.OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            data = self._entries.get(key)
+            if data is not None:
+                self._entries.move_to_end(key)
+            return data
+
+    def put(self, key, data):
+        if len(data) > self.max_bytes:
+            return
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self.size -= len(old)
+            self._entries[key] = data
+            self.size += len(data)
+            while self.size > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self.size -= len(evicted)
+
+
+class Compressor:
+    """
+    after_request hook compressing eligible responses
+    Per-endpoint stats (bytes in/out, CPU time, cache hits) at /api/compression/stats
+    """
+
+    def __init__(self, app=None, min_size=MIN_SIZE, cache_max_bytes=CACHE_MAX_BYTES):
+        self.min_size = min_size
+        self.cache = CompressedCache(cache_max_bytes)
+        self._stats = collections.defaultdict(lambda: collections.Counter())
+        self._stats_lock = threading.Lock()
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        app.after_request(self.after_request)
+        app.add_url_rule('/api/compression/stats', 'compression_stats', self.stats_view)
+
+    def _record(self, endpoint, **values):
+        with self._stats_lock:
+            self._stats[endpoint or 'unknown'].update(values)
+
+    def _eligible(self, response):
+        if response.status_code < 200 or response.status_code in (204, 206, 304):
+            return False
+        if 'Content-Encoding' in response.headers or response.direct_passthrough:
+            return False
+        # SSE frames must reach the client immediately; don't buffer them in a compressor
+        return response.mimetype in COMPRESSIBLE_TYPES
+
+    def after_request(self, response):
+        if not self._eligible(response):
+            return response
+        response.vary.add('Accept-Encoding')
+        encoding = choose_encoding(request.accept_encodings)
+        if encoding is None:
+            return response
+
+        if response.is_streamed:
+            return self._compress_stream(response, encoding)
+
+        data = response.get_data()
+        if len(data) < self.min_size:
+            self._record(request.endpoint, responses=1, skipped_small=1, bytes_in=len(data), bytes_out=len(data))
+            return response
+
+        etag, weak = response.get_etag()
+        key = (request.full_path, etag, encoding) if etag else None
+        compressed = self.cache.get(key) if key else None
+        if compressed is not None:
+            self._record(request.endpoint, responses=1, compressed=1, cache_hits=1,
+                         bytes_in=len(data), bytes_out=len(compressed))
+        else:
+            started = time.thread_time()
+            compressed = compress(data, encoding)
+            cpu_us = int((time.thread_time() - started) * 1_000_000)
+            if key:
+                self.cache.put(key, compressed)
+            self._record(request.endpoint, responses=1, compressed=1, cpu_us=cpu_us,
+                         bytes_in=len(data), bytes_out=len(compressed))
+
+        response.set_data(compressed)
+        response.headers['Content-Encoding'] = encoding
+        if etag and not weak:
+            # Same ETag for every encoding is only valid as a weak validator (as nginx does)
+            response.set_etag(etag, weak=True)
+        return response
+
+    def _compress_stream(self, response, encoding):
+        compress_chunk, finish = _stream_compressor(encoding)
+        source = response.response
+        endpoint = request.endpoint
+        record = self._record
+
+        def generate():
+            bytes_in = bytes_out = cpu = 0
+            try:
+                for chunk in source:
+                    if isinstance(chunk, str):
+                        chunk = chunk.encode()
+                    bytes_in += len(chunk)
+                    started = time.thread_time()
+                    out = compress_chunk(chunk)
+                    cpu += time.thread_time() - started
+                    if out:
+                        bytes_out += len(out)
+                        yield out
+                started = time.thread_time()
+                out = finish()
+                cpu += time.thread_time() - started
+                bytes_out += len(out)
+                yield out
+            finally:
+                if hasattr(source, 'close'):
+                    source.close()
+                record(endpoint, responses=1, compressed=1, streamed=1, cpu_us=int(cpu * 1_000_000),
+                       bytes_in=bytes_in, bytes_out=bytes_out)
+
+        response.response = generate()
+        response.headers['Content-Encoding'] = encoding
+        response.headers.pop('Content-Length', None)
+        etag, weak = response.get_etag()
+        if etag and not weak:
+            response.set_etag(etag, weak=True)
+        return response
+
+    def stats(self):
+        with self._stats_lock:
+            endpoints = {name: dict(counter) for name, counter in self._stats.items()}
+        for values in endpoints.values():
+            bytes_in = values.get('bytes_in', 0)
+            values['bytes_saved'] = bytes_in - values.get('bytes_out', 0)
+            values['ratio'] = round(values.get('bytes_out', 0) / bytes_in, 3) if bytes_in else None
+            compressed = values.get('compressed', 0) - values.get('cache_hits', 0)
+            values['avg_cpu_us'] = round(values.get('cpu_us', 0) / compressed, 1) if compressed else 0
+        return {
+            "encodings": list(supported_encodings()),
+            "min_size": self.min_size,
+            "cache_bytes": self.cache.size,
+            "endpoints": endpoints
+        }
+
+    def stats_view(self):
+        return jsonify(self.stats())
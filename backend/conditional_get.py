@@ -0,0 +1,71 @@
+# Conditional GET support for polled read endpoints
+# ETags come from cheap version tags (collection counters, latest block), so
+# an unchanged poll is answered with 304 before the view does any work
+
+import functools
+import threading
+import uuid
+
+from flask import make_response, request
+
+# Responses may be stored but must be revalidated on every use
+DEFAULT_CACHE_CONTROL = 'no-cache'
+
+
+class VersionCounters:
+    """
+    Per-collection change counters for in-memory stores
+    Call bump() after every write; tag() describes the current state
+    """
+
+    def __init__(self):
+        # Counters restart with the process; the boot id keeps old ETags from matching
+        self.boot_id = uuid.uuid4().hex[:8]
+        self._versions = {}
+        self._lock = threading.Lock()
+
+    def bump(self, *names):
+        with self._lock:
+            for name in names:
+                self._versions[name] = self._versions.get(name, 0) + 1
+
+    def get(self, name):
+        return self._versions.get(name, 0)
+
+    def tag(self, *names):
+        return '-'.join([self.boot_id] + [f"{name}.{self.get(name)}" for name in names])
+
+
+def conditional(version_tag, cache_control=DEFAULT_CACHE_CONTROL):
+    """
+    Decorator: strong ETag from version_tag(), 304 on If-None-Match
+    The tag only has to change when this URL's body may change
+    version_tag returning None (e.g. backend unreachable) skips conditional handling
+    Only 200 responses get an ETag, and not those marked no-store (e.g. stale
+    fallbacks, whose body is older than the version the tag describes)
+    """
+    def decorator(view):
+        @functools.wraps(view)
+        def wrapper(*args, **kwargs):
+            try:
+                etag = version_tag()
+            except Exception:
+                etag = None
+            if etag is None:
+                return view(*args, **kwargs)
+
+            etag = str(etag)
+            # If-None-Match uses the weak comparison (RFC 9110 13.1.2)
+            if request.if_none_match.contains_weak(etag):
+                response = make_response('', 304)
+            else:
+                response = make_response(view(*args, **kwargs))
+                # Keep ETags the view set itself (e.g. precomputed bodies)
+                if (response.status_code != 200 or 'ETag' in response.headers
+                        or response.cache_control.no_store):
+                    return response
+            response.set_etag(etag)
+            response.headers['Cache-Control'] = cache_control
+            return response
+        return wrapper
+    return decorator
@@ -0,0 +1,230 @@
+# Contract registry: ABIs parsed once, contract instances and call codecs cached
+# w3.eth.contract() builds a class with a wrapper per ABI entry (~17ms for
+# FundTracker) and every ContractFunction.call() re-resolves the ABI and
+# re-derives the encoders, then normalizes the result by walking the ABI type
+# tree. Entries here are built once per ABI/address: the web3 contract for
+# anything that needs it, plus a FunctionCodec per function (selector, types and
+# a precompiled result normalizer) for plain view calls via call().
+#
+# Sources are re-checked at most every CONTRACT_RELOAD_SECONDS; when the ABI
+# file or the address file (frontend/contractAddress.json, written by
+# scripts/deploy.js) changes, the entry is rebuilt. A redeploy is picked up
+# without restarting the server; a half-written file keeps the old entry.
+
+import json
+import logging
+import os
+import threading
+import time
+from pathlib import Path
+
+from eth_abi import decode, encode
+from eth_abi.grammar import TupleType, parse
+from eth_utils import function_abi_to_4byte_selector
+from eth_utils.abi import collapse_if_tuple
+from web3 import Web3
+
+ROOT_DIR = Path(__file__).resolve().parent.parent
+FRONTEND_DIR = ROOT_DIR / 'frontend'
+ARTIFACTS_DIR = ROOT_DIR / 'artifacts' / 'contracts'
+ADDRESS_FILE = FRONTEND_DIR / 'contractAddress.json'
+RELOAD_SECONDS = float(os.environ.get('CONTRACT_RELOAD_SECONDS', 2))
+# deploy.js writes contractAddress; older deployments wrote address
+ADDRESS_KEYS = ('contractAddress', 'address')
+
+log = logging.getLogger(__name__)
+
+
+def artifact_path(contract_name):
+    """Hardhat artifact for contracts/<name>.sol"""
+    return ARTIFACTS_DIR / f'{contract_name}.sol' / f'{contract_name}.json'
+
+
+def read_abi(path):
+    """ABI from a bare ABI file or a Hardhat artifact"""
+    with open(path, encoding='utf-8') as f:
+        data = json.load(f)
+    return data['abi'] if isinstance(data, dict) else data
+
+
+def read_address(path, keys=ADDRESS_KEYS):
+    with open(path, encoding='utf-8') as f:
+        data = json.load(f)
+    for key in keys:
+        if data.get(key):
+            return data[key]
+    return None
+
+
+def _normalizer(node):
+    """
+    What web3 does to a decoded value of this ABI type: arrays become lists,
+    addresses are checksummed. Built once per type; None when the value is kept as is
+    """
+    if node.arrlist:
+        inner = _normalizer(node.item_type)
+        if inner is None:
+            return list
+        return lambda values: [inner(value) for value in values]
+    if isinstance(node, TupleType):
+        parts = [_normalizer(component) for component in node.components]
+        if not any(parts):
+            return None
+        return lambda values: tuple(part(value) if part else value for part, value in zip(parts, values))
+    if node.base == 'address':
+        return Web3.to_checksum_address
+    return None
+
+
+def _signature(path):
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+class FunctionCodec:
+    """Selector and types of one ABI function; results shaped like ContractFunction.call()"""
+
+    __slots__ = ('name', 'selector', 'input_types', 'output_types', 'normalizers')
+
+    def __init__(self, fn_abi):
+        self.name = fn_abi['name']
+        self.selector = function_abi_to_4byte_selector(fn_abi)
+        self.input_types = [collapse_if_tuple(arg) for arg in fn_abi.get('inputs', [])]
+        self.output_types = [collapse_if_tuple(arg) for arg in fn_abi.get('outputs', [])]
+        self.normalizers = [_normalizer(parse(output_type)) for output_type in self.output_types]
+
+    def encode(self, *args):
+        return self.selector + encode(self.input_types, args) if self.input_types else self.selector
+
+    def decode(self, data):
+        values = [normalize(value) if normalize else value
+                  for normalize, value in zip(self.normalizers, decode(self.output_types, data))]
+        # Like web3, a single output is returned bare
+        return values[0] if len(values) == 1 else values
+
+
+class ContractEntry:
+    """A deployed contract: address, ABI, cached web3 instance and codecs"""
+
+    def __init__(self, name, w3, address, abi):
+        self.name = name
+        self.w3 = w3
+        self.address = Web3.to_checksum_address(address)
+        self.abi = abi
+        self.instance = w3.eth.contract(address=self.address, abi=abi)
+        names = [item['name'] for item in abi if item.get('type') == 'function']
+        # Overloaded names need web3's argument matching; they go through instance.functions
+        self.codecs = {
+            item['name']: FunctionCodec(item) for item in abi
+            if item.get('type') == 'function' and names.count(item['name']) == 1
+        }
+
+    @property
+    def functions(self):
+        return self.instance.functions
+
+    def call(self, fn_name, *args):
+        """View call with precomputed encoding, through the same w3 middleware stack"""
+        codec = self.codecs.get(fn_name)
+        if codec is None:
+            return getattr(self.instance.functions, fn_name)(*args).call()
+        return codec.decode(self.w3.eth.call({'to': self.address, 'data': codec.encode(*args)}))
+
+
+class _Source:
+    """Where an entry's ABI and address come from"""
+
+    def __init__(self, abi, abi_files, address, address_file):
+        self.abi = abi
+        self.abi_files = [Path(p) for p in abi_files]
+        self.address = address
+        self.address_file = Path(address_file) if address_file else None
+
+    def abi_file(self):
+        return next((path for path in self.abi_files if path.exists()), None)
+
+    def signature(self):
+        abi_file = self.abi_file()
+        return (abi_file, abi_file and _signature(abi_file),
+                self.address_file and _signature(self.address_file))
+
+    def load(self):
+        abi = self.abi
+        if abi is None:
+            abi_file = self.abi_file()
+            abi = read_abi(abi_file) if abi_file else None
+        address = self.address
+        if not address and self.address_file and self.address_file.exists():
+            address = read_address(self.address_file)
+        return abi, address
+
+
+class ContractRegistry:
+    """
+    Named contracts for one Web3 instance
+    get(name) returns the ContractEntry, or None while the ABI or address is unknown
+    """
+
+    def __init__(self, w3, reload_seconds=RELOAD_SECONDS):
+        self.w3 = w3
+        self.reload_seconds = reload_seconds
+        self.reloads = 0
+        self._sources = {}
+        self._entries = {}  # name -> (entry, signature, checked_at)
+        self._lock = threading.Lock()
+
+    def register(self, name, abi=None, abi_files=(), address=None, address_file=None):
+        """
+        abi: ABI list, else the first existing file of abi_files
+        address: fixed address, else read from address_file
+        Re-registering a name replaces its source
+        """
+        with self._lock:
+            self._sources[name] = _Source(abi, abi_files, address, address_file)
+            self._entries.pop(name, None)
+
+    def bind(self, w3):
+        """Use another Web3 instance; entries are rebuilt on next use"""
+        with self._lock:
+            self.w3 = w3
+            self._entries.clear()
+
+    def get(self, name, now=None):
+        now = time.monotonic() if now is None else now
+        cached = self._entries.get(name)
+        if cached is not None and now - cached[2] < self.reload_seconds:
+            return cached[0]
+        with self._lock:
+            source = self._sources[name]
+            signature = source.signature()
+            cached = self._entries.get(name)
+            if cached is not None and cached[1] == signature:
+                self._entries[name] = (cached[0], signature, now)
+                return cached[0]
+            try:
+                abi, address = source.load()
+                entry = ContractEntry(name, self.w3, address, abi) if abi and address else None
+            except (OSError, ValueError, KeyError) as e:
+                # Usually a file caught mid-write; the finished write changes the signature again
+                log.warning("Could not load contract %s: %s", name, e)
+                entry = cached[0] if cached is not None else None
+                self._entries[name] = (entry, signature, now)
+                return entry
+            if cached is not None:
+                self.reloads += 1
+                log.info("Contract %s reloaded (%s)", name, entry.address if entry else "unavailable")
+            self._entries[name] = (entry, signature, now)
+            return entry
+
+    def snapshot(self):
+        contracts = {}
+        for name in self._sources:
+            entry = self.get(name)
+            contracts[name] = {
+                "address": entry.address if entry else None,
+                "functions": len(entry.codecs) if entry else 0
+            }
+        return {"reloads": self.reloads, "contracts": contracts}
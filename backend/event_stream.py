@@ -0,0 +1,115 @@
+# Server-sent events for tender / milestone state changes
+# Writers publish() after changing state; dashboards hold one /api/events
+# stream instead of polling, and resume with Last-Event-ID after a reconnect
+
+import collections
+import threading
+import time
+import uuid
+
+from flask import Response
+
+from json_provider import dumps_bytes
+
+DEFAULT_BACKLOG = 1000
+HEARTBEAT_SECONDS = 15
+RETRY_MILLISECONDS = 3000
+
+
+class EventBroker:
+    """
+    In-memory event log with sequential ids
+    Keeps the last `backlog` events so reconnecting clients can catch up;
+    a client that fell further behind (or comes from a previous process) gets
+    a `reset` event and should refetch its lists once
+    """
+
+    def __init__(self, backlog=DEFAULT_BACKLOG):
+        self.boot_id = uuid.uuid4().hex[:8]
+        self._events = collections.deque(maxlen=backlog)
+        self._seq = 0
+        self._condition = threading.Condition()
+
+    def publish(self, event_type, data):
+        with self._condition:
+            self._seq += 1
+            self._events.append((self._seq, event_type, dumps_bytes(data).decode()))
+            self._condition.notify_all()
+        return self._seq
+
+    def _parse_last_id(self, last_event_id):
+        """Sequence number to resume after, or None if the client must reset"""
+        if not last_event_id:
+            return self._seq
+        boot_id, _, seq = last_event_id.partition('-')
+        if boot_id != self.boot_id or not seq.isdigit():
+            return None
+        seq = int(seq)
+        oldest = self._events[0][0] if self._events else self._seq + 1
+        if seq > self._seq or seq < oldest - 1:
+            return None
+        return seq
+
+    def _since(self, seq):
+        if not self._events:
+            return []
+        start = seq + 1 - self._events[0][0]
+        return list(self._events)[max(start, 0):]
+
+    def _format(self, seq, event_type, payload):
+        return f"id: {self.boot_id}-{seq}\nevent: {event_type}\ndata: {payload}\n\n"
+
+    def stream(self, last_event_id=None, types=None, heartbeat=HEARTBEAT_SECONDS):
+        """
+        Iterator of SSE frames
+        types: optional event type prefixes to deliver ('tender', 'milestone.verified')
+        The resume point is fixed now, not when the first frame is pulled
+        """
+        with self._condition:
+            seq = self._parse_last_id(last_event_id)
+            reset = seq is None
+            if reset:
+                seq = self._seq
+        return self._frames(seq, reset, types, heartbeat)
+
+    def _frames(self, seq, reset, types, heartbeat):
+        yield f"retry: {RETRY_MILLISECONDS}\n\n"
+        if reset:
+            yield self._format(seq, 'reset', '{}')
+
+        while True:
+            # Never yield while holding the lock; a slow client would block publishers
+            with self._condition:
+                if self._seq == seq:
+                    self._condition.wait(heartbeat)
+                pending = self._since(seq)
+                reset = bool(pending) and pending[0][0] != seq + 1
+                if reset:
+                    # Fell out of the backlog while sending to a slow client
+                    seq = self._seq
+                    pending = []
+
+            if reset:
+                yield self._format(seq, 'reset', '{}')
+                continue
+            if not pending:
+                yield f": heartbeat {int(time.time())}\n\n"
+                continue
+            for event_seq, event_type, payload in pending:
+                seq = event_seq
+                if types and not event_type.startswith(types):
+                    continue
+                yield self._format(event_seq, event_type, payload)
+
+    def response(self, last_event_id=None, types=None):
+        """Flask streaming response for an /api/events endpoint"""
+        prefixes = tuple(t.strip() for t in types.split(',') if t.strip()) if types else None
+        return Response(
+            self.stream(last_event_id, prefixes),
+            mimetype='text/event-stream',
+            headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+        )
+
+    def stats(self):
+        with self._condition:
+            return {"last_event_id": f"{self.boot_id}-{self._seq}", "buffered": len(self._events)}
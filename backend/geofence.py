@@ -0,0 +1,289 @@
+# Offline geofence service for GPS proof validation
+# Parses submitted coordinates and answers "which project sites is this point near"
+# with vectorized haversine distances over a grid-bucketed spatial index
+
+import math
+import re
+
+import numpy as np
+
+EARTH_RADIUS_METERS = 6371008.8
+METERS_PER_DEGREE_LAT = math.pi * EARTH_RADIUS_METERS / 180
+
+# Contract stores coordinates as degrees * 1e6 (FundTracker.centerLatitude etc.)
+CONTRACT_COORDINATE_SCALE = 1_000_000
+DEFAULT_RADIUS_METERS = 500
+
+# "40.7128° N", "N 40.7128", "-74.0060", "74.0060 W"
+_COMPONENT = re.compile(
+    r'^\s*([NSEW])?\s*([+-]?\d+(?:\.\d+)?)\s*(?:°|deg|degrees)?\s*([NSEW])?\s*$',
+    re.IGNORECASE
+)
+
+
+def _parse_component(text):
+    match = _COMPONENT.match(text)
+    if not match:
+        raise ValueError(f"Invalid coordinate: {text.strip()!r}")
+    prefix, number, suffix = match.groups()
+    if prefix and suffix:
+        raise ValueError(f"Invalid coordinate: {text.strip()!r}")
+    hemisphere = (prefix or suffix or '').upper()
+    value = float(number)
+    if hemisphere and value < 0:
+        raise ValueError(f"Negative value with hemisphere: {text.strip()!r}")
+    if hemisphere in ('S', 'W'):
+        value = -value
+    return value, hemisphere
+
+
+def _split_without_comma(text):
+    """Split 'N 40.7128 W 74.0060' / '40.7128 N 74.0060 W' / '40.7128 -74.0060' into two components"""
+    cleaned = re.sub(r'°|degrees|deg', ' ', text, flags=re.IGNORECASE).upper()
+    if re.search(r'[^NSEW0-9.+\-\s]', cleaned):
+        raise ValueError(f"Expected 'latitude, longitude': {text!r}")
+    tokens = re.findall(r'[NSEW]|[+-]?\d+(?:\.\d+)?', cleaned)
+    letters = [t in 'NSEW' for t in tokens]
+
+    if letters == [False, False]:
+        return tokens
+    if letters == [True, False, True, False]:
+        return [f"{tokens[0]} {tokens[1]}", f"{tokens[2]} {tokens[3]}"]
+    if letters == [False, True, False, True]:
+        return [f"{tokens[0]} {tokens[1]}", f"{tokens[2]} {tokens[3]}"]
+    raise ValueError(f"Expected 'latitude, longitude': {text!r}")
+
+
+def parse_gps_coordinates(text):
+    """
+    Parse a coordinate string into (latitude, longitude) in degrees
+    Accepts '40.7128° N, 74.0060° W', '28.6328,77.2167', 'N 40.7128 W 74.0060'
+    Raises ValueError for anything malformed or out of range
+    """
+    if not isinstance(text, str) or not text.strip():
+        raise ValueError("GPS coordinates are required")
+
+    parts = text.split(',')
+    if len(parts) != 2:
+        parts = _split_without_comma(text)
+
+    first, first_hemisphere = _parse_component(parts[0])
+    second, second_hemisphere = _parse_component(parts[1])
+
+    # Hemisphere letters may put longitude first ("74.0060° W, 40.7128° N")
+    if first_hemisphere in ('E', 'W') or second_hemisphere in ('N', 'S'):
+        first, second = second, first
+        first_hemisphere, second_hemisphere = second_hemisphere, first_hemisphere
+    if first_hemisphere in ('E', 'W') or second_hemisphere in ('N', 'S'):
+        raise ValueError(f"Ambiguous hemispheres: {text!r}")
+
+    if not -90 <= first <= 90:
+        raise ValueError(f"Latitude out of range: {first}")
+    if not -180 <= second <= 180:
+        raise ValueError(f"Longitude out of range: {second}")
+    return first, second
+
+
+def haversine_meters(lat1, lon1, lat2, lon2):
+    """Great-circle distance in metres; all arguments broadcast as NumPy arrays (degrees)"""
+    lat1 = np.radians(lat1)
+    lat2 = np.radians(lat2)
+    dlat = lat2 - lat1
+    dlon = np.radians(lon2) - np.radians(lon1)
+    a = np.sin(dlat / 2) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin(dlon / 2) ** 2
+    return 2 * EARTH_RADIUS_METERS * np.arcsin(np.sqrt(np.minimum(a, 1.0)))
+
+
+def contract_distance_meters(lat1, lon1, lat2, lon2):
+    """
+    FundTracker.calculateDistance on 1e6-scaled integers, vectorized
+    Same flat 111 km-per-degree approximation and integer truncation as the
+    contract, so the result predicts what an on-chain verifyGPS call returns
+    """
+    d_lat = np.abs(np.asarray(lat2, dtype=np.int64) - np.asarray(lat1, dtype=np.int64)) * 111000 // 1000000
+    d_lon = np.abs(np.asarray(lon2, dtype=np.int64) - np.asarray(lon1, dtype=np.int64)) * 111000 // 1000000
+    squared = d_lat * d_lat + d_lon * d_lon
+    # Floor integer square root, matching the contract's Babylonian sqrt
+    root = np.floor(np.sqrt(squared.astype(np.float64))).astype(np.int64)
+    root -= root * root > squared
+    root += (root + 1) * (root + 1) <= squared
+    return root
+
+
+class GeofenceIndex:
+    """
+    In-memory spatial index over project sites
+    Sites are bucketed into a lat/lon grid whose cell height equals the search
+    radius, so a lookup only computes distances to sites in neighbouring cells.
+    """
+
+    def __init__(self, project_ids, latitudes, longitudes, radii_meters, search_radius_meters=None):
+        self.project_ids = list(project_ids)
+        self.latitudes = np.asarray(latitudes, dtype=np.float64)
+        self.longitudes = np.asarray(longitudes, dtype=np.float64)
+        self.radii = np.asarray(radii_meters, dtype=np.float64)
+        self._positions = {pid: i for i, pid in enumerate(self.project_ids)}
+
+        max_radius = float(self.radii.max()) if len(self.radii) else DEFAULT_RADIUS_METERS
+        self.search_radius = max(search_radius_meters or 0, max_radius)
+        self.cell_degrees = self.search_radius / METERS_PER_DEGREE_LAT
+        self._lon_cells = max(1, math.ceil(360 / self.cell_degrees))
+
+        rows = np.floor((self.latitudes + 90) / self.cell_degrees).astype(np.int64)
+        cols = np.floor((self.longitudes + 180) / self.cell_degrees).astype(np.int64) % self._lon_cells
+        buckets = {}
+        for i, key in enumerate(zip(rows.tolist(), cols.tolist())):
+            buckets.setdefault(key, []).append(i)
+        self._buckets = {key: np.array(members, dtype=np.int64) for key, members in buckets.items()}
+
+    @classmethod
+    def from_projects(cls, projects, search_radius_meters=None):
+        """
+        Build from project dicts carrying the contract fields
+        centerLatitude / centerLongitude (degrees * 1e6) and gpsRadiusMeters
+        Projects without a center are skipped
+        """
+        ids, lats, lons, radii = [], [], [], []
+        for project in projects:
+            if project.get('centerLatitude') is None or project.get('centerLongitude') is None:
+                continue
+            ids.append(project['id'])
+            lats.append(project['centerLatitude'] / CONTRACT_COORDINATE_SCALE)
+            lons.append(project['centerLongitude'] / CONTRACT_COORDINATE_SCALE)
+            radii.append(project.get('gpsRadiusMeters') or DEFAULT_RADIUS_METERS)
+        return cls(ids, lats, lons, radii, search_radius_meters)
+
+    def __len__(self):
+        return len(self.project_ids)
+
+    def _candidates(self, lat, lon):
+        row = math.floor((lat + 90) / self.cell_degrees)
+        col = math.floor((lon + 180) / self.cell_degrees)
+        # Longitude cells shrink with latitude; widen the scan to cover the radius
+        cos_lat = math.cos(math.radians(min(abs(lat) + self.cell_degrees, 90)))
+        span = self._lon_cells if cos_lat < 1e-6 else math.ceil(1 / cos_lat)
+        span = min(span, self._lon_cells // 2 + 1)
+
+        found = []
+        for r in (row - 1, row, row + 1):
+            for c in range(col - span, col + span + 1):
+                members = self._buckets.get((r, c % self._lon_cells))
+                if members is not None:
+                    found.append(members)
+        if not found:
+            return np.empty(0, dtype=np.int64)
+        return np.unique(np.concatenate(found))
+
+    def nearby(self, lat, lon, max_distance_meters=None):
+        """
+        Sites near a point, nearest first
+        Without max_distance_meters a site matches when the point is inside its own radius
+        Returns: [{ project_id, distance_meters, within_radius }]
+        """
+        if max_distance_meters is not None and max_distance_meters > self.search_radius:
+            candidates = np.arange(len(self.project_ids))
+        else:
+            candidates = self._candidates(lat, lon)
+        if len(candidates) == 0:
+            return []
+
+        distances = haversine_meters(lat, lon, self.latitudes[candidates], self.longitudes[candidates])
+        limits = self.radii[candidates] if max_distance_meters is None else max_distance_meters
+        hits = np.nonzero(distances <= limits)[0]
+        hits = hits[np.argsort(distances[hits], kind='stable')]
+        return [
+            {
+                'project_id': self.project_ids[candidates[i]],
+                'distance_meters': round(float(distances[i]), 1),
+                'within_radius': bool(distances[i] <= self.radii[candidates[i]])
+            }
+            for i in hits
+        ]
+
+    def nearby_many(self, latitudes, longitudes, max_distance_meters=None):
+        """
+        Batch version of nearby()
+        Candidate (point, site) pairs from every grid cell are evaluated in one
+        vectorized haversine pass
+        """
+        latitudes = np.asarray(latitudes, dtype=np.float64)
+        longitudes = np.asarray(longitudes, dtype=np.float64)
+        results = [[] for _ in range(len(latitudes))]
+        if len(self.project_ids) == 0 or len(latitudes) == 0:
+            return results
+
+        if max_distance_meters is not None and max_distance_meters > self.search_radius:
+            points = np.repeat(np.arange(len(latitudes)), len(self.project_ids))
+            sites = np.tile(np.arange(len(self.project_ids)), len(latitudes))
+        else:
+            rows = np.floor((latitudes + 90) / self.cell_degrees).astype(np.int64)
+            cols = np.floor((longitudes + 180) / self.cell_degrees).astype(np.int64)
+            groups = {}
+            for i, key in enumerate(zip(rows.tolist(), cols.tolist())):
+                groups.setdefault(key, []).append(i)
+
+            point_chunks, site_chunks = [], []
+            for members in groups.values():
+                # Every point in a cell shares the candidate set of that cell
+                candidates = self._candidates(latitudes[members[0]], longitudes[members[0]])
+                if len(candidates):
+                    point_chunks.append(np.repeat(np.array(members, dtype=np.int64), len(candidates)))
+                    site_chunks.append(np.tile(candidates, len(members)))
+            if not point_chunks:
+                return results
+            points = np.concatenate(point_chunks)
+            sites = np.concatenate(site_chunks)
+
+        distances = haversine_meters(latitudes[points], longitudes[points],
+                                     self.latitudes[sites], self.longitudes[sites])
+        radii = self.radii[sites]
+        keep = distances <= (radii if max_distance_meters is None else max_distance_meters)
+        points, sites, distances, radii = points[keep], sites[keep], distances[keep], radii[keep]
+
+        order = np.lexsort((distances, points))
+        for point, site, distance, radius in zip(points[order].tolist(), sites[order].tolist(),
+                                                 distances[order].tolist(), radii[order].tolist()):
+            results[point].append({
+                'project_id': self.project_ids[site],
+                'distance_meters': round(distance, 1),
+                'within_radius': distance <= radius
+            })
+        return results
+
+    def check_many(self, project_ids, latitudes, longitudes):
+        """
+        Check many (project, point) pairs in one pass; points are degrees
+        Returns arrays: known, distance_meters, within_radius, contract_distance, contract_passed
+        Entries for projects not in the index have known=False and NaN/False values
+        """
+        latitudes = np.asarray(latitudes, dtype=np.float64)
+        longitudes = np.asarray(longitudes, dtype=np.float64)
+        positions = np.array([self._positions.get(pid, -1) for pid in project_ids], dtype=np.int64)
+        known = positions >= 0
+        sites = positions[known]
+
+        distances = np.full(len(positions), np.nan)
+        within = np.zeros(len(positions), dtype=bool)
+        contract_distances = np.full(len(positions), -1, dtype=np.int64)
+        contract_passed = np.zeros(len(positions), dtype=bool)
+
+        distances[known] = haversine_meters(latitudes[known], longitudes[known],
+                                            self.latitudes[sites], self.longitudes[sites])
+        within[known] = distances[known] <= self.radii[sites]
+
+        scale = CONTRACT_COORDINATE_SCALE
+        contract_distances[known] = contract_distance_meters(
+            np.rint(self.latitudes[sites] * scale), np.rint(self.longitudes[sites] * scale),
+            np.rint(latitudes[known] * scale), np.rint(longitudes[known] * scale)
+        )
+        contract_passed[known] = contract_distances[known] <= self.radii[sites]
+        return known, distances, within, contract_distances, contract_passed
+
+    def radius(self, project_id):
+        return float(self.radii[self._positions[project_id]])
+
+    def check(self, project_id, lat, lon):
+        """Distance from a project's center and whether the point is inside its radius"""
+        i = self._positions[project_id]
+        distance = float(haversine_meters(lat, lon, self.latitudes[i], self.longitudes[i]))
+        return distance, bool(distance <= self.radii[i])
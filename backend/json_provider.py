@@ -0,0 +1,89 @@
+# Fast JSON provider for the Flask servers
+# Responses are encoded with orjson; install with `app.json = OrjsonProvider(app)`
+
+import decimal
+import json
+
+import orjson
+from flask.json.provider import JSONProvider
+
+ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_NAIVE_UTC | orjson.OPT_UTC_Z
+
+# orjson only encodes integers that fit in 64 bits; wei amounts often don't
+MIN_INT = -(2 ** 63)
+MAX_INT = 2 ** 64 - 1
+
+
+def _default(obj):
+    """Types orjson doesn't know natively"""
+    if isinstance(obj, (bytes, bytearray, memoryview)):
+        # Commitments / hashes from web3 come back as bytes (HexBytes)
+        return '0x' + bytes(obj).hex()
+    if isinstance(obj, decimal.Decimal):
+        return str(obj)
+    if isinstance(obj, (set, frozenset)):
+        return list(obj)
+    if hasattr(obj, '__html__'):
+        return str(obj.__html__())
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def _wrap_big_int(value):
+    return value if MIN_INT <= value <= MAX_INT else orjson.Fragment(str(value))
+
+
+def _wrap_big_ints(obj):
+    """Copy of obj with out-of-range integers replaced by raw JSON number fragments"""
+    if isinstance(obj, dict):
+        wrapped = {}
+        for key, value in obj.items():
+            kind = type(value)
+            # Scalars are handled inline; this walk is the whole cost of the slow path
+            if kind is int:
+                wrapped[key] = _wrap_big_int(value)
+            elif kind is str or kind is float or kind is bool or value is None:
+                wrapped[key] = value
+            else:
+                wrapped[key] = _wrap_big_ints(value)
+        return wrapped
+    if isinstance(obj, (list, tuple)):
+        return [_wrap_big_ints(value) for value in obj]
+    if isinstance(obj, int) and not isinstance(obj, bool):
+        return _wrap_big_int(obj)
+    return obj
+
+
+def dumps_bytes(obj, indent=False):
+    """Encode to JSON bytes; big integers stay exact numbers (not floats or strings)"""
+    option = ORJSON_OPTIONS | orjson.OPT_INDENT_2 if indent else ORJSON_OPTIONS
+    try:
+        return orjson.dumps(obj, default=_default, option=option)
+    except TypeError as e:
+        # Slow path only for payloads that actually carry >64-bit integers
+        if 'Integer exceeds 64-bit range' not in str(e):
+            raise
+        return orjson.dumps(_wrap_big_ints(obj), default=_default, option=option)
+
+
+class OrjsonProvider(JSONProvider):
+    """
+    Drop-in replacement for Flask's default JSON provider
+    - responses are encoded with orjson straight to bytes
+    - wei values beyond 64 bits, bytes and datetimes are handled
+    - request bodies are still parsed with the stdlib so large integers stay exact
+    """
+
+    # None = pretty-print in debug mode, like Flask's default provider
+    compact = None
+    mimetype = "application/json"
+
+    def dumps(self, obj, **kwargs):
+        return dumps_bytes(obj).decode()
+
+    def loads(self, s, **kwargs):
+        return json.loads(s, **kwargs)
+
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        indent = self.compact is False or (self.compact is None and self._app.debug)
+        return self._app.response_class(dumps_bytes(obj, indent), mimetype=self.mimetype)
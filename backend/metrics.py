@@ -0,0 +1,235 @@
+# Request / RPC / model instrumentation with a Prometheus /metrics endpoint
+# Per-route latency histograms, web3 RPC calls per request (N+1 loops show
+# up as large counts on one endpoint), and timers for slow dependencies such
+# as IPFS downloads and model inference.
+# METRICS_ENABLED=0 installs no hooks, no route and no web3 middleware; timers
+# become a shared no-op context manager.
+
+import bisect
+import contextlib
+import os
+import threading
+import time
+
+from flask import Response, g, has_request_context, request
+
+ENABLED = os.environ.get('METRICS_ENABLED', '1').lower() not in ('0', 'false', 'no')
+
+# Seconds; same defaults as the official client libraries
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+# Slow dependencies (gateway downloads, CPU inference) need a longer tail
+SLOW_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+COUNT_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100, 200, 500, 1000)
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+_NULL_TIMER = contextlib.nullcontext()
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _labels(names, values, extra=''):
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return '{' + ','.join(pairs) + '}' if pairs else ''
+
+
+def _number(value):
+    if value == float('inf'):
+        return '+Inf'
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Counter:
+    """Monotonic counter, one series per label tuple"""
+
+    kind = 'counter'
+
+    def __init__(self, name, documentation, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, *labels, amount=1):
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def value(self, *labels):
+        return self._values.get(labels, 0)
+
+    def samples(self):
+        with self._lock:
+            values = sorted(self._values.items())
+        for labels, value in values:
+            yield f"{self.name}{_labels(self.labelnames, labels)} {_number(value)}"
+
+
+class Histogram:
+    """
+    Bucketed distribution, one series per label tuple
+    observe() bumps a single bucket; buckets are only made cumulative when rendered
+    """
+
+    kind = 'histogram'
+
+    def __init__(self, name, documentation, labelnames=(), buckets=LATENCY_BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(sorted(buckets))
+        self._series = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value, *labels):
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                # [bucket counts..., +Inf count, sum]
+                series = self._series[labels] = [0] * (len(self.buckets) + 1) + [0.0]
+            series[index] += 1
+            series[-1] += value
+
+    def count(self, *labels):
+        series = self._series.get(labels)
+        return sum(series[:-1]) if series else 0
+
+    def samples(self):
+        with self._lock:
+            series = sorted((labels, list(values)) for labels, values in self._series.items())
+        for labels, values in series:
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets + (float('inf'),), values[:-1]):
+                cumulative += bucket_count
+                le = f'le="{_number(bound)}"'
+                yield f"{self.name}_bucket{_labels(self.labelnames, labels, le)} {cumulative}"
+            yield f"{self.name}_sum{_labels(self.labelnames, labels)} {_number(values[-1])}"
+            yield f"{self.name}_count{_labels(self.labelnames, labels)} {cumulative}"
+
+
+class Metrics:
+    """
+    Metric registry plus Flask / web3 integration
+    metrics = Metrics(app) records http_request_duration_seconds for every
+    request and serves everything at /metrics; instrument_web3(w3) adds RPC
+    timings and per-request call counts
+    """
+
+    def __init__(self, app=None, enabled=None):
+        self.enabled = ENABLED if enabled is None else enabled
+        self._metrics = {}
+        self._web3_instrumented = False
+
+        self.request_latency = self.histogram(
+            'http_request_duration_seconds', 'Time to build the response, by route',
+            ('method', 'endpoint', 'status'))
+        self.rpc_latency = self.histogram(
+            'web3_rpc_duration_seconds', 'JSON-RPC round trip time, by method', ('method',))
+        self.rpc_errors = self.counter(
+            'web3_rpc_errors_total', 'JSON-RPC calls that raised, by method', ('method',))
+        self.rpc_per_request = self.histogram(
+            'web3_rpc_calls_per_request', 'JSON-RPC calls made while handling one request',
+            ('endpoint',), buckets=COUNT_BUCKETS)
+
+        if app is not None:
+            self.init_app(app)
+
+    # ============ Registry ============
+
+    def _register(self, metric):
+        if metric.name in self._metrics:
+            raise ValueError(f"Duplicate metric: {metric.name}")
+        self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name, documentation, labelnames=()):
+        return self._register(Counter(name, documentation, labelnames))
+
+    def histogram(self, name, documentation, labelnames=(), buckets=LATENCY_BUCKETS):
+        return self._register(Histogram(name, documentation, labelnames, buckets))
+
+    @contextlib.contextmanager
+    def _timer(self, histogram, labels):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            histogram.observe(time.perf_counter() - started, *labels)
+
+    def timer(self, histogram, *labels):
+        """Context manager observing the elapsed seconds into `histogram` (also when it raises)"""
+        if not self.enabled:
+            return _NULL_TIMER
+        return self._timer(histogram, labels)
+
+    def render(self):
+        lines = []
+        for metric in self._metrics.values():
+            lines.append(f"# HELP {metric.name} {metric.documentation}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            lines.extend(metric.samples())
+        return '\n'.join(lines) + '\n'
+
+    # ============ Flask ============
+
+    def init_app(self, app):
+        if not self.enabled:
+            return
+        app.before_request(self._before_request)
+        # after_request hooks run in reverse order; create Metrics before the
+        # other extensions so compression etc. are included in the latency
+        app.after_request(self._after_request)
+        app.add_url_rule('/metrics', 'metrics', self.view)
+
+    def _before_request(self):
+        g._metrics_started = time.perf_counter()
+        g._metrics_rpc_calls = 0
+
+    def _after_request(self, response):
+        started = g.pop('_metrics_started', None)
+        if started is None:
+            return response
+        # Unmatched URLs share one series so scanners can't blow up the label space
+        endpoint = request.endpoint or 'unmatched'
+        # Streamed bodies are produced after this point: their latency is time to first byte
+        self.request_latency.observe(time.perf_counter() - started,
+                                     request.method, endpoint, response.status_code)
+        if self._web3_instrumented:
+            self.rpc_per_request.observe(g.pop('_metrics_rpc_calls', 0), endpoint)
+        return response
+
+    def view(self):
+        return Response(self.render(), content_type=CONTENT_TYPE)
+
+    # ============ web3 ============
+
+    def instrument_web3(self, w3):
+        """Add a web3 middleware timing every JSON-RPC request"""
+        if not self.enabled:
+            return
+        w3.middleware_onion.add(self._web3_middleware, name='metrics')
+        self._web3_instrumented = True
+
+    def _web3_middleware(self, make_request, w3):
+        rpc_latency, rpc_errors = self.rpc_latency, self.rpc_errors
+
+        def middleware(method, params):
+            if has_request_context() and '_metrics_rpc_calls' in g:
+                g._metrics_rpc_calls += 1
+            started = time.perf_counter()
+            try:
+                response = make_request(method, params)
+            except Exception:
+                rpc_errors.inc(method)
+                raise
+            finally:
+                rpc_latency.observe(time.perf_counter() - started, method)
+            if 'error' in response:
+                rpc_errors.inc(method)
+            return response
+        return middleware
@@ -0,0 +1,66 @@
+# Mongo index management for the FastAPI backend
+# Indexes are created at startup; create_index is a no-op when they already exist
+# pymongo is only imported by ensure_indexes, so the query helpers work without a driver
+
+ASCENDING, DESCENDING = 1, -1  # pymongo.ASCENDING / pymongo.DESCENDING
+
+# (collection, keys, options)
+INDEXES = [
+    ('transactions', [('project_id', ASCENDING), ('timestamp', DESCENDING)], {'name': 'project_timestamp'}),
+    ('transactions', [('type', ASCENDING), ('timestamp', DESCENDING)], {'name': 'type_timestamp'}),
+    ('transactions', [('timestamp', DESCENDING)], {'name': 'timestamp'}),
+    ('transactions', [('tx_hash', ASCENDING)], {'name': 'tx_hash', 'unique': True}),
+    ('projects', [('id', ASCENDING)], {'name': 'id', 'unique': True}),
+    ('milestones', [('id', ASCENDING)], {'name': 'id', 'unique': True}),
+    ('milestones', [('project_id', ASCENDING)], {'name': 'project_id'}),
+    ('fund_allocations', [('project_id', ASCENDING), ('timestamp', DESCENDING)], {'name': 'project_timestamp'}),
+    ('expenditures', [('project_id', ASCENDING), ('timestamp', DESCENDING)], {'name': 'project_timestamp'}),
+]
+
+
+async def ensure_indexes(db):
+    """
+    Create all indexes used by the read endpoints
+    Returns the names of indexes that could not be built (e.g. duplicate tx_hash values)
+    """
+    from pymongo.errors import OperationFailure
+
+    failed = []
+    for collection_name, keys, options in INDEXES:
+        try:
+            await db[collection_name].create_index(keys, **options)
+        except OperationFailure as e:
+            failed.append(f"{collection_name}.{options['name']}")
+            print(f"⚠ Could not create index {collection_name}.{options['name']}: {e}")
+    return failed
+
+
+def time_range_query(query, since=None, until=None, field='timestamp'):
+    """Add an optional [since, until] range on a datetime field to a Mongo filter"""
+    bounds = {}
+    if since is not None:
+        bounds['$gte'] = since
+    if until is not None:
+        bounds['$lte'] = until
+    if bounds:
+        query[field] = bounds
+    return query
+
+
+def plan_stages(explain):
+    """Flatten the winning plan of an explain() result into a list of stage names"""
+    planner = explain.get('queryPlanner', {})
+    # Newer servers nest the classic plan under queryPlan
+    plan = planner.get('winningPlan', {})
+    plan = plan.get('queryPlan', plan)
+
+    stages = []
+    pending = [plan]
+    while pending:
+        node = pending.pop()
+        if 'stage' in node:
+            stages.append(node['stage'])
+        if 'inputStage' in node:
+            pending.append(node['inputStage'])
+        pending.extend(node.get('inputStages', []))
+    return stages
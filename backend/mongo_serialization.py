@@ -0,0 +1,95 @@
+# Mongo read/write helpers for the FastAPI backend
+# Native BSON datetimes + orjson responses (no per-row model validation)
+
+import asyncio
+import os
+from datetime import datetime, timezone
+from pathlib import Path
+
+import orjson
+from dotenv import load_dotenv
+from fastapi.responses import Response
+from pymongo import UpdateOne
+
+ROOT_DIR = Path(__file__).parent
+
+# Datetime fields per collection. These used to be stored as ISO strings.
+DATETIME_FIELDS = {
+    'projects': ('created_at', 'completion_date'),
+    'fund_allocations': ('timestamp',),
+    'milestones': ('created_at', 'completion_date'),
+    'expenditures': ('timestamp',),
+    'transactions': ('timestamp',),
+}
+
+# Motor hands back naive UTC datetimes; render them the way pydantic did ("...Z")
+ORJSON_OPTIONS = orjson.OPT_NAIVE_UTC | orjson.OPT_UTC_Z
+
+MIGRATION_BATCH_SIZE = 1000
+
+
+class FastJSONResponse(Response):
+    """JSON response encoded straight from Mongo documents with orjson"""
+    media_type = "application/json"
+
+    def render(self, content):
+        return orjson.dumps(content, option=ORJSON_OPTIONS)
+
+
+def parse_datetime(value):
+    """Parse a stored ISO string into an aware UTC datetime"""
+    parsed = datetime.fromisoformat(value.replace('Z', '+00:00'))
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed
+
+
+async def migrate_string_datetimes(db, batch_size=MIGRATION_BATCH_SIZE):
+    """
+    One-time migration: convert ISO string timestamps to native BSON datetimes
+    Safe to re-run - only documents still holding strings are touched
+    Returns: { "collection.field": converted_count }
+    """
+    converted = {}
+    for collection_name, fields in DATETIME_FIELDS.items():
+        collection = db[collection_name]
+        for field in fields:
+            count = 0
+            ops = []
+            cursor = collection.find({field: {"$type": "string"}}, {"_id": 1, field: 1})
+            async for doc in cursor:
+                try:
+                    value = parse_datetime(doc[field])
+                except ValueError:
+                    print(f"⚠ Skipping {collection_name}.{field} on {doc['_id']}: {doc[field]!r}")
+                    continue
+                ops.append(UpdateOne({"_id": doc['_id']}, {"$set": {field: value}}))
+                if len(ops) >= batch_size:
+                    await collection.bulk_write(ops, ordered=False)
+                    count += len(ops)
+                    ops = []
+            if ops:
+                await collection.bulk_write(ops, ordered=False)
+                count += len(ops)
+            converted[f"{collection_name}.{field}"] = count
+    return converted
+
+
+async def _run_migration():
+    from motor.motor_asyncio import AsyncIOMotorClient
+
+    load_dotenv(ROOT_DIR / '.env')
+    client = AsyncIOMotorClient(os.environ['MONGO_URL'])
+    try:
+        converted = await migrate_string_datetimes(client[os.environ['DB_NAME']])
+    finally:
+        client.close()
+
+    for key, count in converted.items():
+        print(f"   {key}: {count} converted")
+    print(f"✅ Migration complete: {sum(converted.values())} fields converted")
+
+
+if __name__ == '__main__':
+    print("🔄 Migrating string timestamps to native datetimes...")
+    asyncio.run(_run_migration())
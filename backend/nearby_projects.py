@@ -0,0 +1,106 @@
+# Nearby project lookup against the PostGIS database (database_schema.sql)
+# Wraps get_nearby_projects(); connections come from a small shared pool
+# ThreadedConnectionPool fails at once when every connection is checked out, so
+# callers queue on a semaphore of the same size and wait up to DB_POOL_TIMEOUT
+# seconds for a free one before giving up with DatabaseBusyError.
+# Connections that failed or closed are discarded rather than returned to the pool.
+
+import contextlib
+import os
+import threading
+from pathlib import Path
+
+import psycopg2
+from dotenv import load_dotenv
+from psycopg2.extras import RealDictCursor
+from psycopg2.pool import ThreadedConnectionPool
+
+ROOT_DIR = Path(__file__).parent
+load_dotenv(ROOT_DIR / '.env')
+
+DEFAULT_RADIUS_METERS = 20000
+MAX_RADIUS_METERS = 200000
+DEFAULT_LIMIT = 100
+MAX_LIMIT = 1000
+POOL_SIZE = int(os.environ.get('DB_POOL_SIZE', 10))
+POOL_TIMEOUT = float(os.environ.get('DB_POOL_TIMEOUT', 5))
+
+_pool = None
+_pool_lock = threading.Lock()
+_pool_slots = threading.BoundedSemaphore(POOL_SIZE)
+
+
+class DatabaseBusyError(Exception):
+    """Every pooled connection stayed in use for the whole wait"""
+
+
+def get_pool():
+    """Create the connection pool on first use"""
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = ThreadedConnectionPool(
+                    minconn=1,
+                    maxconn=POOL_SIZE,
+                    host=os.environ.get('DB_HOST', 'localhost'),
+                    port=os.environ.get('DB_PORT', 5432),
+                    user=os.environ.get('DB_USER', 'postgres'),
+                    password=os.environ.get('DB_PASSWORD', ''),
+                    dbname=os.environ.get('DB_NAME', 'municipal_fund_tracker'),
+                )
+    return _pool
+
+
+@contextlib.contextmanager
+def connection(timeout=POOL_TIMEOUT):
+    """A pooled connection, waiting up to `timeout` seconds for one to be returned"""
+    if not _pool_slots.acquire(timeout=timeout):
+        raise DatabaseBusyError(f"No free database connection within {timeout:g}s")
+    try:
+        pool = get_pool()
+        conn = pool.getconn()
+        broken = False
+        try:
+            yield conn
+        except (psycopg2.OperationalError, psycopg2.InterfaceError):
+            # Server restarted or the socket dropped: don't hand this connection out again
+            broken = True
+            raise
+        finally:
+            broken = broken or bool(conn.closed)
+            if not broken:
+                try:
+                    conn.rollback()
+                except psycopg2.Error:
+                    broken = True
+            pool.putconn(conn, close=broken)
+    finally:
+        _pool_slots.release()
+
+
+def find_nearby_projects(pincode, radius_meters=DEFAULT_RADIUS_METERS, limit=DEFAULT_LIMIT):
+    """
+    Projects within radius_meters of a pincode, nearest first
+    Returns: [{ project_id, project_name, budget, status, location, distance_meters }]
+    """
+    with connection() as conn:
+        conn.autocommit = True
+        with conn.cursor(cursor_factory=RealDictCursor) as cur:
+            cur.execute(
+                "SELECT * FROM get_nearby_projects(%s, %s, %s)",
+                (pincode, radius_meters, limit)
+            )
+            rows = cur.fetchall()
+
+    return [
+        {
+            'project_id': row['project_id'],
+            'project_name': row['project_name'],
+            'budget': int(row['budget']),
+            'status': row['status'],
+            'location': row['location'],
+            'distance_meters': round(float(row['distance_meters']), 1)
+        }
+        for row in rows
+    ]
@@ -0,0 +1,66 @@
+# Pre-encoded response bodies for static demo fixtures
+# Fixtures are loaded from a dataset file once, encoded to JSON and every
+# supported compression up front, and served with ETags; requests only pick
+# a representation
+
+import gzip
+import hashlib
+import json
+import os
+from pathlib import Path
+
+from flask import current_app, request
+
+from compression import brotli, choose_encoding
+from json_provider import dumps_bytes
+
+ROOT_DIR = Path(__file__).parent
+DEFAULT_FIXTURES_PATH = ROOT_DIR / 'demo_fixtures.json'
+
+# Paid once at startup, so higher than the per-response levels in compression.py
+GZIP_LEVEL = 9
+BROTLI_QUALITY = 7  # 11 takes seconds per MB for no real gain on JSON
+
+
+class PrecomputedBody:
+    """A JSON document encoded once, with compressed variants and per-variant strong ETags"""
+
+    def __init__(self, document):
+        self.body = dumps_bytes(document)
+        digest = hashlib.sha256(self.body).hexdigest()[:20]
+        # Different bytes on the wire need different strong ETags
+        self.variants = {None: (self.body, digest)}
+        self.variants['gzip'] = (gzip.compress(self.body, compresslevel=GZIP_LEVEL, mtime=0), digest + '-gz')
+        if brotli is not None:
+            self.variants['br'] = (brotli.compress(self.body, quality=BROTLI_QUALITY), digest + '-br')
+
+    def response(self, cache_control='no-cache'):
+        """Response for the current request: 304, or the best encoding the client accepts"""
+        encoding = choose_encoding(request.accept_encodings)
+        body, etag = self.variants[encoding]
+
+        if request.if_none_match.contains_weak(etag):
+            response = current_app.response_class(status=304)
+        else:
+            response = current_app.response_class(body, mimetype='application/json')
+            if encoding:
+                response.headers['Content-Encoding'] = encoding
+        response.set_etag(etag)
+        response.headers['Cache-Control'] = cache_control
+        response.vary.add('Accept-Encoding')
+        return response
+
+    def stats(self):
+        return {encoding or 'identity': len(body) for encoding, (body, _) in self.variants.items()}
+
+
+def load_fixtures(path=None):
+    """Fixture dataset from DEMO_FIXTURES (or the bundled demo_fixtures.json)"""
+    path = Path(path or os.environ.get('DEMO_FIXTURES') or DEFAULT_FIXTURES_PATH)
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)
+
+
+def precompute(documents):
+    """{ name: document } -> { name: PrecomputedBody }"""
+    return {name: PrecomputedBody(document) for name, document in documents.items()}
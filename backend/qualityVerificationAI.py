@@ -15,8 +15,27 @@ from PIL import Image
 import os
 import tempfile
 
+from admission import AdmissionController
+from metrics import SLOW_BUCKETS, Metrics
+from request_profiler import RequestProfiler
+
 app = Flask(__name__)
 CORS(app)
+metrics = Metrics(app)
+profiler = RequestProfiler(app)
+# Each verification is an IPFS download plus CNN inference
+admission = AdmissionController(app, costs={
+    'verify_quality': 10,
+    'verify_quality_upload': 10,
+    'health_check': 0
+})
+
+ipfs_fetch_seconds = metrics.histogram(
+    'ipfs_fetch_seconds', 'IPFS gateway download time', buckets=SLOW_BUCKETS)
+ipfs_fetch_failures = metrics.counter(
+    'ipfs_fetch_failures_total', 'IPFS downloads that failed or returned an unreadable image')
+inference_seconds = metrics.histogram(
+    'model_inference_seconds', 'Model prediction time per image', ('model',), buckets=SLOW_BUCKETS)
 
 # ========== Model Setup ==========
 
@@ -31,14 +50,16 @@ def download_from_ipfs(ipfs_hash):
     """Download image from IPFS"""
     try:
         url = f"https://gateway.pinata.cloud/ipfs/{ipfs_hash}"
-        response = requests.get(url, timeout=30)
-        response.raise_for_status()
+        with metrics.timer(ipfs_fetch_seconds):
+            response = requests.get(url, timeout=30)
+            response.raise_for_status()
         
         img_data = BytesIO(response.content)
         img = Image.open(img_data)
         
         return img
     except Exception as e:
+        ipfs_fetch_failures.inc()
         print(f"Error downloading from IPFS: {e}")
         return None
 
@@ -132,7 +153,8 @@ def detect_construction_elements(img_array):
     img_preprocessed = preprocess_input(img_expanded)
     
     # Make prediction
-    predictions = model.predict(img_preprocessed)
+    with metrics.timer(inference_seconds, 'MobileNetV2'):
+        predictions = model.predict(img_preprocessed)
     decoded = decode_predictions(predictions, top=5)[0]
     
     # Construction-related keywords
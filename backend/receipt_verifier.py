@@ -0,0 +1,170 @@
+# Bulk transaction receipt verification
+# JSON-RPC batching + bounded concurrency + permanent cache for finalized receipts
+
+import asyncio
+import itertools
+import re
+
+import aiohttp
+
+TX_HASH_PATTERN = re.compile(r'^0x[0-9a-f]{64}$')
+
+# Receipts this many blocks deep are treated as final and cached forever
+DEFAULT_CONFIRMATIONS = 12
+
+
+class RPCError(Exception):
+    pass
+
+
+def _hex_int(value):
+    return int(value, 16) if value is not None else None
+
+
+def normalize_tx_hash(tx_hash):
+    """Hashes are compared, cached and stored lowercase"""
+    return tx_hash.strip().lower()
+
+
+def _failure(tx_hash, error):
+    return {"verified": False, "state": "failed", "tx_hash": tx_hash, "error": error}
+
+
+class ReceiptVerifier:
+    """
+    Verifies many transaction hashes with as few RPC round trips as possible
+    - hashes are fetched in JSON-RPC batches of `batch_size`
+    - at most `max_concurrency` batches are in flight at once
+    - receipts with >= `confirmations` confirmations are cached permanently
+    A result is "verified" only for a successful receipt that is final; "state"
+    tells the rest apart: reverted, pending (not yet final) or failed (lookup error)
+    """
+
+    def __init__(self, rpc_url, batch_size=50, max_concurrency=4,
+                 confirmations=DEFAULT_CONFIRMATIONS, timeout=30,
+                 explorer_url='https://mumbai.polygonscan.com/tx/'):
+        self.rpc_url = rpc_url
+        self.batch_size = batch_size
+        self.confirmations = confirmations
+        self.explorer_url = explorer_url
+        self._timeout = aiohttp.ClientTimeout(total=timeout)
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._ids = itertools.count(1)
+        self._session = None
+        self._finalized = {}  # tx_hash -> result (immutable once final)
+
+    async def _get_session(self):
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(timeout=self._timeout)
+        return self._session
+
+    async def close(self):
+        if self._session is not None:
+            await self._session.close()
+
+    async def _batch_call(self, calls):
+        """Send [(method, params), ...] as one JSON-RPC batch, return results in order"""
+        payload = []
+        for method, params in calls:
+            payload.append({"jsonrpc": "2.0", "id": next(self._ids), "method": method, "params": params})
+
+        session = await self._get_session()
+        async with self._semaphore:
+            async with session.post(self.rpc_url, json=payload) as response:
+                response.raise_for_status()
+                body = await response.json(content_type=None)
+
+        # Some nodes answer a rejected batch with a single error object
+        if isinstance(body, dict):
+            raise RPCError(body.get('error', body))
+
+        by_id = {item.get('id'): item for item in body}
+        results = []
+        for request in payload:
+            item = by_id.get(request['id'], {})
+            if 'error' in item:
+                results.append(RPCError(item['error'].get('message', item['error'])))
+            else:
+                results.append(item.get('result'))
+        return results
+
+    def _summarize(self, tx_hash, receipt, latest_block):
+        block_number = _hex_int(receipt['blockNumber'])
+        confirmations = latest_block - block_number + 1 if block_number is not None else 0
+        status = _hex_int(receipt.get('status'))
+        finalized = confirmations >= self.confirmations
+        if status == 0:
+            state = "reverted"
+        elif not finalized:
+            state = "pending"
+        elif status == 1:
+            state = "verified"
+        else:
+            state = "failed"  # Pre-Byzantium receipts carry no status
+        return {
+            "verified": state == "verified",
+            "state": state,
+            "tx_hash": tx_hash,
+            "block_number": block_number,
+            "from": receipt.get('from'),
+            "to": receipt.get('to'),
+            "status": status,
+            "gas_used": _hex_int(receipt.get('gasUsed')),
+            "confirmations": confirmations,
+            "finalized": finalized,
+            "explorer_url": f"{self.explorer_url}{tx_hash}"
+        }
+
+    async def _verify_chunk(self, chunk):
+        calls = [("eth_blockNumber", [])] + [("eth_getTransactionReceipt", [h]) for h in chunk]
+        try:
+            results = await self._batch_call(calls)
+        except (RPCError, aiohttp.ClientError, asyncio.TimeoutError) as e:
+            return {h: _failure(h, f"RPC error: {e}") for h in chunk}
+
+        latest = results[0]
+        latest_block = _hex_int(latest) if not isinstance(latest, Exception) else 0
+
+        verified = {}
+        for tx_hash, receipt in zip(chunk, results[1:]):
+            if isinstance(receipt, Exception):
+                verified[tx_hash] = _failure(tx_hash, f"RPC error: {receipt}")
+            elif receipt is None:
+                verified[tx_hash] = _failure(tx_hash, "Transaction not found")
+            else:
+                result = self._summarize(tx_hash, receipt, latest_block)
+                if result['finalized']:
+                    self._finalized[tx_hash] = result
+                verified[tx_hash] = result
+        return verified
+
+    async def verify_many(self, tx_hashes):
+        """
+        Verify a list of hashes
+        Returns: { normalized tx_hash: result } in input order, duplicates collapsed
+        """
+        results = {}
+        pending = []
+        for raw in tx_hashes:
+            tx_hash = normalize_tx_hash(raw)
+            if tx_hash in results:
+                continue
+            if not TX_HASH_PATTERN.match(tx_hash):
+                results[tx_hash] = _failure(tx_hash, "Invalid transaction hash")
+            elif tx_hash in self._finalized:
+                results[tx_hash] = self._finalized[tx_hash]
+            else:
+                results[tx_hash] = None
+                pending.append(tx_hash)
+
+        chunks = [pending[i:i + self.batch_size] for i in range(0, len(pending), self.batch_size)]
+        for verified in await asyncio.gather(*(self._verify_chunk(chunk) for chunk in chunks)):
+            results.update(verified)
+        return results
+
+    async def verify(self, tx_hash):
+        results = await self.verify_many([tx_hash])
+        return next(iter(results.values()))
+
+    def cache_info(self):
+        return {"finalized_receipts": len(self._finalized)}
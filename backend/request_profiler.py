@@ -0,0 +1,215 @@
+# On-demand sampling profiler for live Flask requests
+# Off unless PROFILER_TOKEN is set. With it, a request is profiled when it
+# carries `X-Profile-Token: <token>`, or when the admin endpoint armed the
+# profiler for the next N requests / 1 in K requests:
+#
+#   POST /api/admin/profiler {"next": 20} | {"sample_every": 100} | {"stop": true}
+#   GET  /api/admin/profiler                     status and recent profiles
+#   GET  /api/admin/profiler/profiles/<name>     one profile
+#
+# A background thread samples the stacks of the profiled request threads every
+# few milliseconds; nothing runs in the request thread itself. Each profile is
+# written as collapsed stacks (flamegraph.pl / speedscope input) named after
+# the time, route, status and duration.
+
+import collections
+import hmac
+import logging
+import os
+import re
+import sys
+import tempfile
+import threading
+import time
+import uuid
+
+from flask import abort, g, jsonify, request, send_from_directory
+
+TOKEN_HEADER = 'X-Profile-Token'
+DEFAULT_INTERVAL = 0.005
+DEFAULT_OUTPUT_DIR = os.path.join(tempfile.gettempdir(), 'request-profiles')
+RECENT_PROFILES = 100
+MAX_NEXT = 1000
+
+
+def collapse(frame):
+    """frame stack as `outer;...;inner`, one `function (file:line)` per frame"""
+    names = []
+    while frame is not None:
+        code = frame.f_code
+        names.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+        frame = frame.f_back
+    return ';'.join(reversed(names))
+
+
+class StackSampler(threading.Thread):
+    """Samples the stacks of registered threads; sleeps while none are registered"""
+
+    def __init__(self, interval=DEFAULT_INTERVAL):
+        super().__init__(name='request-profiler', daemon=True)
+        self.interval = interval
+        self._targets = {}
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+
+    def add(self, thread_id):
+        stacks = collections.Counter()
+        with self._lock:
+            self._targets[thread_id] = stacks
+        self._wake.set()
+        return stacks
+
+    def remove(self, thread_id):
+        with self._lock:
+            return self._targets.pop(thread_id, None)
+
+    def run(self):
+        while True:
+            if not self._targets:
+                self._wake.wait()
+                self._wake.clear()
+                continue
+            frames = sys._current_frames()
+            with self._lock:
+                for thread_id, stacks in self._targets.items():
+                    frame = frames.get(thread_id)
+                    if frame is not None:
+                        stacks[collapse(frame)] += 1
+            del frames
+            time.sleep(self.interval)
+
+
+class RequestProfiler:
+    """Flask extension; installs nothing unless a token is configured"""
+
+    def __init__(self, app=None, token=None, output_dir=None, interval=None):
+        self.token = token if token is not None else os.environ.get('PROFILER_TOKEN', '')
+        self.output_dir = output_dir or os.environ.get('PROFILE_DIR') or DEFAULT_OUTPUT_DIR
+        self.interval = interval or float(os.environ.get('PROFILE_INTERVAL', DEFAULT_INTERVAL))
+        self.enabled = bool(self.token)
+        self._sampler = None
+        self._lock = threading.Lock()
+        self._next = 0
+        self._sample_every = 0
+        self._seen = 0
+        self._recent = collections.deque(maxlen=RECENT_PROFILES)
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        if not self.enabled:
+            return
+        app.before_request(self._before_request)
+        app.after_request(self._after_request)
+        app.teardown_request(self._teardown_request)
+        app.add_url_rule('/api/admin/profiler', 'profiler_status', self.status_view)
+        app.add_url_rule('/api/admin/profiler', 'profiler_arm', self.arm_view, methods=['POST'])
+        app.add_url_rule('/api/admin/profiler/profiles/<name>', 'profiler_profile', self.profile_view)
+
+    def _authorized(self):
+        supplied = request.headers.get(TOKEN_HEADER, '')
+        return bool(supplied) and hmac.compare_digest(supplied.encode(), self.token.encode())
+
+    def _should_profile(self):
+        if request.endpoint and request.endpoint.startswith('profiler_'):
+            return False
+        if TOKEN_HEADER in request.headers:
+            return self._authorized()
+        if not (self._next or self._sample_every):
+            return False
+        with self._lock:
+            if self._next:
+                self._next -= 1
+                return True
+            if self._sample_every:
+                self._seen += 1
+                return self._seen % self._sample_every == 0
+        return False
+
+    # ============ Request hooks ============
+
+    def _before_request(self):
+        if not self._should_profile():
+            return
+        if self._sampler is None:
+            with self._lock:
+                if self._sampler is None:
+                    self._sampler = StackSampler(self.interval)
+                    self._sampler.start()
+        thread_id = threading.get_ident()
+        g._profile = (uuid.uuid4().hex[:12], thread_id, time.perf_counter(), self._sampler.add(thread_id))
+
+    def _after_request(self, response):
+        profile = g.get('_profile')
+        if profile is not None:
+            g._profile_status = response.status_code
+            response.headers['X-Profile-Id'] = profile[0]
+        return response
+
+    def _teardown_request(self, exc):
+        profile = g.pop('_profile', None)
+        if profile is None:
+            return
+        profile_id, thread_id, started, _ = profile
+        stacks = self._sampler.remove(thread_id)
+        duration_ms = (time.perf_counter() - started) * 1000
+        status = g.pop('_profile_status', 500 if exc is not None else 0)
+        try:
+            self._write(profile_id, request.endpoint or 'unmatched', status, duration_ms, stacks or {})
+        except OSError as e:
+            logging.getLogger(__name__).warning("Could not write profile %s: %s", profile_id, e)
+
+    def _write(self, profile_id, endpoint, status, duration_ms, stacks):
+        os.makedirs(self.output_dir, exist_ok=True)
+        safe_endpoint = re.sub(r'[^A-Za-z0-9_.-]', '_', endpoint)
+        name = (f"{time.strftime('%Y%m%dT%H%M%S')}-{safe_endpoint}-{status}-"
+                f"{int(round(duration_ms))}ms-{profile_id}.collapsed")
+        with open(os.path.join(self.output_dir, name), 'w', encoding='utf-8') as f:
+            for stack, count in stacks.items():
+                f.write(f"{stack} {count}\n")
+        self._recent.append({
+            "id": profile_id,
+            "file": name,
+            "endpoint": endpoint,
+            "path": request.path,
+            "status": status,
+            "duration_ms": round(duration_ms, 2),
+            "samples": sum(stacks.values())
+        })
+
+    # ============ Admin endpoints ============
+
+    def status_view(self):
+        if not self._authorized():
+            abort(403)
+        return jsonify({
+            "next": self._next,
+            "sample_every": self._sample_every,
+            "interval_ms": self.interval * 1000,
+            "output_dir": self.output_dir,
+            "profiles": list(self._recent)
+        })
+
+    def arm_view(self):
+        if not self._authorized():
+            abort(403)
+        data = request.get_json(silent=True) or {}
+        try:
+            with self._lock:
+                if data.get('stop'):
+                    self._next = self._sample_every = 0
+                if 'next' in data:
+                    self._next = max(0, min(int(data['next']), MAX_NEXT))
+                if 'sample_every' in data:
+                    self._sample_every = max(0, int(data['sample_every']))
+                    self._seen = 0
+        except (TypeError, ValueError):
+            return jsonify({"error": "next and sample_every must be integers"}), 400
+        return jsonify({"next": self._next, "sample_every": self._sample_every})
+
+    def profile_view(self, name):
+        if not self._authorized():
+            abort(403)
+        if not any(p['file'] == name for p in self._recent):
+            abort(404)
+        return send_from_directory(self.output_dir, name, mimetype='text/plain')
@@ -0,0 +1,218 @@
+# web3 provider spreading JSON-RPC traffic over several nodes
+# RPC_URLS is a comma-separated list; the first node is the primary. Writes,
+# nonce reads, node-local state (accounts, filters) and receipts of our own
+# transactions always go to the primary, without failover, so a transaction is
+# never sent twice and reads of it see the node that accepted it.
+#
+# Reads go to the healthy node with the lowest EWMA latency. If it has not
+# answered within its own recent RPC_HEDGE_PERCENTILE latency (0 turns hedging
+# off), the same read is re-issued to the next node and the first answer wins;
+# a transport error fails over to the next node straight away. A node is
+# skipped for RPC_COOLDOWN_SECONDS after RPC_MAX_FAILURES consecutive transport
+# errors.
+# JSON-RPC error responses are answers, not failures, and are returned as is.
+
+import collections
+import math
+import os
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+from web3 import HTTPProvider
+from web3.providers.base import JSONBaseProvider
+
+HEDGE_PERCENTILE = float(os.environ.get('RPC_HEDGE_PERCENTILE', 95))
+# Hedge delay bounds, and the delay used until a node has MIN_SAMPLES latencies
+HEDGE_MIN_SECONDS = float(os.environ.get('RPC_HEDGE_MIN_MS', 10)) / 1000
+HEDGE_MAX_SECONDS = float(os.environ.get('RPC_HEDGE_MAX_MS', 2000)) / 1000
+HEDGE_DEFAULT_SECONDS = 0.25
+MIN_SAMPLES = 20
+LATENCY_WINDOW = 200
+EWMA_ALPHA = 0.2
+# Latency charged to a node for a transport error
+FAILURE_PENALTY_SECONDS = 1.0
+MAX_FAILURES = int(os.environ.get('RPC_MAX_FAILURES', 3))
+COOLDOWN_SECONDS = float(os.environ.get('RPC_COOLDOWN_SECONDS', 15))
+# Every pooled read runs on this executor, so size it for the server's concurrent requests
+HEDGE_WORKERS = int(os.environ.get('RPC_POOL_WORKERS', 64))
+
+PRIMARY_METHODS = frozenset((
+    'eth_sendTransaction', 'eth_sendRawTransaction', 'eth_sign', 'eth_signTransaction', 'eth_signTypedData',
+    'eth_accounts', 'eth_getTransactionCount', 'eth_getTransactionReceipt', 'eth_getTransactionByHash',
+    'eth_newFilter', 'eth_newBlockFilter', 'eth_newPendingTransactionFilter', 'eth_getFilterChanges',
+    'eth_getFilterLogs', 'eth_uninstallFilter'
+))
+PRIMARY_PREFIXES = ('personal_', 'evm_', 'hardhat_', 'anvil_', 'miner_', 'debug_')
+
+
+def is_primary_method(method):
+    return method in PRIMARY_METHODS or method.startswith(PRIMARY_PREFIXES)
+
+
+def urls_from_env(default='http://127.0.0.1:8545'):
+    """RPC_URLS, else RPC_URL, as a list"""
+    urls = os.environ.get('RPC_URLS') or os.environ.get('RPC_URL') or default
+    return [url.strip() for url in urls.split(',') if url.strip()]
+
+
+class RpcNode:
+    """One endpoint: its HTTPProvider, latency window, EWMA and health"""
+
+    def __init__(self, url, timeout=None):
+        self.url = url
+        self.provider = HTTPProvider(url, request_kwargs={'timeout': timeout} if timeout else None)
+        self.ewma = None
+        self.latencies = collections.deque(maxlen=LATENCY_WINDOW)
+        self.failures = 0
+        self.down_until = 0.0
+        self.counts = collections.Counter()
+        self._lock = threading.Lock()
+
+    def healthy(self, now):
+        return now >= self.down_until
+
+    def observe(self, seconds):
+        with self._lock:
+            self.latencies.append(seconds)
+            self.ewma = seconds if self.ewma is None else self.ewma + EWMA_ALPHA * (seconds - self.ewma)
+            self.failures = 0
+            self.counts['ok'] += 1
+
+    def fail(self, seconds, now, max_failures=MAX_FAILURES, cooldown=COOLDOWN_SECONDS):
+        with self._lock:
+            # A quickly refused connection must not rank as a fast node
+            self.ewma = max(self.ewma or 0.0, seconds, FAILURE_PENALTY_SECONDS)
+            self.failures += 1
+            self.counts['failed'] += 1
+            if self.failures >= max_failures:
+                self.down_until = now + cooldown
+
+    def percentile(self, p):
+        """Latency at percentile p of the recent window; None until MIN_SAMPLES"""
+        with self._lock:
+            if len(self.latencies) < MIN_SAMPLES:
+                return None
+            ordered = sorted(self.latencies)
+        return ordered[max(0, math.ceil(p / 100 * len(ordered)) - 1)]
+
+    def snapshot(self, now):
+        p50, p95 = self.percentile(50), self.percentile(95)
+        return {
+            "url": self.url,
+            "healthy": self.healthy(now),
+            "ewma_ms": round(self.ewma * 1000, 2) if self.ewma is not None else None,
+            "p50_ms": round(p50 * 1000, 2) if p50 is not None else None,
+            "p95_ms": round(p95 * 1000, 2) if p95 is not None else None,
+            "consecutive_failures": self.failures,
+            "counts": dict(self.counts)
+        }
+
+
+class RpcPool(JSONBaseProvider):
+    """
+    Provider over several HTTP nodes; Web3(RpcPool(urls))
+    With a single URL it behaves like a plain HTTPProvider
+    """
+
+    def __init__(self, urls, timeout=None, hedge_percentile=HEDGE_PERCENTILE, max_failures=MAX_FAILURES,
+                 cooldown=COOLDOWN_SECONDS, clock=time.monotonic):
+        super().__init__()
+        if not urls:
+            raise ValueError("RpcPool needs at least one RPC URL")
+        self.nodes = [RpcNode(url, timeout) for url in urls]
+        self.primary = self.nodes[0]
+        self.hedge_percentile = hedge_percentile
+        self.max_failures = max_failures
+        self.cooldown = cooldown
+        self.clock = clock
+        self.counts = collections.Counter()
+        self._executor = None
+        self._executor_lock = threading.Lock()
+
+    def __str__(self):
+        return f"RPC pool {', '.join(node.url for node in self.nodes)}"
+
+    def _send(self, node, method, params):
+        started = time.perf_counter()
+        try:
+            response = node.provider.make_request(method, params)
+        except OSError:
+            node.fail(time.perf_counter() - started, self.clock(), self.max_failures, self.cooldown)
+            raise
+        node.observe(time.perf_counter() - started)
+        return response
+
+    def ranked(self, now=None):
+        """Healthy nodes fastest first (unmeasured nodes first, so they get measured); all nodes if none are healthy"""
+        now = self.clock() if now is None else now
+        healthy = [node for node in self.nodes if node.healthy(now)] or list(self.nodes)
+        return sorted(healthy, key=lambda node: -1.0 if node.ewma is None else node.ewma)
+
+    def hedge_delay(self, node):
+        """Seconds to wait before hedging a read to node; None when hedging is off"""
+        if not self.hedge_percentile:
+            return None
+        delay = node.percentile(self.hedge_percentile)
+        if delay is None:
+            return HEDGE_DEFAULT_SECONDS
+        return min(HEDGE_MAX_SECONDS, max(HEDGE_MIN_SECONDS, delay))
+
+    def make_request(self, method, params):
+        if is_primary_method(method) or len(self.nodes) == 1:
+            self.counts['primary' if len(self.nodes) > 1 else 'single'] += 1
+            return self._send(self.primary, method, params)
+        return self._read(method, params)
+
+    def _read(self, method, params):
+        if self._executor is None:
+            with self._executor_lock:
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(HEDGE_WORKERS, thread_name_prefix='rpc-hedge')
+        candidates = iter(self.ranked())
+        first = next(candidates)
+        pending = {self._executor.submit(self._send, first, method, params): first}
+        delay = self.hedge_delay(first)
+        self.counts['reads'] += 1
+        hedged = False
+        error = None
+        while pending:
+            done, _ = wait(pending, timeout=delay, return_when=FIRST_COMPLETED)
+            if not done:
+                # Slower than this node's usual tail: race it against the next node, once
+                delay, hedged = None, True
+                node = next(candidates, None)
+                if node is not None:
+                    self.counts['hedged'] += 1
+                    pending[self._executor.submit(self._send, node, method, params)] = node
+                continue
+            for future in done:
+                node = pending.pop(future)
+                try:
+                    response = future.result()
+                except OSError as e:
+                    error = e
+                    continue
+                if node is not first:
+                    self.counts['won_by_hedge' if hedged else 'failed_over'] += 1
+                return response
+            if not pending:
+                node = next(candidates, None)
+                if node is not None:
+                    pending[self._executor.submit(self._send, node, method, params)] = node
+        raise error
+
+    def is_connected(self, show_traceback=False):
+        """True if any node answers; with show_traceback, the primary's error when none does"""
+        if any(node.provider.is_connected() for node in self.ranked()):
+            return True
+        return self.primary.provider.is_connected(show_traceback)
+
+    def snapshot(self):
+        now = self.clock()
+        return {
+            "primary": self.primary.url,
+            "hedge_percentile": self.hedge_percentile,
+            "counts": dict(self.counts),
+            "nodes": [node.snapshot(now) for node in self.nodes]
+        }
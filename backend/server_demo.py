@@ -2,9 +2,23 @@ from flask import Flask, jsonify, request
 from flask_cors import CORS
 import json
 import os
+import time
+
+import numpy as np
+
+from compression import Compressor
+from event_stream import EventBroker
+from geofence import CONTRACT_COORDINATE_SCALE, DEFAULT_RADIUS_METERS, GeofenceIndex, parse_gps_coordinates
+from json_provider import OrjsonProvider
+from metrics import Metrics
+from request_profiler import RequestProfiler
 
 app = Flask(__name__)
 CORS(app)
+app.json = OrjsonProvider(app)
+metrics = Metrics(app)
+profiler = RequestProfiler(app)
+compression = Compressor(app)
 
 # User database (simple in-memory for demo)
 USERS = {
@@ -30,6 +44,9 @@ MOCK_PROJECTS = [
         "manager_address": "0xAdmin123",  # For frontend compatibility
         "status": "Active",
         "createdAt": 1698153600,
+        "centerLatitude": 18754600,  # GPS * 1e6, as stored by the contract
+        "centerLongitude": 73406200,
+        "gpsRadiusMeters": 500,
         "tx_hash": "0xdemo1234567890abcdef1234567890abcdef1234567890abcdef1234567890ab"
     },
     {
@@ -47,6 +64,9 @@ MOCK_PROJECTS = [
         "manager_address": "0xAdmin123",  # For frontend compatibility
         "status": "Active",
         "createdAt": 1698240000,
+        "centerLatitude": 12971600,
+        "centerLongitude": 77594600,
+        "gpsRadiusMeters": 500,
         "tx_hash": "0xdemo0987654321fedcba0987654321fedcba0987654321fedcba0987654321fe"
     }
 ]
@@ -66,6 +86,9 @@ MOCK_ORACLE_VERIFICATIONS = []
 # Mock quality reports
 MOCK_QUALITY_REPORTS = {}
 
+# Push channel for supervisor / oracle dashboards (GET /api/events)
+events = EventBroker()
+
 MOCK_TENDERS = [
     {
         "id": 1,
@@ -77,6 +100,27 @@ MOCK_TENDERS = [
     }
 ]
 
+# Geofence index over project centers, rebuilt after projects change
+_geofence_index = None
+
+def get_geofence_index():
+    global _geofence_index
+    if _geofence_index is None:
+        _geofence_index = GeofenceIndex.from_projects(MOCK_PROJECTS)
+    return _geofence_index
+
+def invalidate_geofence_index():
+    global _geofence_index
+    _geofence_index = None
+
+def scaled_coordinate(data, scaled_key, degrees_key):
+    """Read a coordinate given either contract-scaled (1e6) or in degrees"""
+    if data.get(scaled_key) is not None:
+        return int(data[scaled_key])
+    if data.get(degrees_key) is not None:
+        return int(round(float(data[degrees_key]) * CONTRACT_COORDINATE_SCALE))
+    return None
+
 @app.route('/')
 def home():
     return jsonify({
@@ -273,6 +317,7 @@ def submit_to_supervisor():
     }
     
     MOCK_PENDING_TENDERS.append(tender)
+    events.publish('tender.submitted', tender)
     
     return jsonify({
         "message": "Tender sent to supervisor successfully (DEMO mode)",
@@ -355,6 +400,13 @@ def approve_tender():
             MOCK_MILESTONES[project_id] = milestones
             break
     
+    events.publish('tender.approved', {
+        "tender_id": tender_id,
+        "project_id": project_id,
+        "approved_at": data.get('approved_at'),
+        "supervisor_address": data.get('supervisor_address')
+    })
+    
     return jsonify({
         "message": "Tender approved successfully (DEMO mode)",
         "funds_released": first_milestone_amount,
@@ -381,6 +433,7 @@ def reject_tender():
         "rejected_at": data.get('rejected_at')
     }
     MOCK_REJECTIONS.append(rejection)
+    events.publish('tender.rejected', rejection)
     
     # Update project status
     for project in MOCK_PROJECTS:
@@ -426,11 +479,15 @@ def create_project():
         "manager_address": data.get('manager_address', '0xDemo'),  # For frontend compatibility
         "status": "Created",
         "createdAt": 1698240000,
+        "centerLatitude": scaled_coordinate(data, 'centerLatitude', 'center_latitude'),
+        "centerLongitude": scaled_coordinate(data, 'centerLongitude', 'center_longitude'),
+        "gpsRadiusMeters": int(data.get('gpsRadiusMeters', DEFAULT_RADIUS_METERS)),
         "tx_hash": f"0xdemo{new_id:064x}"  # Generate demo tx hash
     }
     
     # Add to mock projects list
     MOCK_PROJECTS.append(new_project)
+    invalidate_geofence_index()
     
     return jsonify({
         "id": new_id,
@@ -577,12 +634,36 @@ def submit_milestone_work(project_id, milestone_id):
     if milestone['status'] != 'active':
         return jsonify({"error": "Milestone is not active"}), 400
     
+    # Validate GPS proof location if provided
+    gps = None
+    if data.get('gps_coordinates'):
+        try:
+            latitude, longitude = parse_gps_coordinates(data['gps_coordinates'])
+        except ValueError as e:
+            return jsonify({"error": f"Invalid gps_coordinates: {e}"}), 400
+        gps = {
+            "gps_coordinates": data['gps_coordinates'],
+            "latitude": int(round(latitude * CONTRACT_COORDINATE_SCALE)),
+            "longitude": int(round(longitude * CONTRACT_COORDINATE_SCALE)),
+            "gps_distance_meters": None,
+            "gps_within_radius": None
+        }
+        index = get_geofence_index()
+        try:
+            distance, within = index.check(project_id, latitude, longitude)
+            gps['gps_distance_meters'] = round(distance, 1)
+            gps['gps_within_radius'] = within
+        except KeyError:
+            pass  # Project has no GPS center
+    
     # Update milestone with submission
     milestone['work_submitted'] = True
     milestone['verification_status'] = 'pending_verification'
     milestone['submitted_at'] = data.get('submitted_at')
     milestone['submission_files'] = data.get('submission_files', [])
     milestone['submission_notes'] = data.get('notes', '')
+    if gps:
+        milestone.update(gps)
     
     # Add to oracle verification queue
     verification = {
@@ -598,7 +679,10 @@ def submit_milestone_work(project_id, milestone_id):
         "budget": milestone['amount'],
         "milestone_percentage": milestone['percentage']
     }
+    if gps:
+        verification.update(gps)
     MOCK_ORACLE_VERIFICATIONS.append(verification)
+    events.publish('milestone.submitted', verification)
     
     return jsonify({
         "message": "Work submitted for oracle verification",
@@ -606,6 +690,121 @@ def submit_milestone_work(project_id, milestone_id):
         "milestone": milestone
     })
 
+@app.route('/api/geofence/nearby', methods=['GET'])
+def get_nearby_sites():
+    """Which project sites is a GPS point near (e.g. a geo-tagged photo)"""
+    try:
+        latitude, longitude = parse_gps_coordinates(request.args.get('gps', ''))
+    except ValueError as e:
+        return jsonify({"error": f"Invalid gps: {e}"}), 400
+    
+    max_distance = request.args.get('max_distance', type=float)
+    sites = get_geofence_index().nearby(latitude, longitude, max_distance)
+    return jsonify({
+        "latitude": latitude,
+        "longitude": longitude,
+        "sites": sites,
+        "total": len(sites)
+    })
+
+MAX_GPS_CHECK_ITEMS = 10000
+
+def is_integer(value):
+    # bool is an int subclass; true/false are not ids or coordinates
+    return isinstance(value, int) and not isinstance(value, bool)
+
+def contract_coordinate(value):
+    """Contract-scaled coordinate as sent in JSON: an integer, or a string of one"""
+    if isinstance(value, str) and value.strip().lstrip('+-').isdigit():
+        return int(value)
+    if not is_integer(value):
+        raise ValueError(f"expected an integer in degrees * {CONTRACT_COORDINATE_SCALE}, got {value!r}")
+    return value
+
+@app.route('/api/oracle/gps-check', methods=['POST'])
+def bulk_gps_check():
+    """
+    Pre-screen many milestone GPS proofs before any on-chain verifyGPS call
+    Body: { items: [{ project_id, milestone_id, latitude, longitude }] }
+    latitude/longitude are contract-scaled (degrees * 1e6); an item may send
+    gps_coordinates ("18.7546° N, 73.4062° E") instead
+    Items with a non-integer id or coordinate get an "error" and are not checked
+    """
+    data = request.get_json() or {}
+    items = data.get('items') if isinstance(data, dict) else None
+    if not isinstance(items, list) or not items:
+        return jsonify({"error": "items must be a non-empty list"}), 400
+    if len(items) > MAX_GPS_CHECK_ITEMS:
+        return jsonify({"error": f"At most {MAX_GPS_CHECK_ITEMS} items per request"}), 400
+    
+    started = time.perf_counter()
+    results = [None] * len(items)
+    rows, project_ids, latitudes, longitudes = [], [], [], []
+    
+    for i, item in enumerate(items):
+        if not isinstance(item, dict):
+            results[i] = {"index": i, "error": "Item must be an object"}
+            continue
+        project_id = item.get('project_id')
+        milestone_id = item.get('milestone_id')
+        result = {"index": i, "project_id": project_id, "milestone_id": milestone_id}
+        results[i] = result
+        if not is_integer(project_id):
+            result['error'] = "project_id must be an integer"
+            continue
+        if milestone_id is not None and not is_integer(milestone_id):
+            result['error'] = "milestone_id must be an integer"
+            continue
+        
+        milestones = MOCK_MILESTONES.get(project_id, [])
+        if milestone_id is not None and not any(m['id'] == milestone_id for m in milestones):
+            result['error'] = "Milestone not found"
+            continue
+        try:
+            if item.get('gps_coordinates'):
+                latitude, longitude = parse_gps_coordinates(item['gps_coordinates'])
+            else:
+                latitude = contract_coordinate(item['latitude']) / CONTRACT_COORDINATE_SCALE
+                longitude = contract_coordinate(item['longitude']) / CONTRACT_COORDINATE_SCALE
+                if not (-90 <= latitude <= 90 and -180 <= longitude <= 180):
+                    raise ValueError("Coordinates out of range")
+        except (KeyError, TypeError, ValueError) as e:
+            result['error'] = f"Invalid coordinates: {e}"
+            continue
+        
+        rows.append(i)
+        project_ids.append(project_id)
+        latitudes.append(latitude)
+        longitudes.append(longitude)
+    
+    index = get_geofence_index()
+    known, distances, within, contract_distances, contract_passed = index.check_many(
+        project_ids, latitudes, longitudes
+    )
+    
+    for j in np.nonzero(~known)[0].tolist():
+        results[rows[j]]['error'] = "Project has no GPS center"
+    for j in np.nonzero(known)[0].tolist():
+        results[rows[j]].update({
+            "latitude": int(round(latitudes[j] * CONTRACT_COORDINATE_SCALE)),
+            "longitude": int(round(longitudes[j] * CONTRACT_COORDINATE_SCALE)),
+            "distance_meters": round(float(distances[j]), 1),
+            "within_radius": bool(within[j]),
+            "contract_distance_meters": int(contract_distances[j]),
+            "passed": bool(contract_passed[j]),  # What verifyGPS would return on-chain
+            "radius_meters": int(index.radius(project_ids[j]))
+        })
+    
+    passed = int(contract_passed.sum())
+    return jsonify({
+        "results": results,
+        "total": len(items),
+        "passed": passed,
+        "failed": int(known.sum()) - passed,
+        "errors": len(items) - int(known.sum()),
+        "elapsed_ms": round((time.perf_counter() - started) * 1000, 2)
+    })
+
 @app.route('/api/oracle/verifications', methods=['GET'])
 def get_pending_verifications():
     """Oracle/Supervisor gets list of pending verifications"""
@@ -659,6 +858,15 @@ def oracle_verify_milestone():
             next_milestone['status'] = 'active'
             next_milestone['started_at'] = data.get('verified_at')
         
+        events.publish('milestone.verified', {
+            "verification_id": verification_id,
+            "project_id": project_id,
+            "milestone_id": milestone_id,
+            "payment_amount": milestone['amount'],
+            "next_milestone_id": next_milestone['id'] if next_milestone else None,
+            "verified_at": data.get('verified_at')
+        })
+        
         # Update project allocated funds
         project = next((p for p in MOCK_PROJECTS if p['id'] == project_id), None)
         if project:
@@ -685,6 +893,14 @@ def oracle_verify_milestone():
         verification['oracle_address'] = oracle_address
         verification['feedback'] = feedback
         
+        events.publish('milestone.rejected', {
+            "verification_id": verification_id,
+            "project_id": project_id,
+            "milestone_id": milestone_id,
+            "feedback": feedback,
+            "rejected_at": data.get('verified_at')
+        })
+        
         return jsonify({
             "message": "Milestone rejected. Contractor must resubmit.",
             "feedback": feedback,
@@ -761,6 +977,14 @@ def check_contractor_eligibility(contractor_address):
 
 # ============= END MILESTONE SYSTEM =============
 
+# ============= LIVE UPDATES (SSE) =============
+
+@app.route('/api/events')
+def event_stream():
+    """Server-sent events for tender / milestone changes; ?types=tender,milestone filters"""
+    last_event_id = request.headers.get('Last-Event-ID') or request.args.get('last_event_id')
+    return events.response(last_event_id, request.args.get('types'))
+
 if __name__ == '__main__':
     print("\n" + "="*60)
     print("🚀 Municipal Fund Blockchain API Server - DEMO MODE")
@@ -775,6 +999,7 @@ if __name__ == '__main__':
     print("  Frontend: http://localhost:3000")
     print("  Backend:  http://localhost:5000")
     print("  Status:   http://localhost:5000/api/blockchain/status")
+    print("  Events:   http://localhost:5000/api/events")
     print("\n⚠️  SECURITY WARNING:")
     print("  Your MetaMask private key was shared publicly!")
     print("  Transfer all funds and create a NEW wallet immediately!")
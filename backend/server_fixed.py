@@ -1,23 +1,73 @@
-from flask import Flask, jsonify, request
+from flask import Flask, Response, jsonify, request
 from flask_cors import CORS
 from web3 import Web3
-import json
 import os
 from dotenv import load_dotenv
 
+from admission import AdmissionController
+from chain_monitor import ChainMonitor
+from circuit_breaker import ChainUnavailableError, CircuitBreaker, StaleCache, unavailable_response
+from compression import Compressor
+from conditional_get import DEFAULT_CACHE_CONTROL, conditional
+from contract_registry import ADDRESS_FILE, FRONTEND_DIR, ContractRegistry, artifact_path
+from export_stream import CURSOR_FIELD, ERROR_FIELD, RowEncoder, decode_cursor, encode_cursor, export_chunks
+from json_provider import OrjsonProvider
+from metrics import Metrics
+from request_profiler import RequestProfiler
+from single_flight import SingleFlight
+from rpc_pool import RpcPool, urls_from_env
+from swr_cache import SwrCache, ttl_from_env
+
 # Load environment variables
 load_dotenv()
 
 app = Flask(__name__)
 CORS(app)
+app.json = OrjsonProvider(app)
+metrics = Metrics(app)
+profiler = RequestProfiler(app)
+# Chain scans make one RPC round trip per item; lookups make one or two.
+# Health checks are served from the monitor snapshot and cost nothing
+admission = AdmissionController(app, costs={
+    'get_projects': 5,
+    'get_stats': 5,
+    'export_entity': 20,
+    'get_tenders': 2,
+    'get_milestones': 2,
+    'health': 0
+})
+compression = Compressor(app)
 
 # Blockchain connection
 RPC_URL = os.getenv('RPC_URL', 'http://127.0.0.1:8545')
-w3 = Web3(Web3.HTTPProvider(RPC_URL))
+RPC_TIMEOUT = float(os.getenv('RPC_TIMEOUT', 10))
+# RPC_URLS=primary,replica,... spreads reads over several nodes; writes stay on the primary
+rpc_pool = RpcPool(urls_from_env(RPC_URL), timeout=RPC_TIMEOUT)
+w3 = Web3(rpc_pool)
+metrics.instrument_web3(w3)
+# Outermost middleware, so calls rejected while the circuit is open never reach metrics
+breaker = CircuitBreaker('rpc')
+w3.middleware_onion.add(breaker.middleware, name='circuit_breaker')
+last_good = StaleCache()
+# Status endpoints answer from this snapshot instead of querying the node per hit
+monitor = ChainMonitor(w3)
+# Identical concurrent chain reads share one in-flight sweep
+flights = SingleFlight()
+# Dashboard aggregates are answered from memory and re-scanned in the background
+aggregates = SwrCache()
+# (soft, hard) TTL seconds per endpoint; override with SWR_TTL_PROJECTS="5,60" etc.
+AGGREGATE_TTLS = {
+    'get_projects': ttl_from_env('projects', 5, 60),
+    'get_stats': ttl_from_env('stats', 15, 120)
+}
 
-# Contract details (will be loaded after deployment)
+# Contract details: CONTRACT_ADDRESS, else frontend/contractAddress.json written by scripts/deploy.js
 CONTRACT_ADDRESS = os.getenv('CONTRACT_ADDRESS', '')
-CONTRACT_ABI = []
+contracts = ContractRegistry(w3)
+contracts.register('FundTracker', abi_files=[FRONTEND_DIR / 'contractABI.json', artifact_path('FundTracker')],
+                   address=CONTRACT_ADDRESS or None, address_file=ADDRESS_FILE)
+contracts.register('AnonymousTenderSystem', abi_files=[artifact_path('AnonymousTenderSystem')],
+                   address=os.getenv('TENDER_CONTRACT_ADDRESS') or None)
 
 # User database (simple in-memory for demo)
 USERS = {
@@ -27,16 +77,10 @@ USERS = {
 }
 
 def load_contract():
-    """Load contract ABI and assign addresses"""
-    global CONTRACT_ABI, USERS
+    """Assign user addresses; the contract itself is loaded by the registry on first use"""
+    global USERS
     
     try:
-        # Load ABI
-        abi_path = os.path.join(os.path.dirname(__file__), '..', 'frontend', 'contractABI.json')
-        if os.path.exists(abi_path):
-            with open(abi_path, 'r') as f:
-                CONTRACT_ABI = json.load(f)
-        
         # Assign addresses from blockchain accounts
         if w3.is_connected():
             accounts = w3.eth.accounts
@@ -54,21 +98,133 @@ def load_contract():
         print(f"⚠ Error loading contract: {e}")
 
 def get_contract():
-    """Get contract instance"""
-    if not CONTRACT_ADDRESS or not CONTRACT_ABI:
+    """FundTracker registry entry (cached instance and call codecs), None until deployed"""
+    return contracts.get('FundTracker')
+
+def project_to_dict(project):
+    return {
+        "id": project[0],
+        "name": project[1],
+        "description": project[2],
+        "location": project[3],
+        "budget": project[4],
+        "allocatedFunds": project[5],
+        "spentFunds": project[6],
+        "admin": project[7],
+        "status": project[8],
+        "createdAt": project[9]
+    }
+
+def tender_to_dict(tender):
+    return {
+        "id": tender[0],
+        "projectId": tender[1],
+        "contractorCommitment": tender[2].hex(),
+        "encryptedDataIPFS": tender[3],
+        "tenderDocIPFS": tender[4],
+        "qualityReportIPFS": tender[5],
+        "status": tender[6],
+        "submittedAt": tender[7]
+    }
+
+def milestone_to_dict(milestone):
+    return {
+        "id": milestone[0],
+        "projectId": milestone[1],
+        "tenderId": milestone[2],
+        "percentageComplete": milestone[3],
+        "targetAmount": milestone[4],
+        "spentAmount": milestone[5],
+        "status": milestone[6],
+        "submittedAt": milestone[7],
+        "approvedAt": milestone[8]
+    }
+
+def chain_version():
+    """
+    ETag source for chain reads: contract state can only change with a new block
+    The block comes from the monitor snapshot, not an RPC call per request, so it
+    can trail the node by MONITOR_INTERVAL; data read since is at least that new
+    """
+    contract = get_contract()
+    status = monitor.snapshot()
+    if not contract or not status["connected"]:
         return None
-    return w3.eth.contract(address=CONTRACT_ADDRESS, abi=CONTRACT_ABI)
+    # Block hash rather than number, so a restarted local node doesn't reuse tags
+    return f"{contract.address[2:10].lower()}-{status['latest_block']}-{status['block_hash'][-16:]}"
+
+# ============ Coalesced chain reads ============
+# Keyed by the contract entry and arguments; results are shared between
+# requests, so views only read them
+
+@flights.coalesce('project_scan')
+def scan_projects(contract):
+    """(projectCount, readable projects); one sweep serves /api/projects and /api/stats"""
+    project_count = contract.call('projectCount')
+    projects = []
+    
+    for i in range(1, project_count + 1):
+        try:
+            projects.append(project_to_dict(contract.call('getProject', i)))
+        except ChainUnavailableError:
+            raise
+        except Exception:
+            continue
+    
+    return project_count, projects
+
+def cached_scan(contract, endpoint):
+    """
+    ((chain tag before the sweep, scan_projects result), age in seconds)
+    Past the endpoint's soft TTL the old scan is returned while one background sweep replaces it
+    """
+    def load():
+        try:
+            version = chain_version()
+        except Exception:
+            # Served untagged, as conditional() does when no tag can be read
+            version = None
+        return version, scan_projects(contract)
+    return aggregates.get(('project_scan', contract), load, *AGGREGATE_TTLS[endpoint])
+
+def aggregate_response(body, version, age):
+    """Tagged with the block the data was read at, which may be older than the latest one"""
+    if version and request.if_none_match.contains_weak(version):
+        response = Response(status=304)
+    else:
+        response = jsonify(body)
+    if version:
+        response.set_etag(version)
+        response.headers['Cache-Control'] = DEFAULT_CACHE_CONTROL
+    response.headers['Age'] = str(int(age))
+    return response
+
+@flights.coalesce('project')
+def read_project(contract, project_id):
+    return project_to_dict(contract.call('getProject', project_id))
+
+@flights.coalesce('tenders')
+def read_tenders(contract, project_id):
+    tender_ids = contract.call('getProjectTenders', project_id)
+    return [tender_to_dict(contract.call('getTender', tender_id)) for tender_id in tender_ids]
+
+@flights.coalesce('milestones')
+def read_milestones(contract, project_id):
+    milestone_ids = contract.call('getProjectMilestones', project_id)
+    return [milestone_to_dict(contract.call('getMilestone', milestone_id)) for milestone_id in milestone_ids]
 
 @app.route('/')
 def home():
+    contract = get_contract()
     return jsonify({
         "message": "Municipal Fund Tracker API",
-        "blockchain": "Connected" if w3.is_connected() else "Disconnected",
-        "contract": CONTRACT_ADDRESS if CONTRACT_ADDRESS else "Not deployed yet",
+        "blockchain": "Connected" if monitor.snapshot()["connected"] else "Disconnected",
+        "contract": contract.address if contract else "Not deployed yet",
         "version": "2.0 - With Anonymous Tenders",
         "endpoints": {
             "auth": "POST /api/login",
             "blockchain": "GET /api/blockchain/status",
+            "health": "GET /api/health",
             "projects": "GET /api/projects",
             "project": "GET /api/projects/:id",
             "create_project": "POST /api/projects/create",
@@ -78,7 +234,9 @@ def home():
             "milestones": "GET /api/milestones/:projectId",
             "submit_milestone": "POST /api/milestones/submit",
             "verify_milestone": "POST /api/milestones/verify",
-            "stats": "GET /api/stats"
+            "stats": "GET /api/stats",
+            "export": "GET /api/export/:entity (projects|tenders|milestones)",
+            "metrics": "GET /metrics"
         }
     })
 
@@ -102,125 +260,101 @@ def login():
 
 @app.route('/api/blockchain/status')
 def blockchain_status():
+    contract = get_contract()
+    status = monitor.snapshot()
     return jsonify({
-        "connected": w3.is_connected(),
+        "connected": status["connected"],
         "rpc_url": RPC_URL,
-        "contract_address": CONTRACT_ADDRESS if CONTRACT_ADDRESS else "Not deployed",
-        "has_abi": len(CONTRACT_ABI) > 0,
-        "accounts": w3.eth.accounts if w3.is_connected() else []
+        "contract_address": contract.address if contract else "Not deployed",
+        "has_abi": contract is not None,
+        "contracts": contracts.snapshot(),
+        "accounts": status["accounts"] if status["connected"] else [],
+        "node": status,
+        "circuit": breaker.snapshot(),
+        "rpc_nodes": rpc_pool.snapshot(),
+        "stale_entries": len(last_good),
+        "stale_served": last_good.served,
+        "coalescing": flights.stats(),
+        "aggregates": aggregates.stats()
     })
 
+@app.route('/api/health')
+def health():
+    """Load balancer check: 200 while the monitor sees a reachable, synced node"""
+    status = monitor.snapshot()
+    healthy = monitor.healthy(status)
+    return jsonify({
+        "status": "ok" if healthy else "unavailable",
+        "connected": status["connected"],
+        "latest_block": status.get("latest_block"),
+        "block_age_seconds": status.get("block_age_seconds"),
+        "checked_age_seconds": status["age_seconds"]
+    }), 200 if healthy else 503
+
 @app.route('/api/projects')
+@conditional(chain_version)
+@last_good.fallback
 def get_projects():
     contract = get_contract()
     if not contract:
         return jsonify({"error": "Contract not deployed"}), 500
     
     try:
-        project_count = contract.functions.projectCount().call()
-        projects = []
-        
-        for i in range(1, project_count + 1):
-            try:
-                project = contract.functions.getProject(i).call()
-                projects.append({
-                    "id": project[0],
-                    "name": project[1],
-                    "description": project[2],
-                    "location": project[3],
-                    "budget": project[4],
-                    "allocatedFunds": project[5],
-                    "spentFunds": project[6],
-                    "admin": project[7],
-                    "status": project[8],
-                    "createdAt": project[9]
-                })
-            except:
-                continue
-        
-        return jsonify({"projects": projects, "total": len(projects)})
+        (version, (_, projects)), age = cached_scan(contract, 'get_projects')
+        return aggregate_response({"projects": projects, "total": len(projects)}, version, age)
+    except ChainUnavailableError:
+        raise
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
 @app.route('/api/projects/<int:project_id>')
+@last_good.fallback
 def get_project(project_id):
     contract = get_contract()
     if not contract:
         return jsonify({"error": "Contract not deployed"}), 500
     
     try:
-        project = contract.functions.getProject(project_id).call()
-        return jsonify({
-            "id": project[0],
-            "name": project[1],
-            "description": project[2],
-            "location": project[3],
-            "budget": project[4],
-            "allocatedFunds": project[5],
-            "spentFunds": project[6],
-            "admin": project[7],
-            "status": project[8],
-            "createdAt": project[9]
-        })
+        return jsonify(read_project(contract, project_id))
+    except ChainUnavailableError:
+        raise
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
 @app.route('/api/tenders/<int:project_id>')
+@last_good.fallback
 def get_tenders(project_id):
     contract = get_contract()
     if not contract:
         return jsonify({"error": "Contract not deployed"}), 500
     
     try:
-        tender_ids = contract.functions.getProjectTenders(project_id).call()
-        tenders = []
-        
-        for tender_id in tender_ids:
-            tender = contract.functions.getTender(tender_id).call()
-            tenders.append({
-                "id": tender[0],
-                "projectId": tender[1],
-                "contractorCommitment": tender[2].hex(),
-                "encryptedDataIPFS": tender[3],
-                "tenderDocIPFS": tender[4],
-                "qualityReportIPFS": tender[5],
-                "status": tender[6],
-                "submittedAt": tender[7]
-            })
-        
+        tenders = read_tenders(contract, project_id)
         return jsonify({"tenders": tenders, "total": len(tenders)})
+    except ChainUnavailableError:
+        raise
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
 @app.route('/api/milestones/<int:project_id>')
+@conditional(chain_version)
+@last_good.fallback
 def get_milestones(project_id):
     contract = get_contract()
     if not contract:
         return jsonify({"error": "Contract not deployed"}), 500
     
     try:
-        milestone_ids = contract.functions.getProjectMilestones(project_id).call()
-        milestones = []
-        
-        for milestone_id in milestone_ids:
-            milestone = contract.functions.getMilestone(milestone_id).call()
-            milestones.append({
-                "id": milestone[0],
-                "projectId": milestone[1],
-                "tenderId": milestone[2],
-                "percentageComplete": milestone[3],
-                "targetAmount": milestone[4],
-                "spentAmount": milestone[5],
-                "status": milestone[6],
-                "submittedAt": milestone[7],
-                "approvedAt": milestone[8]
-            })
-        
+        milestones = read_milestones(contract, project_id)
         return jsonify({"milestones": milestones, "total": len(milestones)})
+    except ChainUnavailableError:
+        raise
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
 @app.route('/api/stats')
+@conditional(chain_version)
+@last_good.fallback
 def get_stats():
     contract = get_contract()
     if not contract:
@@ -233,32 +367,98 @@ def get_stats():
         })
     
     try:
-        project_count = contract.functions.projectCount().call()
+        (version, (project_count, projects)), age = cached_scan(contract, 'get_stats')
         total_budget = 0
         allocated = 0
         spent = 0
         active = 0
         
-        for i in range(1, project_count + 1):
+        for project in projects:
             try:
-                project = contract.functions.getProject(i).call()
-                total_budget += project[4]  # budget
-                allocated += project[5]  # allocatedFunds
-                spent += project[6]  # spentFunds
-                if project[8] == 1:  # InProgress status
+                total_budget += project["budget"]
+                allocated += project["allocatedFunds"]
+                spent += project["spentFunds"]
+                if project["status"] == 1:  # InProgress status
                     active += 1
-            except:
+            except Exception:
                 continue
         
-        return jsonify({
+        return aggregate_response({
             "totalBudget": total_budget,
             "allocatedFunds": allocated,
             "spentFunds": spent,
             "projectCount": project_count,
             "activeProjects": active
-        })
+        }, version, age)
+    except ChainUnavailableError:
+        raise
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+# Full audit exports, streamed straight from the chain: (count getter, item getter, row builder, CSV columns)
+EXPORTS = {
+    "projects": ("projectCount", "getProject", project_to_dict,
+                 ["id", "name", "description", "location", "budget", "allocatedFunds", "spentFunds",
+                  "admin", "status", "createdAt"]),
+    "tenders": ("tenderCount", "getTender", tender_to_dict,
+                ["id", "projectId", "contractorCommitment", "encryptedDataIPFS", "tenderDocIPFS",
+                 "qualityReportIPFS", "status", "submittedAt"]),
+    "milestones": ("milestoneCount", "getMilestone", milestone_to_dict,
+                   ["id", "projectId", "tenderId", "percentageComplete", "targetAmount", "spentAmount",
+                    "status", "submittedAt", "approvedAt"])
+}
+
+@app.route('/api/export/<entity>')
+def export_entity(entity):
+    """
+    Stream every project / tender / milestone as NDJSON (default) or ?format=csv
+    Rows are read one contract call at a time; ?cursor=<last _cursor> resumes
+    An unreadable item becomes a row with _error; if the node goes away the
+    stream ends with an _error row whose _cursor resumes at the failed item
+    """
+    if entity not in EXPORTS:
+        return jsonify({"error": f"Unknown export: {entity}", "available": list(EXPORTS)}), 404
+    contract = get_contract()
+    if not contract:
+        return jsonify({"error": "Contract not deployed"}), 500
+    
+    count_getter, item_getter, to_dict, columns = EXPORTS[entity]
+    try:
+        encoder = RowEncoder(request.args.get('format', 'ndjson'), columns + [ERROR_FIELD])
+        after = decode_cursor(request.args['cursor'], entity) if request.args.get('cursor') else 0
+        if not isinstance(after, int) or isinstance(after, bool) or after < 0:
+            raise ValueError("Invalid cursor: not an item id")
+        # Snapshot the count so the export has a fixed end even while new items are added
+        total = contract.call(count_getter)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    except ChainUnavailableError as e:
+        # Exports are too large to remember; the client retries with its cursor
+        return unavailable_response(e)
     except Exception as e:
         return jsonify({"error": str(e)}), 500
+    
+    def rows():
+        for item_id in range(after + 1, total + 1):
+            try:
+                row = to_dict(contract.call(item_getter, item_id))
+            except ChainUnavailableError as e:
+                # A 200 is already on the wire; mark the body incomplete instead of just stopping
+                yield {CURSOR_FIELD: encode_cursor(entity, item_id - 1), ERROR_FIELD: f"Export interrupted: {e}"}
+                return
+            except Exception as e:
+                row = {"id": item_id, ERROR_FIELD: f"Unreadable item: {e}"}
+            row[CURSOR_FIELD] = encode_cursor(entity, item_id)
+            yield row
+    
+    return Response(
+        export_chunks(rows(), encoder),
+        mimetype=encoder.mimetype,
+        headers={
+            "Content-Disposition": f'attachment; filename="{entity}.{encoder.format}"',
+            "X-Export-Total": str(total)
+        }
+    )
 
 if __name__ == '__main__':
     print("\n" + "="*50)
@@ -266,7 +466,8 @@ if __name__ == '__main__':
     print("="*50)
     print(f"RPC URL: {RPC_URL}")
     print(f"Blockchain Connected: {w3.is_connected()}")
-    print(f"Contract Address: {CONTRACT_ADDRESS if CONTRACT_ADDRESS else 'Not deployed yet'}")
+    contract = get_contract()
+    print(f"Contract Address: {contract.address if contract else 'Not deployed yet'}")
     print("\nUser Accounts:")
     print("  Admin:      admin / admin123")
     print("  Supervisor: supervisor / super123")
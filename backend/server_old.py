@@ -7,6 +7,15 @@ from datetime import datetime
 from dotenv import load_dotenv
 from pathlib import Path
 
+from bson import ObjectId
+from bson.errors import InvalidId
+from export_stream import CURSOR_FIELD, RowEncoder, decode_cursor, encode_cursor, export_chunks_async
+from fastapi.responses import StreamingResponse
+from mongo_indexes import ensure_indexes, time_range_query
+from mongo_serialization import FastJSONResponse
+from pymongo import UpdateOne
+from receipt_verifier import ReceiptVerifier, normalize_tx_hash
+
 ROOT_DIR = Path(__file__).parent
 load_dotenv(ROOT_DIR / '.env')
 
@@ -273,6 +282,9 @@ class ExpenditureCreate(BaseModel):
     recipient: str
     tx_hash: str
 
+class BulkVerifyRequest(BaseModel):
+    tx_hashes: List[str]
+
 class Transaction(BaseModel):
     model_config = ConfigDict(extra="ignore")
     id: str = Field(default_factory=lambda: str(uuid.uuid4()))
@@ -284,6 +296,15 @@ class Transaction(BaseModel):
     block_number: Optional[int] = None
     verified: bool = False
 
+# Bulk receipt verification (JSON-RPC batched, finalized receipts cached)
+MAX_BULK_VERIFY = 1000
+receipt_verifier = ReceiptVerifier(
+    POLYGON_RPC,
+    batch_size=int(os.environ.get('VERIFY_BATCH_SIZE', 50)),
+    max_concurrency=int(os.environ.get('VERIFY_MAX_CONCURRENCY', 4)),
+    confirmations=int(os.environ.get('VERIFY_CONFIRMATIONS', 12))
+)
+
 # API Routes
 @api_router.get("/")
 async def root():
@@ -310,22 +331,18 @@ async def create_project(input: ProjectCreate):
     project_obj = Project(**project_dict)
     
     doc = project_obj.model_dump()
-    doc['created_at'] = doc['created_at'].isoformat()
-    if doc.get('completion_date'):
-        doc['completion_date'] = doc['completion_date'].isoformat()
     
     await db.projects.insert_one(doc)
     
     # Record transaction
     if input.tx_hash:
         tx_record = Transaction(
-            tx_hash=input.tx_hash,
+            tx_hash=normalize_tx_hash(input.tx_hash),
             type="project_create",
             project_id=project_obj.id,
             details={"name": input.name, "budget": input.budget, "category": input.category}
         )
         tx_doc = tx_record.model_dump()
-        tx_doc['timestamp'] = tx_doc['timestamp'].isoformat()
         await db.transactions.insert_one(tx_doc)
     
     return project_obj
@@ -333,19 +350,14 @@ async def create_project(input: ProjectCreate):
 @api_router.get("/projects", response_model=List[Project])
 async def get_projects():
     projects = await db.projects.find({}, {"_id": 0}).to_list(1000)
-    for project in projects:
-        if isinstance(project['created_at'], str):
-            project['created_at'] = datetime.fromisoformat(project['created_at'])
-    return projects
+    return FastJSONResponse(projects)
 
 @api_router.get("/projects/{project_id}", response_model=Project)
 async def get_project(project_id: str):
     project = await db.projects.find_one({"id": project_id}, {"_id": 0})
     if not project:
         raise HTTPException(status_code=404, detail="Project not found")
-    if isinstance(project['created_at'], str):
-        project['created_at'] = datetime.fromisoformat(project['created_at'])
-    return project
+    return FastJSONResponse(project)
 
 # Fund Allocation endpoints
 @api_router.post("/allocations", response_model=FundAllocation)
@@ -359,7 +371,6 @@ async def allocate_funds(input: FundAllocationCreate):
     allocation_obj = FundAllocation(**allocation_dict)
     
     doc = allocation_obj.model_dump()
-    doc['timestamp'] = doc['timestamp'].isoformat()
     
     await db.fund_allocations.insert_one(doc)
     
@@ -371,13 +382,12 @@ async def allocate_funds(input: FundAllocationCreate):
     
     # Record transaction
     tx_record = Transaction(
-        tx_hash=input.tx_hash,
+        tx_hash=normalize_tx_hash(input.tx_hash),
         type="fund_allocation",
         project_id=input.project_id,
         details={"amount": input.amount, "purpose": input.purpose}
     )
     tx_doc = tx_record.model_dump()
-    tx_doc['timestamp'] = tx_doc['timestamp'].isoformat()
     await db.transactions.insert_one(tx_doc)
     
     return allocation_obj
@@ -385,10 +395,7 @@ async def allocate_funds(input: FundAllocationCreate):
 @api_router.get("/allocations/{project_id}", response_model=List[FundAllocation])
 async def get_project_allocations(project_id: str):
     allocations = await db.fund_allocations.find({"project_id": project_id}, {"_id": 0}).to_list(1000)
-    for alloc in allocations:
-        if isinstance(alloc['timestamp'], str):
-            alloc['timestamp'] = datetime.fromisoformat(alloc['timestamp'])
-    return allocations
+    return FastJSONResponse(allocations)
 
 # Milestone endpoints
 @api_router.post("/milestones", response_model=Milestone)
@@ -402,22 +409,18 @@ async def create_milestone(input: MilestoneCreate):
     milestone_obj = Milestone(**milestone_dict)
     
     doc = milestone_obj.model_dump()
-    doc['created_at'] = doc['created_at'].isoformat()
-    if doc.get('completion_date'):
-        doc['completion_date'] = doc['completion_date'].isoformat()
     
     await db.milestones.insert_one(doc)
     
     # Record transaction
     if input.tx_hash:
         tx_record = Transaction(
-            tx_hash=input.tx_hash,
+            tx_hash=normalize_tx_hash(input.tx_hash),
             type="milestone_create",
             project_id=input.project_id,
             details={"milestone_name": input.name, "target_amount": input.target_amount}
         )
         tx_doc = tx_record.model_dump()
-        tx_doc['timestamp'] = tx_doc['timestamp'].isoformat()
         await db.transactions.insert_one(tx_doc)
     
     return milestone_obj
@@ -425,12 +428,7 @@ async def create_milestone(input: MilestoneCreate):
 @api_router.get("/milestones/{project_id}", response_model=List[Milestone])
 async def get_project_milestones(project_id: str):
     milestones = await db.milestones.find({"project_id": project_id}, {"_id": 0}).to_list(1000)
-    for milestone in milestones:
-        if isinstance(milestone['created_at'], str):
-            milestone['created_at'] = datetime.fromisoformat(milestone['created_at'])
-        if milestone.get('completion_date') and isinstance(milestone['completion_date'], str):
-            milestone['completion_date'] = datetime.fromisoformat(milestone['completion_date'])
-    return milestones
+    return FastJSONResponse(milestones)
 
 @api_router.put("/milestones/{milestone_id}", response_model=Milestone)
 async def update_milestone(milestone_id: str, input: MilestoneUpdate):
@@ -441,7 +439,7 @@ async def update_milestone(milestone_id: str, input: MilestoneUpdate):
     update_data = {k: v for k, v in input.model_dump().items() if v is not None}
     
     if "status" in update_data and update_data["status"] == "Completed":
-        update_data["completion_date"] = datetime.now(timezone.utc).isoformat()
+        update_data["completion_date"] = datetime.now(timezone.utc)
     
     await db.milestones.update_one({"id": milestone_id}, {"$set": update_data})
     
@@ -458,12 +456,7 @@ async def update_milestone(milestone_id: str, input: MilestoneUpdate):
             )
     
     updated_milestone = await db.milestones.find_one({"id": milestone_id}, {"_id": 0})
-    if isinstance(updated_milestone['created_at'], str):
-        updated_milestone['created_at'] = datetime.fromisoformat(updated_milestone['created_at'])
-    if updated_milestone.get('completion_date') and isinstance(updated_milestone['completion_date'], str):
-        updated_milestone['completion_date'] = datetime.fromisoformat(updated_milestone['completion_date'])
-    
-    return updated_milestone
+    return FastJSONResponse(updated_milestone)
 
 # Expenditure endpoints
 @api_router.post("/expenditures", response_model=Expenditure)
@@ -477,7 +470,6 @@ async def create_expenditure(input: ExpenditureCreate):
     expenditure_obj = Expenditure(**expenditure_dict)
     
     doc = expenditure_obj.model_dump()
-    doc['timestamp'] = doc['timestamp'].isoformat()
     
     await db.expenditures.insert_one(doc)
     
@@ -496,7 +488,7 @@ async def create_expenditure(input: ExpenditureCreate):
     
     # Record transaction
     tx_record = Transaction(
-        tx_hash=input.tx_hash,
+        tx_hash=normalize_tx_hash(input.tx_hash),
         type="expenditure",
         project_id=input.project_id,
         details={
@@ -507,7 +499,6 @@ async def create_expenditure(input: ExpenditureCreate):
         }
     )
     tx_doc = tx_record.model_dump()
-    tx_doc['timestamp'] = tx_doc['timestamp'].isoformat()
     await db.transactions.insert_one(tx_doc)
     
     return expenditure_obj
@@ -515,46 +506,116 @@ async def create_expenditure(input: ExpenditureCreate):
 @api_router.get("/expenditures/{project_id}", response_model=List[Expenditure])
 async def get_project_expenditures(project_id: str):
     expenditures = await db.expenditures.find({"project_id": project_id}, {"_id": 0}).to_list(1000)
-    for exp in expenditures:
-        if isinstance(exp['timestamp'], str):
-            exp['timestamp'] = datetime.fromisoformat(exp['timestamp'])
-    return expenditures
+    return FastJSONResponse(expenditures)
 
 # Transaction endpoints
 @api_router.get("/transactions", response_model=List[Transaction])
-async def get_all_transactions():
-    transactions = await db.transactions.find({}, {"_id": 0}).sort("timestamp", -1).to_list(1000)
-    for tx in transactions:
-        if isinstance(tx['timestamp'], str):
-            tx['timestamp'] = datetime.fromisoformat(tx['timestamp'])
-    return transactions
+async def get_all_transactions(
+    type: Optional[str] = None,
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None
+):
+    query = time_range_query({"type": type} if type else {}, since, until)
+    transactions = await db.transactions.find(query, {"_id": 0}).sort("timestamp", -1).to_list(1000)
+    return FastJSONResponse(transactions)
 
 @api_router.get("/transactions/{project_id}", response_model=List[Transaction])
-async def get_project_transactions(project_id: str):
-    transactions = await db.transactions.find({"project_id": project_id}, {"_id": 0}).sort("timestamp", -1).to_list(1000)
-    for tx in transactions:
-        if isinstance(tx['timestamp'], str):
-            tx['timestamp'] = datetime.fromisoformat(tx['timestamp'])
-    return transactions
+async def get_project_transactions(
+    project_id: str,
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None
+):
+    query = time_range_query({"project_id": project_id}, since, until)
+    transactions = await db.transactions.find(query, {"_id": 0}).sort("timestamp", -1).to_list(1000)
+    return FastJSONResponse(transactions)
+
+# Audit exports: every document, streamed from a cursor in _id order
+EXPORT_BATCH_SIZE = 1000
+
+EXPORT_MODELS = {
+    "projects": Project,
+    "fund_allocations": FundAllocation,
+    "milestones": Milestone,
+    "expenditures": Expenditure,
+    "transactions": Transaction
+}
+
+@api_router.get("/export/{collection}")
+async def export_collection(collection: str, format: str = "ndjson", cursor: Optional[str] = None):
+    """
+    Stream a whole collection as NDJSON (default) or CSV with constant memory
+    Each row carries a _cursor; ?cursor=<last _cursor> resumes after that row
+    """
+    model = EXPORT_MODELS.get(collection)
+    if model is None:
+        raise HTTPException(status_code=404, detail=f"Unknown export: {collection}")
+    try:
+        encoder = RowEncoder(format, list(model.model_fields))
+        query = {"_id": {"$gt": ObjectId(decode_cursor(cursor, collection))}} if cursor else {}
+    except (ValueError, TypeError, InvalidId) as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    async def rows():
+        documents = db[collection].find(query).sort("_id", 1).batch_size(EXPORT_BATCH_SIZE)
+        async for doc in documents:
+            doc[CURSOR_FIELD] = encode_cursor(collection, str(doc.pop('_id')))
+            yield doc
+    
+    return StreamingResponse(
+        export_chunks_async(rows(), encoder),
+        media_type=encoder.mimetype,
+        headers={"Content-Disposition": f'attachment; filename="{collection}.{encoder.format}"'}
+    )
 
 @api_router.get("/verify/{tx_hash}")
 async def verify_transaction(tx_hash: str):
-    try:
-        tx = w3.eth.get_transaction(tx_hash)
-        receipt = w3.eth.get_transaction_receipt(tx_hash)
-        
-        return {
-            "verified": True,
-            "tx_hash": tx_hash,
-            "block_number": receipt['blockNumber'],
-            "from": receipt['from'],
-            "to": receipt['to'],
-            "status": receipt['status'],
-            "gas_used": receipt['gasUsed'],
-            "explorer_url": f"https://mumbai.polygonscan.com/tx/{tx_hash}"
-        }
-    except Exception as e:
-        raise HTTPException(status_code=404, detail=f"Transaction not found: {str(e)}")
+    result = await receipt_verifier.verify(tx_hash)
+    if result['state'] == 'failed':
+        raise HTTPException(status_code=404, detail=f"Transaction not found: {result.get('error', 'no receipt status')}")
+    if result['verified']:
+        await store_verification_results([result], {result['tx_hash']: [tx_hash.strip()]})
+    return result
+
+@api_router.post("/verify/batch")
+async def verify_transactions_batch(input: BulkVerifyRequest):
+    if len(input.tx_hashes) > MAX_BULK_VERIFY:
+        raise HTTPException(status_code=400, detail=f"At most {MAX_BULK_VERIFY} hashes per request")
+    
+    results = await receipt_verifier.verify_many(input.tx_hashes)
+    verified = [r for r in results.values() if r['verified']]
+    spellings = {}
+    for raw in input.tx_hashes:
+        spellings.setdefault(normalize_tx_hash(raw), set()).add(raw.strip())
+    await store_verification_results(verified, spellings)
+    
+    states = [r['state'] for r in results.values()]
+    return {
+        "total": len(results),
+        "verified": len(verified),
+        "reverted": states.count('reverted'),
+        "pending": states.count('pending'),
+        "failed": states.count('failed'),
+        "results": list(results.values())
+    }
+
+async def store_verification_results(results, spellings=None):
+    """
+    Persist verified flag and block number on the matching transaction records
+    Only successful, final receipts belong here: verified records are never re-checked
+    spellings: normalized hash -> hashes as the caller sent them, for records
+    stored before hashes were normalized
+    """
+    spellings = spellings or {}
+    ops = [
+        UpdateOne(
+            {"tx_hash": {"$in": sorted({r['tx_hash'], *spellings.get(r['tx_hash'], ())})},
+             "verified": {"$ne": True}},
+            {"$set": {"verified": True, "block_number": r['block_number']}}
+        )
+        for r in results if r['verified']
+    ]
+    if ops:
+        await db.transactions.bulk_write(ops, ordered=False)
 
 @api_router.get("/stats")
 async def get_stats():
@@ -621,6 +682,11 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+@app.on_event("startup")
+async def create_db_indexes():
+    await ensure_indexes(db)
+
 @app.on_event("shutdown")
 async def shutdown_db_client():
+    await receipt_verifier.close()
     client.close()
\ No newline at end of file
@@ -3,8 +3,23 @@ from flask_cors import CORS
 from datetime import datetime
 import os
 
+from compression import Compressor
+from conditional_get import VersionCounters, conditional
+from event_stream import EventBroker
+from json_provider import OrjsonProvider
+from metrics import Metrics
+from nearby_projects import (DEFAULT_LIMIT, DEFAULT_RADIUS_METERS, MAX_LIMIT,
+                             MAX_RADIUS_METERS, DatabaseBusyError, find_nearby_projects)
+from precomputed_bodies import load_fixtures, precompute
+from request_profiler import RequestProfiler
+from structured_log import get_logger
+
 app = Flask(__name__)
 CORS(app)
+app.json = OrjsonProvider(app)
+metrics = Metrics(app)
+profiler = RequestProfiler(app)
+compression = Compressor(app)
 
 # In-memory storage
 users = {
@@ -18,6 +33,28 @@ projects = {}
 tenders = {}
 supervisor_tenders = []  # Tenders pending supervisor approval
 
+# Bumped on every write; ETags for the polled read endpoints come from these
+versions = VersionCounters()
+
+# Push channel for supervisor / oracle dashboards (GET /api/events)
+events = EventBroker()
+
+# Reads polled by the dashboards are logged for a sample of requests only (LOG_SAMPLE overrides)
+log = get_logger('server_simple', sample={
+    'project.fetched': 0.1,
+    'milestones.fetched': 0.1,
+    'expenditures.fetched': 0.1,
+    'tenders.pending_checked': 0.1
+})
+
+# Static demo fixtures (DEMO_FIXTURES or demo_fixtures.json), encoded once at startup
+demo_fixtures = load_fixtures()
+demo_bodies = precompute({
+    'projects': demo_fixtures['projects'],
+    'transactions': demo_fixtures['transactions'],
+    'verifications': {'verifications': demo_fixtures['verifications']}
+})
+
 @app.route('/')
 def home():
     return jsonify({
@@ -71,15 +108,14 @@ def register_contractor():
         
     try:
         data = request.json
-        print(f"\n📝 Registering contractor: {data.get('company_name')}")
-        print(f"   Received data keys: {list(data.keys())}")
+        log.debug('contractor.register_requested', company_name=data.get('company_name'), keys=list(data))
         
         # Validate required fields
         required = ['blockchain_id', 'company_name', 'email', 'username', 'password']
         missing = [f for f in required if not data.get(f)]
         if missing:
             error_msg = f'Missing required fields: {", ".join(missing)}'
-            print(f"   ❌ Validation failed: {error_msg}")
+            log.info('contractor.register_invalid', missing=missing)
             return jsonify({'error': error_msg}), 400
         
         # Check if blockchain ID already exists
@@ -118,6 +154,7 @@ def register_contractor():
         }
         
         contractors[data['blockchain_id']] = contractor_data
+        versions.bump('contractors')
         
         # Also add to users dict for login
         users[data['username']] = {
@@ -128,10 +165,8 @@ def register_contractor():
             'company_name': data['company_name']
         }
         
-        print(f"✅ Contractor registered successfully!")
-        print(f"   Company: {data['company_name']}")
-        print(f"   Blockchain ID: {data['blockchain_id']}")
-        print(f"   Username: {data['username']}")
+        log.info('contractor.registered', company_name=data['company_name'],
+                 blockchain_id=data['blockchain_id'], username=data['username'])
         
         return jsonify({
             'success': True,
@@ -141,9 +176,7 @@ def register_contractor():
         }), 201
         
     except Exception as e:
-        print(f"❌ Error registering contractor: {e}")
-        import traceback
-        traceback.print_exc()
+        log.exception('contractor.register_failed', error=str(e))
         return jsonify({'error': str(e)}), 500
 
 @app.route('/api/contractors/<blockchain_id>', methods=['GET'])
@@ -168,49 +201,12 @@ def list_contractors():
     return jsonify(contractor_list)
 
 @app.route('/api/projects', methods=['GET'])
+@conditional(lambda: versions.tag('projects'))
 def get_projects():
     """Get all projects"""
     # Return demo projects if none exist
     if not projects:
-        demo_projects = [
-            {
-                'id': 'demo-1',
-                'name': 'Road Construction - Main Street',
-                'description': 'Repair and upgrade main street infrastructure',
-                'budget': 500000,
-                'allocated': 500000,
-                'spent': 250000,
-                'status': 'In Progress',
-                'location': 'Downtown',
-                'created_at': '2025-10-01',
-                'tx_hash': '0xdemo1234567890abcdef'
-            },
-            {
-                'id': 'demo-2',
-                'name': 'School Building Renovation',
-                'description': 'Renovate and modernize school facilities',
-                'budget': 750000,
-                'allocated': 600000,
-                'spent': 150000,
-                'status': 'Planning',
-                'location': 'East District',
-                'created_at': '2025-10-15',
-                'tx_hash': '0xdemo2234567890abcdef'
-            },
-            {
-                'id': 'demo-3',
-                'name': 'Water Supply Upgrade',
-                'description': 'Upgrade water supply infrastructure',
-                'budget': 1000000,
-                'allocated': 1000000,
-                'spent': 800000,
-                'status': 'Completed',
-                'location': 'West Zone',
-                'created_at': '2025-09-10',
-                'tx_hash': '0xdemo3234567890abcdef'
-            }
-        ]
-        return jsonify(demo_projects)
+        return demo_bodies['projects'].response()
     return jsonify(list(projects.values()))
 
 @app.route('/api/projects', methods=['POST'])
@@ -251,10 +247,10 @@ def create_project():
     }
     
     projects[project_id] = project
+    versions.bump('projects')
     
-    print(f"✅ Project created: {project_id} - {project['name']}")
-    print(f"   Status: {project['status']}")
-    print(f"   Documents: {len(project['tender_documents'])} tender docs, {len(project['design_files'])} design files")
+    log.info('project.created', project_id=project_id, name=project['name'], status=project['status'],
+             tender_documents=len(project['tender_documents']), design_files=len(project['design_files']))
     
     return jsonify({
         'success': True,
@@ -295,10 +291,10 @@ def submit_tender_to_supervisor():
     }
     
     supervisor_tenders.append(tender)
+    events.publish('tender.submitted', tender)
     
-    print(f"✅ Tender submitted to supervisor: {tender_id}")
-    print(f"   Project: {tender['project_name']}")
-    print(f"   Documents: {len(tender['tender_documents'])} PDFs")
+    log.info('tender.submitted', tender_id=tender_id, project_name=tender['project_name'],
+             tender_documents=len(tender['tender_documents']))
     
     return jsonify({
         'success': True,
@@ -307,6 +303,7 @@ def submit_tender_to_supervisor():
     }), 201
 
 @app.route('/api/stats', methods=['GET'])
+@conditional(lambda: versions.tag('projects', 'contractors'))
 def get_stats():
     """Get dashboard statistics"""
     # Calculate stats from projects
@@ -330,143 +327,7 @@ def get_stats():
 @app.route('/api/transactions', methods=['GET'])
 def get_transactions():
     """Get all blockchain transactions"""
-    demo_transactions = [
-        {
-            'id': 'tx-1',
-            'type': 'project_create',
-            'tx_hash': '0xa1b2c3d4e5f6789012345678901234567890abcd',
-            'timestamp': '2025-01-15T10:30:00Z',
-            'block_number': 12345678,
-            'status': 'confirmed',
-            'details': {
-                'project_name': 'Road Construction',
-                'budget': 500000,
-                'created_by': 'Admin'
-            }
-        },
-        {
-            'id': 'tx-2',
-            'type': 'fund_allocation',
-            'tx_hash': '0xb2c3d4e5f6789012345678901234567890abcdef',
-            'timestamp': '2025-01-16T14:20:00Z',
-            'block_number': 12345890,
-            'status': 'confirmed',
-            'details': {
-                'project_name': 'Road Construction',
-                'amount': 250000,
-                'allocated_by': 'Supervisor'
-            }
-        },
-        {
-            'id': 'tx-3',
-            'type': 'expenditure',
-            'tx_hash': '0xc3d4e5f6789012345678901234567890abcdef01',
-            'timestamp': '2025-01-17T09:15:00Z',
-            'block_number': 12346012,
-            'status': 'confirmed',
-            'details': {
-                'project_name': 'Road Construction',
-                'amount': 150000,
-                'contractor': 'ABC Contractors',
-                'description': 'Material procurement'
-            }
-        },
-        {
-            'id': 'tx-4',
-            'type': 'project_create',
-            'tx_hash': '0xd4e5f6789012345678901234567890abcdef0123',
-            'timestamp': '2025-01-18T11:00:00Z',
-            'block_number': 12346234,
-            'status': 'confirmed',
-            'details': {
-                'project_name': 'School Building',
-                'budget': 750000,
-                'created_by': 'Admin'
-            }
-        },
-        {
-            'id': 'tx-5',
-            'type': 'milestone_create',
-            'tx_hash': '0xe5f6789012345678901234567890abcdef012345',
-            'timestamp': '2025-01-19T16:30:00Z',
-            'block_number': 12346456,
-            'status': 'confirmed',
-            'details': {
-                'project_name': 'Road Construction',
-                'milestone': 'Foundation Complete',
-                'target_amount': 100000
-            }
-        },
-        {
-            'id': 'tx-6',
-            'type': 'fund_allocation',
-            'tx_hash': '0xf6789012345678901234567890abcdef01234567',
-            'timestamp': '2025-01-20T10:45:00Z',
-            'block_number': 12346678,
-            'status': 'confirmed',
-            'details': {
-                'project_name': 'School Building',
-                'amount': 300000,
-                'allocated_by': 'Supervisor'
-            }
-        },
-        {
-            'id': 'tx-7',
-            'type': 'expenditure',
-            'tx_hash': '0x0789012345678901234567890abcdef012345678',
-            'timestamp': '2025-01-21T13:20:00Z',
-            'block_number': 12346890,
-            'status': 'confirmed',
-            'details': {
-                'project_name': 'Water Supply Upgrade',
-                'amount': 500000,
-                'contractor': 'XYZ Infrastructure',
-                'description': 'Pipeline installation'
-            }
-        },
-        {
-            'id': 'tx-8',
-            'type': 'project_create',
-            'tx_hash': '0x189012345678901234567890abcdef0123456789',
-            'timestamp': '2025-01-22T09:00:00Z',
-            'block_number': 12347012,
-            'status': 'confirmed',
-            'details': {
-                'project_name': 'Water Supply Upgrade',
-                'budget': 1000000,
-                'created_by': 'Admin'
-            }
-        },
-        {
-            'id': 'tx-9',
-            'type': 'expenditure',
-            'tx_hash': '0x29012345678901234567890abcdef01234567890',
-            'timestamp': '2025-01-23T15:10:00Z',
-            'block_number': 12347234,
-            'status': 'confirmed',
-            'details': {
-                'project_name': 'Road Construction',
-                'amount': 100000,
-                'contractor': 'ABC Contractors',
-                'description': 'Labor costs'
-            }
-        },
-        {
-            'id': 'tx-10',
-            'type': 'milestone_create',
-            'tx_hash': '0x3a012345678901234567890abcdef012345678901',
-            'timestamp': '2025-01-24T11:30:00Z',
-            'block_number': 12347456,
-            'status': 'pending',
-            'details': {
-                'project_name': 'School Building',
-                'milestone': 'Ground Floor Complete',
-                'target_amount': 200000
-            }
-        }
-    ]
-    
-    return jsonify(demo_transactions)
+    return demo_bodies['transactions'].response()
 
 # ============================================
 # SUPERVISOR ENDPOINTS
@@ -479,9 +340,7 @@ def get_pending_tenders():
     # Filter only pending tenders
     pending = [t for t in supervisor_tenders if t['status'] == 'pending']
     
-    print(f"📋 Supervisor checking pending tenders: {len(pending)} found")
-    for tender in pending:
-        print(f"   - {tender['id']}: {tender['project_name']} ({len(tender.get('tender_documents', []))} docs)")
+    log.info('tenders.pending_checked', pending=len(pending))
     
     # If no real tenders, return demo data for testing
     if not pending:
@@ -522,23 +381,27 @@ def approve_tender():
     tender_id = data.get('tender_id')
     project_id = data.get('project_id')
     
-    print(f"=== Approving Tender ===")
-    print(f"Project ID: {project_id}")
-    print(f"Tender ID: {tender_id}")
-    
     # Update tender status
     for tender in supervisor_tenders:
         if tender['id'] == tender_id:
             tender['status'] = 'approved'
             tender['approved_at'] = datetime.now().isoformat()
             tender['approved_by'] = data.get('supervisor_address')
-            print(f"✅ Tender {tender_id} approved")
+            log.info('tender.approved', tender_id=tender_id, project_id=project_id,
+                     approved_by=tender['approved_by'])
+            events.publish('tender.approved', {
+                'tender_id': tender_id,
+                'project_id': project_id,
+                'approved_at': tender['approved_at'],
+                'approved_by': tender['approved_by']
+            })
             break
     
     # Update project status
     if project_id in projects:
         projects[project_id]['status'] = 'Approved'
         projects[project_id]['approved_at'] = datetime.now().isoformat()
+        versions.bump('projects')
     
     return jsonify({
         'success': True,
@@ -556,11 +419,6 @@ def reject_tender():
     project_id = data.get('project_id')
     reason = data.get('reason')
     
-    print(f"=== Rejecting Tender ===")
-    print(f"Project ID: {project_id}")
-    print(f"Tender ID: {tender_id}")
-    print(f"Reason: {reason}")
-    
     # Update tender status
     for tender in supervisor_tenders:
         if tender['id'] == tender_id:
@@ -568,7 +426,13 @@ def reject_tender():
             tender['rejected_at'] = datetime.now().isoformat()
             tender['rejected_by'] = data.get('supervisor_address')
             tender['rejection_reason'] = reason
-            print(f"❌ Tender {tender_id} rejected")
+            log.info('tender.rejected', tender_id=tender_id, project_id=project_id, reason=reason)
+            events.publish('tender.rejected', {
+                'tender_id': tender_id,
+                'project_id': project_id,
+                'rejected_at': tender['rejected_at'],
+                'rejection_reason': reason
+            })
             break
     
     # Update project status
@@ -576,6 +440,7 @@ def reject_tender():
         projects[project_id]['status'] = 'Rejected'
         projects[project_id]['rejected_at'] = datetime.now().isoformat()
         projects[project_id]['rejection_reason'] = reason
+        versions.bump('projects')
     # For demo, just return success
     
     return jsonify({
@@ -593,107 +458,44 @@ def reject_tender():
 def get_verifications():
     """Get all pending milestone verifications"""
     # Return demo verifications
-    demo_verifications = [
-        {
-            'id': 'verify-1',
-            'project_id': 'demo-1',
-            'project_name': 'Road Construction - Main Street',
-            'milestone_id': 'milestone-1',
-            'milestone_name': 'Foundation Complete',
-            'contractor_id': 'CNTR-12345',
-            'contractor_name': 'ABC Contractors',
-            'contractor_address': '0x742d35Cc6634C0532925a3b844Bc454e4438f44e',
-            'submitted_at': '2025-01-20T09:00:00Z',
-            'status': 'pending_verification',
-            'percentage_complete': 25,
-            'amount_requested': 125000,
-            'proof_documents': [
-                {
-                    'name': 'Foundation Photos.pdf',
-                    'url': '/uploads/milestone1-photos.pdf',
-                    'type': 'pdf'
-                },
-                {
-                    'name': 'Quality Report.pdf',
-                    'url': '/uploads/milestone1-quality.pdf',
-                    'type': 'pdf'
-                }
-            ],
-            'gps_coordinates': '40.7128° N, 74.0060° W',
-            'completion_proof': 'Foundation work completed as per specifications',
-            'submission_files': [
-                {
-                    'name': 'Foundation Photos.pdf',
-                    'url': '/uploads/milestone1-photos.pdf',
-                    'type': 'pdf'
-                },
-                {
-                    'name': 'Quality Report.pdf',
-                    'url': '/uploads/milestone1-quality.pdf',
-                    'type': 'pdf'
-                }
-            ]
-        },
-        {
-            'id': 'verify-2',
-            'project_id': 'demo-3',
-            'project_name': 'Water Supply Upgrade',
-            'milestone_id': 'milestone-3',
-            'milestone_name': 'Pipeline Installation Phase 1',
-            'contractor_id': 'CNTR-67890',
-            'contractor_name': 'XYZ Infrastructure',
-            'contractor_address': '0x8626f6940E2eb28930eFb4CeF49B2d1F2C9C1199',
-            'submitted_at': '2025-01-21T15:30:00Z',
-            'status': 'pending_verification',
-            'percentage_complete': 50,
-            'amount_requested': 500000,
-            'proof_documents': [
-                {
-                    'name': 'Installation Report.pdf',
-                    'url': '/uploads/milestone3-report.pdf',
-                    'type': 'pdf'
-                }
-            ],
-            'gps_coordinates': '40.7580° N, 73.9855° W',
-            'completion_proof': 'Phase 1 pipeline installation completed',
-            'submission_files': [
-                {
-                    'name': 'Installation Report.pdf',
-                    'url': '/uploads/milestone3-report.pdf',
-                    'type': 'pdf'
-                }
-            ]
-        }
-    ]
-    
-    return jsonify({'verifications': demo_verifications})
+    return demo_bodies['verifications'].response()
 
 @app.route('/api/oracle/verify', methods=['POST'])
 def verify_milestone():
     """Verify and approve/reject a milestone"""
     data = request.get_json()
     
-    print(f"=== Verifying Milestone ===")
-    print(f"Milestone ID: {data.get('milestone_id')}")
-    print(f"Verification ID: {data.get('verification_id')}")
-    print(f"Approved: {data.get('approved')}")
-    print(f"GPS Verified: {data.get('gps_verified')}")
-    print(f"Quality Verified: {data.get('quality_verified')}")
-    print(f"Progress Verified: {data.get('progress_verified')}")
+    log.info('milestone.verification', milestone_id=data.get('milestone_id'),
+             verification_id=data.get('verification_id'), approved=data.get('approved'),
+             gps_verified=data.get('gps_verified'), quality_verified=data.get('quality_verified'),
+             progress_verified=data.get('progress_verified'))
     
     # In a real app, update milestone status and release funds
     # For demo, just return success
     
     approved = data.get('approved', True)
+    verified_at = datetime.now().isoformat()
+    events.publish('milestone.verified' if approved else 'milestone.rejected', {
+        'milestone_id': data.get('milestone_id'),
+        'verification_id': data.get('verification_id'),
+        'approved': approved,
+        'verified_at': verified_at
+    })
     
     return jsonify({
         'success': True,
         'message': 'Milestone verified and funds released' if approved else 'Milestone verification rejected',
         'milestone_id': data.get('milestone_id'),
-        'verified_at': datetime.now().isoformat(),
+        'verified_at': verified_at,
         'funds_released': approved
     })
 
+@app.route('/api/events', methods=['GET'])
+def event_stream():
+    """Server-sent events for tender / milestone changes; ?types=tender,milestone filters"""
+    last_event_id = request.headers.get('Last-Event-ID') or request.args.get('last_event_id')
+    return events.response(last_event_id, request.args.get('types'))
+
 @app.route('/api/tenders/<project_id>', methods=['GET'])
 def get_tenders(project_id):
     """Get tenders for a project"""
@@ -702,10 +504,40 @@ def get_tenders(project_id):
 
 # ============ INDIVIDUAL PROJECT & DETAILS ENDPOINTS ============
 
+@app.route('/api/projects/nearby', methods=['GET'])
+def get_nearby_projects():
+    """Get projects near a pincode (PostGIS spatial lookup)"""
+    pincode = request.args.get('pincode', '')
+    if not (len(pincode) == 6 and pincode.isdigit()):
+        return jsonify({'error': 'pincode must be a 6-digit number'}), 400
+    
+    radius = request.args.get('radius', DEFAULT_RADIUS_METERS, type=int)
+    limit = request.args.get('limit', DEFAULT_LIMIT, type=int)
+    radius = max(1, min(radius, MAX_RADIUS_METERS))
+    limit = max(1, min(limit, MAX_LIMIT))
+    
+    try:
+        nearby = find_nearby_projects(pincode, radius, limit)
+    except DatabaseBusyError as e:
+        log.warning('projects.nearby_busy', pincode=pincode, error=str(e))
+        response = jsonify({'error': 'Spatial database busy, retry shortly'})
+        response.headers['Retry-After'] = '1'
+        return response, 503
+    except Exception as e:
+        log.error('projects.nearby_failed', pincode=pincode, error=str(e))
+        return jsonify({'error': 'Spatial database unavailable'}), 503
+    
+    return jsonify({
+        'pincode': pincode,
+        'radius_meters': radius,
+        'projects': nearby,
+        'total': len(nearby)
+    })
+
 @app.route('/api/projects/<project_id>', methods=['GET'])
 def get_project_by_id(project_id):
     """Get single project by ID"""
-    print(f"Fetching project: {project_id}")
+    log.info('project.fetched', project_id=project_id)
     
     # Check if project exists in our projects dictionary
     if project_id in projects:
@@ -735,9 +567,10 @@ def get_project_by_id(project_id):
     return jsonify(demo_project)
 
 @app.route('/api/milestones/<project_id>', methods=['GET'])
+@conditional(lambda: versions.tag('milestones'))  # Demo milestones never change
 def get_milestones(project_id):
     """Get milestones for a project with contractor uploaded documents"""
-    print(f"Fetching milestones for project: {project_id}")
+    log.info('milestones.fetched', project_id=project_id)
     
     demo_milestones = [
         {
@@ -816,7 +649,7 @@ def get_milestones(project_id):
 @app.route('/api/expenditures/<project_id>', methods=['GET'])
 def get_expenditures(project_id):
     """Get expenditures for a project"""
-    print(f"Fetching expenditures for project: {project_id}")
+    log.info('expenditures.fetched', project_id=project_id)
     
     demo_expenditures = [
         {
@@ -898,7 +731,7 @@ def handle_suggestions():
         }
         
         suggestions[suggestion_id] = suggestion
-        print(f"✅ New suggestion saved: {suggestion_id}")
+        log.info('suggestion.saved', suggestion_id=suggestion_id, project_id=suggestion['project_id'])
         
         return jsonify({
             'success': True,
@@ -954,7 +787,7 @@ def save_opinion():
             'related_opinion_id': opinion_id
         }
     
-    print(f"✅ Opinion saved: {opinion_id}")
+    log.info('opinion.saved', opinion_id=opinion_id, project_id=opinion['project_id'])
     
     return jsonify({
         'success': True,
@@ -986,6 +819,7 @@ if __name__ == '__main__':
     print(f"   GET  /api/contractors/<id> - Get contractor details")
     print(f"   GET  /api/projects - List all projects")
     print(f"   POST /api/projects - ✨ Create new project")
+    print(f"   GET  /api/projects/nearby?pincode= - Projects near a pincode")
     print(f"   GET  /api/projects/<id> - Get single project details")
     print(f"   GET  /api/milestones/<id> - Get project milestones with docs")
     print(f"   GET  /api/expenditures/<id> - Get project expenditures")
@@ -994,6 +828,7 @@ if __name__ == '__main__':
     print(f"   GET  /api/supervisor/pending-tenders - ✨ View pending tenders")
     print(f"   POST /api/supervisor/approve-tender - ✨ Approve tender")
     print(f"   POST /api/supervisor/reject-tender - ✨ Reject tender")
+    print(f"   GET  /api/events - Live tender/milestone updates (SSE)")
     print(f"   POST /api/opinions - Submit citizen feedback")
     print(f"   GET/POST /api/suggestions - Citizen suggestions")
     print(f"\n👥 Demo Accounts:")
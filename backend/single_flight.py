@@ -0,0 +1,72 @@
+# Single-flight coalescing for identical concurrent reads
+# The first caller for a key runs the function; callers arriving while it is
+# in flight wait for it and get the same result (or the same exception). Once it
+# finishes the key is forgotten, so nothing is cached: a later call runs again.
+# Results are shared between threads and must be treated as read-only.
+
+import collections
+import functools
+import threading
+
+
+class _Flight:
+    __slots__ = ('done', 'result', 'error')
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """
+    do(key, fn, *args) runs fn once per key at a time
+    Keys are tuples whose first item names the group the counters are kept under
+    """
+
+    def __init__(self):
+        self._flights = {}
+        self._lock = threading.Lock()
+        self._stats = collections.defaultdict(collections.Counter)
+
+    def do(self, key, fn, *args, **kwargs):
+        group = key[0] if isinstance(key, tuple) else key
+        with self._lock:
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._flights[key] = _Flight()
+            self._stats[group]['executed' if leader else 'deduplicated'] += 1
+        if not leader:
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.result
+        try:
+            flight.result = fn(*args, **kwargs)
+        except BaseException as e:
+            flight.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._flights[key]
+            flight.done.set()
+        return flight.result
+
+    def coalesce(self, group):
+        """Decorator: calls with equal positional arguments share one execution"""
+        def decorator(fn):
+            @functools.wraps(fn)
+            def wrapper(*args):
+                return self.do((group,) + args, fn, *args)
+            return wrapper
+        return decorator
+
+    def stats(self):
+        with self._lock:
+            in_flight = collections.Counter(key[0] if isinstance(key, tuple) else key for key in self._flights)
+            return {
+                group: {"executed": counts['executed'], "deduplicated": counts['deduplicated'],
+                        "in_flight": in_flight[group]}
+                for group, counts in self._stats.items()
+            }
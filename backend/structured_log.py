@@ -0,0 +1,169 @@
+# Structured, non-blocking logging for the Flask servers
+# Request threads only build a LogRecord and put it on a bounded queue; one
+# listener thread formats (JSON lines or key=value text) and writes to stdout.
+# When the queue is full records are dropped and counted instead of blocking.
+#
+#   log = get_logger('server_simple', sample={'milestones.fetched': 0.1})
+#   log.info('tender.approved', project_id=project_id, tender_id=tender_id)
+#
+# Env: LOG_LEVEL (INFO), LOG_FORMAT (json | text; text on a terminal by default),
+#      LOG_SAMPLE ("event=rate,..." overrides the per-logger sample rates)
+
+import atexit
+import datetime
+import logging
+import logging.handlers
+import os
+import queue
+import random
+import sys
+import threading
+import traceback
+
+from json_provider import dumps_bytes
+
+QUEUE_SIZE = 10000
+
+_listener = None
+_handler = None
+_setup_lock = threading.Lock()
+
+
+def _parse_sample_rates(value):
+    rates = {}
+    for item in (value or '').split(','):
+        event, _, rate = item.partition('=')
+        if event.strip() and rate.strip():
+            rates[event.strip()] = min(max(float(rate), 0.0), 1.0)
+    return rates
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line: ts, level, logger, event, fields..., exc"""
+
+    def format(self, record):
+        entry = {
+            'ts': datetime.datetime.fromtimestamp(record.created, datetime.timezone.utc)
+                  .isoformat(timespec='milliseconds'),
+            'level': record.levelname.lower(),
+            'logger': record.name,
+            'event': record.getMessage(),
+        }
+        entry.update(getattr(record, 'fields', None) or {})
+        if record.exc_text:
+            entry['exc'] = record.exc_text
+        return dumps_bytes(entry).decode()
+
+
+class TextFormatter(logging.Formatter):
+    """Human-readable `time LEVEL event key=value ...` lines for local runs"""
+
+    def format(self, record):
+        fields = getattr(record, 'fields', None) or {}
+        line = f"{self.formatTime(record, '%H:%M:%S')} {record.levelname:<7} {record.getMessage()}"
+        if fields:
+            line += ' ' + ' '.join(f"{key}={value!r}" for key, value in fields.items())
+        if record.exc_text:
+            line += '\n' + record.exc_text
+        return line
+
+
+class DroppingQueueHandler(logging.handlers.QueueHandler):
+    """QueueHandler that never blocks the caller: a full queue drops the record"""
+
+    def __init__(self, log_queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def prepare(self, record):
+        # Formatting is the listener's job; only render the traceback here,
+        # while the exception is still alive
+        if record.exc_info:
+            record.exc_text = ''.join(traceback.format_exception(*record.exc_info)).rstrip()
+            record.exc_info = None
+        return record
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+def setup(level=None, fmt=None, stream=None):
+    """Install the queue handler on the root logger and start the listener (idempotent)"""
+    global _listener, _handler
+    with _setup_lock:
+        if _listener is not None:
+            return _handler
+        stream = stream or sys.stdout
+        fmt = fmt or os.environ.get('LOG_FORMAT') or ('text' if stream.isatty() else 'json')
+        output = logging.StreamHandler(stream)
+        output.setFormatter(TextFormatter() if fmt == 'text' else JsonFormatter())
+
+        _handler = DroppingQueueHandler(queue.Queue(QUEUE_SIZE))
+        root = logging.getLogger()
+        root.addHandler(_handler)
+        root.setLevel((level or os.environ.get('LOG_LEVEL', 'INFO')).upper())
+
+        _listener = logging.handlers.QueueListener(_handler.queue, output, respect_handler_level=True)
+        _listener.start()
+        atexit.register(shutdown)
+        return _handler
+
+
+def shutdown():
+    """Flush queued records and stop the listener"""
+    global _listener
+    with _setup_lock:
+        if _listener is not None:
+            _listener.stop()
+            _listener = None
+
+
+def dropped():
+    return _handler.dropped if _handler is not None else 0
+
+
+class StructuredLogger:
+    """
+    logging.Logger wrapper taking an event name plus keyword fields
+    Events in `sample` are kept with that probability (the kept records carry
+    sample_rate so counts can be scaled back up); warnings and errors are never sampled
+    """
+
+    def __init__(self, name, sample=None):
+        self.logger = logging.getLogger(name)
+        self.sample = dict(sample or {})
+        self.sample.update(_parse_sample_rates(os.environ.get('LOG_SAMPLE')))
+
+    def _log(self, level, event, fields, exc_info=False):
+        if not self.logger.isEnabledFor(level):
+            return
+        rate = self.sample.get(event) if level < logging.WARNING else None
+        if rate is not None:
+            if rate < 1.0 and random.random() >= rate:
+                return
+            fields['sample_rate'] = rate
+        self.logger.log(level, event, exc_info=exc_info, extra={'fields': fields}, stacklevel=3)
+
+    def debug(self, event, **fields):
+        self._log(logging.DEBUG, event, fields)
+
+    def info(self, event, **fields):
+        self._log(logging.INFO, event, fields)
+
+    def warning(self, event, **fields):
+        self._log(logging.WARNING, event, fields)
+
+    def error(self, event, **fields):
+        self._log(logging.ERROR, event, fields)
+
+    def exception(self, event, **fields):
+        """error() with the current exception's traceback"""
+        self._log(logging.ERROR, event, fields, exc_info=True)
+
+
+def get_logger(name, sample=None):
+    setup()
+    return StructuredLogger(name, sample)
@@ -0,0 +1,160 @@
+# Stale-while-revalidate cache for expensive aggregate reads
+# Each read passes a soft and a hard TTL. Younger than soft: served as is.
+# Between soft and hard: served immediately while one background refresh runs.
+# Older than hard, or missing: loaded in the request (concurrent misses share
+# one load). TTLs belong to the caller, so two endpoints sharing one entry can
+# tolerate different ages.
+#
+# A scheduler thread keeps hot entries (HOT_HITS reads since their last load)
+# from going stale at all: they are reloaded once REFRESH_AHEAD of their
+# shortest soft TTL has passed. Entries nobody read within their hard TTL are
+# dropped instead of refreshed.
+#
+# SWR_ENABLED=0 makes every get() call its loader (benchmarks of the reads themselves).
+
+import collections
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from single_flight import SingleFlight
+
+SWR_ENABLED = os.environ.get('SWR_ENABLED', '1') != '0'
+REFRESH_AHEAD = 0.8
+HOT_HITS = 3
+TICK_SECONDS = 0.5
+REFRESH_WORKERS = 2
+
+log = logging.getLogger(__name__)
+
+
+def ttl_from_env(name, soft, hard):
+    """(soft, hard) seconds, overridable as SWR_TTL_<NAME>="soft,hard\""""
+    value = os.environ.get(f'SWR_TTL_{name.upper()}')
+    if not value:
+        return soft, hard
+    soft, hard = (float(part) for part in value.split(','))
+    return soft, max(soft, hard)
+
+
+class _Entry:
+    __slots__ = ('value', 'loaded_at', 'loader', 'soft_ttl', 'hard_ttl', 'hits', 'last_hit', 'refreshing')
+
+    def __init__(self, value, loader, soft_ttl, hard_ttl, now):
+        self.value = value
+        self.loaded_at = now
+        self.loader = loader
+        self.soft_ttl = soft_ttl
+        self.hard_ttl = hard_ttl
+        self.hits = 0
+        self.last_hit = now
+        self.refreshing = False
+
+
+class SwrCache:
+    """get(key, loader, soft_ttl, hard_ttl) -> (value, age_seconds); keys are tuples, first item names the group"""
+
+    def __init__(self, tick=TICK_SECONDS, workers=REFRESH_WORKERS, enabled=SWR_ENABLED, clock=time.monotonic):
+        self.enabled = enabled
+        self.clock = clock
+        self.tick = tick
+        self.workers = workers
+        self._entries = {}
+        self._lock = threading.Lock()
+        self._flights = SingleFlight()
+        self._executor = None
+        self._scheduler = None
+        self._stats = collections.defaultdict(collections.Counter)
+
+    def _count(self, key, event):
+        self._stats[key[0] if isinstance(key, tuple) else key][event] += 1
+
+    def get(self, key, loader, soft_ttl, hard_ttl):
+        if not self.enabled:
+            return loader(), 0.0
+        now = self.clock()
+        entry = self._entries.get(key)
+        if entry is not None:
+            age = now - entry.loaded_at
+            if age < hard_ttl:
+                with self._lock:
+                    entry.hits += 1
+                    entry.last_hit = now
+                    entry.loader = loader
+                    # The scheduler refreshes ahead of the strictest reader
+                    entry.soft_ttl = min(entry.soft_ttl, soft_ttl)
+                    entry.hard_ttl = max(entry.hard_ttl, hard_ttl)
+                if age < soft_ttl:
+                    self._count(key, 'fresh')
+                else:
+                    self._count(key, 'stale')
+                    self._refresh(key, entry)
+                return entry.value, age
+        self._count(key, 'miss')
+        entry = self._flights.do(key, self._load, key, loader, soft_ttl, hard_ttl)
+        return entry.value, self.clock() - entry.loaded_at
+
+    def _load(self, key, loader, soft_ttl, hard_ttl):
+        """Runs under the key's flight for misses and refreshes alike, so every caller gets an _Entry"""
+        self._start()
+        entry = _Entry(loader(), loader, soft_ttl, hard_ttl, self.clock())
+        with self._lock:
+            self._entries[key] = entry
+        return entry
+
+    def _start(self):
+        if self._scheduler is not None and self._scheduler.is_alive():
+            return
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(self.workers, thread_name_prefix='swr-refresh')
+            if self._scheduler is None or not self._scheduler.is_alive():
+                self._scheduler = threading.Thread(target=self._schedule, name='swr-scheduler', daemon=True)
+                self._scheduler.start()
+
+    def _refresh(self, key, entry, proactive=False):
+        """Reload in the background unless a refresh of this entry is already running"""
+        with self._lock:
+            if entry.refreshing:
+                return
+            entry.refreshing = True
+        self._count(key, 'proactive_refresh' if proactive else 'refresh')
+        self._start()
+        self._executor.submit(self._run_refresh, key, entry)
+
+    def _run_refresh(self, key, entry):
+        try:
+            self._flights.do(key, self._load, key, entry.loader, entry.soft_ttl, entry.hard_ttl)
+        except Exception as e:
+            # Keep serving the old value; the next stale read or tick retries
+            self._count(key, 'refresh_error')
+            log.warning("Background refresh of %s failed: %s", key[0] if isinstance(key, tuple) else key, e)
+        finally:
+            with self._lock:
+                entry.refreshing = False
+
+    def _schedule(self):
+        while True:
+            time.sleep(self.tick)
+            self.refresh_due()
+
+    def refresh_due(self, now=None):
+        """One scheduler pass: drop unread entries, start refreshes of hot ones"""
+        now = self.clock() if now is None else now
+        with self._lock:
+            entries = list(self._entries.items())
+        for key, entry in entries:
+            if now - entry.last_hit > entry.hard_ttl:
+                with self._lock:
+                    if self._entries.get(key) is entry:
+                        del self._entries[key]
+                self._count(key, 'evicted')
+            elif entry.hits >= HOT_HITS and now - entry.loaded_at >= entry.soft_ttl * REFRESH_AHEAD:
+                self._refresh(key, entry, proactive=True)
+
+    def stats(self):
+        with self._lock:
+            entries = collections.Counter(key[0] if isinstance(key, tuple) else key for key in self._entries)
+            return {group: dict(counts, entries=entries[group]) for group, counts in self._stats.items()}
@@ -18,6 +18,7 @@ CREATE TABLE projects (
     location VARCHAR(255),
     pincode VARCHAR(6),
     geom GEOMETRY(Point, 4326),  -- GPS coordinates for spatial queries
+    geog GEOGRAPHY(Point, 4326) GENERATED ALWAYS AS (geom::geography) STORED,  -- metre-accurate distance queries
     admin_address VARCHAR(42),
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
     updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
@@ -26,6 +27,7 @@ CREATE TABLE projects (
 CREATE INDEX idx_projects_pincode ON projects(pincode);
 CREATE INDEX idx_projects_status ON projects(status);
 CREATE INDEX idx_projects_geom ON projects USING GIST(geom);
+CREATE INDEX idx_projects_geog ON projects USING GIST(geog);
 
 -- ==================== MILESTONES TABLE ====================
 CREATE TABLE milestones (
@@ -136,26 +138,185 @@ INSERT INTO citizen_opinions (project_id, opinion_text, rating, submitted_at) VA
 (1, 'Work is progressing slowly but quality seems good.', 3, NOW() - INTERVAL '3 days'),
 (1, 'Excellent transparency in fund usage. Very happy with this project!', 5, NOW() - INTERVAL '1 day');
 
+-- ==================== PROJECT SUMMARY (MATERIALIZED) ====================
+
+-- Per-project counters maintained incrementally by triggers.
+-- Joining milestones x tenders x opinions per project fans rows out
+-- multiplicatively, so the summary is kept as one row per project instead.
+CREATE TABLE project_summary_counts (
+    project_id INTEGER PRIMARY KEY REFERENCES projects(project_id) ON DELETE CASCADE,
+    project_name VARCHAR(255) NOT NULL,
+    budget NUMERIC(30, 0) NOT NULL,
+    status INTEGER NOT NULL,
+    location VARCHAR(255),
+    total_milestones INTEGER NOT NULL DEFAULT 0,
+    approved_milestones INTEGER NOT NULL DEFAULT 0,
+    total_tenders INTEGER NOT NULL DEFAULT 0,
+    total_opinions INTEGER NOT NULL DEFAULT 0,
+    rated_opinions INTEGER NOT NULL DEFAULT 0,  -- opinions with a non-NULL rating
+    rating_sum BIGINT NOT NULL DEFAULT 0
+);
+
+-- Full rebuild (backfill, or repair after bulk loads with triggers disabled)
+CREATE OR REPLACE FUNCTION refresh_project_summary()
+RETURNS VOID AS $$
+BEGIN
+    DELETE FROM project_summary_counts;
+    INSERT INTO project_summary_counts
+    SELECT
+        p.project_id,
+        p.project_name,
+        p.budget,
+        p.status,
+        p.location,
+        COALESCE(m.total, 0),
+        COALESCE(m.approved, 0),
+        COALESCE(t.total, 0),
+        COALESCE(co.total, 0),
+        COALESCE(co.rated, 0),
+        COALESCE(co.rating_sum, 0)
+    FROM projects p
+    LEFT JOIN (
+        SELECT project_id, COUNT(*) AS total,
+               COUNT(*) FILTER (WHERE status = 'Approved') AS approved
+        FROM milestones GROUP BY project_id
+    ) m ON m.project_id = p.project_id
+    LEFT JOIN (
+        SELECT project_id, COUNT(*) AS total FROM tenders GROUP BY project_id
+    ) t ON t.project_id = p.project_id
+    LEFT JOIN (
+        SELECT project_id, COUNT(*) AS total, COUNT(rating) AS rated, SUM(rating) AS rating_sum
+        FROM citizen_opinions GROUP BY project_id
+    ) co ON co.project_id = p.project_id;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION project_summary_projects_trg()
+RETURNS TRIGGER AS $$
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        INSERT INTO project_summary_counts (
+            project_id, project_name, budget, status, location,
+            total_milestones, approved_milestones, total_tenders,
+            total_opinions, rated_opinions, rating_sum
+        )
+        SELECT
+            NEW.project_id, NEW.project_name, NEW.budget, NEW.status, NEW.location,
+            (SELECT COUNT(*) FROM milestones WHERE project_id = NEW.project_id),
+            (SELECT COUNT(*) FROM milestones WHERE project_id = NEW.project_id AND status = 'Approved'),
+            (SELECT COUNT(*) FROM tenders WHERE project_id = NEW.project_id),
+            co.total, co.rated, COALESCE(co.rating_sum, 0)
+        FROM (
+            SELECT COUNT(*) AS total, COUNT(rating) AS rated, SUM(rating) AS rating_sum
+            FROM citizen_opinions WHERE project_id = NEW.project_id
+        ) co;
+    ELSE
+        UPDATE project_summary_counts SET
+            project_name = NEW.project_name,
+            budget = NEW.budget,
+            status = NEW.status,
+            location = NEW.location
+        WHERE project_id = NEW.project_id;
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION project_summary_milestones_trg()
+RETURNS TRIGGER AS $$
+BEGIN
+    IF TG_OP IN ('UPDATE', 'DELETE') THEN
+        UPDATE project_summary_counts SET
+            total_milestones = total_milestones - 1,
+            approved_milestones = approved_milestones - CASE WHEN OLD.status = 'Approved' THEN 1 ELSE 0 END
+        WHERE project_id = OLD.project_id;
+    END IF;
+    IF TG_OP IN ('INSERT', 'UPDATE') THEN
+        UPDATE project_summary_counts SET
+            total_milestones = total_milestones + 1,
+            approved_milestones = approved_milestones + CASE WHEN NEW.status = 'Approved' THEN 1 ELSE 0 END
+        WHERE project_id = NEW.project_id;
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION project_summary_tenders_trg()
+RETURNS TRIGGER AS $$
+BEGIN
+    IF TG_OP IN ('UPDATE', 'DELETE') THEN
+        UPDATE project_summary_counts SET total_tenders = total_tenders - 1
+        WHERE project_id = OLD.project_id;
+    END IF;
+    IF TG_OP IN ('INSERT', 'UPDATE') THEN
+        UPDATE project_summary_counts SET total_tenders = total_tenders + 1
+        WHERE project_id = NEW.project_id;
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION project_summary_opinions_trg()
+RETURNS TRIGGER AS $$
+BEGIN
+    IF TG_OP IN ('UPDATE', 'DELETE') THEN
+        UPDATE project_summary_counts SET
+            total_opinions = total_opinions - 1,
+            rated_opinions = rated_opinions - CASE WHEN OLD.rating IS NULL THEN 0 ELSE 1 END,
+            rating_sum = rating_sum - COALESCE(OLD.rating, 0)
+        WHERE project_id = OLD.project_id;
+    END IF;
+    IF TG_OP IN ('INSERT', 'UPDATE') THEN
+        UPDATE project_summary_counts SET
+            total_opinions = total_opinions + 1,
+            rated_opinions = rated_opinions + CASE WHEN NEW.rating IS NULL THEN 0 ELSE 1 END,
+            rating_sum = rating_sum + COALESCE(NEW.rating, 0)
+        WHERE project_id = NEW.project_id;
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER project_summary_projects
+    AFTER INSERT OR UPDATE OF project_name, budget, status, location ON projects
+    FOR EACH ROW
+    EXECUTE FUNCTION project_summary_projects_trg();
+
+CREATE TRIGGER project_summary_milestones
+    AFTER INSERT OR DELETE OR UPDATE OF project_id, status ON milestones
+    FOR EACH ROW
+    EXECUTE FUNCTION project_summary_milestones_trg();
+
+CREATE TRIGGER project_summary_tenders
+    AFTER INSERT OR DELETE OR UPDATE OF project_id ON tenders
+    FOR EACH ROW
+    EXECUTE FUNCTION project_summary_tenders_trg();
+
+-- Upvote updates do not touch the summary
+CREATE TRIGGER project_summary_opinions
+    AFTER INSERT OR DELETE OR UPDATE OF project_id, rating ON citizen_opinions
+    FOR EACH ROW
+    EXECUTE FUNCTION project_summary_opinions_trg();
+
+-- Backfill rows inserted above
+SELECT refresh_project_summary();
+
 -- ==================== VIEWS FOR ANALYTICS ====================
 
--- Project summary view
+-- Project summary view (single-table read of the maintained counters)
 CREATE VIEW project_summary AS
 SELECT 
-    p.project_id,
-    p.project_name,
-    p.budget,
-    p.status,
-    p.location,
-    COUNT(DISTINCT m.milestone_id) as total_milestones,
-    COUNT(DISTINCT CASE WHEN m.status = 'Approved' THEN m.milestone_id END) as approved_milestones,
-    COUNT(DISTINCT t.tender_id) as total_tenders,
-    COALESCE(AVG(co.rating), 0) as avg_rating,
-    COUNT(co.id) as total_opinions
-FROM projects p
-LEFT JOIN milestones m ON p.project_id = m.project_id
-LEFT JOIN tenders t ON p.project_id = t.project_id
-LEFT JOIN citizen_opinions co ON p.project_id = co.project_id
-GROUP BY p.project_id, p.project_name, p.budget, p.status, p.location;
+    project_id,
+    project_name,
+    budget,
+    status,
+    location,
+    total_milestones,
+    approved_milestones,
+    total_tenders,
+    COALESCE(rating_sum::NUMERIC / NULLIF(rated_opinions, 0), 0) as avg_rating,
+    total_opinions
+FROM project_summary_counts;
 
 -- Milestone progress view
 CREATE VIEW milestone_progress AS
@@ -175,9 +336,12 @@ ORDER BY p.project_id, m.percentage_complete;
 -- ==================== FUNCTIONS ====================
 
 -- Function to get projects near a location
+-- Looks the pincode up once, filters with the GIST index on projects.geog
+-- and returns nearest first (KNN); max_results NULL returns every match
 CREATE OR REPLACE FUNCTION get_nearby_projects(
     input_pincode VARCHAR(6),
-    radius_meters INTEGER DEFAULT 20000
+    radius_meters INTEGER DEFAULT 20000,
+    max_results INTEGER DEFAULT NULL
 )
 RETURNS TABLE (
     project_id INTEGER,
@@ -187,7 +351,17 @@ RETURNS TABLE (
     location VARCHAR(255),
     distance_meters NUMERIC
 ) AS $$
+DECLARE
+    origin GEOGRAPHY;
 BEGIN
+    SELECT pc.geom::geography INTO origin
+    FROM pincodes pc
+    WHERE pc.pincode = input_pincode;
+
+    IF origin IS NULL THEN
+        RETURN;
+    END IF;
+
     RETURN QUERY
     SELECT 
         p.project_id,
@@ -195,19 +369,13 @@ BEGIN
         p.budget,
         p.status,
         p.location,
-        ST_Distance(
-            p.geom::geography,
-            (SELECT geom::geography FROM pincodes WHERE pincode = input_pincode)
-        ) as distance_meters
+        ST_Distance(p.geog, origin)::NUMERIC as distance_meters
     FROM projects p
-    WHERE ST_DWithin(
-        p.geom::geography,
-        (SELECT geom::geography FROM pincodes WHERE pincode = input_pincode),
-        radius_meters
-    )
-    ORDER BY distance_meters;
+    WHERE ST_DWithin(p.geog, origin, radius_meters)
+    ORDER BY p.geog <-> origin
+    LIMIT max_results;
 END;
-$$ LANGUAGE plpgsql;
+$$ LANGUAGE plpgsql STABLE;
 
 -- Function to calculate project completion percentage
 CREATE OR REPLACE FUNCTION get_project_completion(input_project_id INTEGER)
@@ -0,0 +1,99 @@
+import sys
+from pathlib import Path
+
+from flask import Flask
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'backend'))
+
+from admission import AdmissionController, TokenBuckets  # noqa: E402
+
+
+def test_bucket_refills_at_rate():
+    buckets = TokenBuckets(rate=2, burst=4)
+    assert buckets.take('a', 4, now=0) == 0.0
+    # Empty: 1 token needs half a second at 2 tokens/s
+    assert buckets.take('a', 1, now=0) == 0.5
+    assert buckets.take('a', 1, now=0.5) == 0.0
+    assert buckets.take('a', 2, now=1.0) == 0.5
+    # Refill is capped at the burst
+    assert buckets.take('a', 4, now=100) == 0.0
+
+
+def test_cost_above_burst_is_capped():
+    buckets = TokenBuckets(rate=1, burst=3)
+    assert buckets.take('a', 10, now=0) == 0.0
+    assert buckets.take('a', 10, now=1) == 2.0
+
+
+def test_lru_evicts_least_recently_used_client():
+    buckets = TokenBuckets(rate=1, burst=10, max_clients=2)
+    buckets.take('a', 5, now=0)
+    buckets.take('b', 5, now=0)
+    buckets.take('a', 1, now=1)  # a is now the most recent
+    buckets.take('c', 1, now=1)
+    assert len(buckets) == 2
+    assert 'b' not in buckets._buckets
+    # a kept its state: 5 - 1 + 1 refilled
+    assert buckets._buckets['a'][0] == 5
+
+
+def test_idle_clients_expire():
+    buckets = TokenBuckets(rate=1, burst=10)
+    buckets.take('a', 1, now=0)
+    buckets.take('b', 1, now=5)
+    buckets.take('c', 1, now=10.5)
+    assert list(buckets._buckets) == ['b', 'c']
+
+
+def make_app(**kwargs):
+    app = Flask(__name__)
+    admission = AdmissionController(app, rate=0.001, burst=2, enabled=True, **kwargs)
+
+    @app.route('/scan')
+    def scan():
+        return 'ok'
+
+    return app, admission
+
+
+def statuses(client, headers, n):
+    return [client.get('/scan', headers=headers).status_code for _ in range(n)]
+
+
+def test_rejected_with_retry_after():
+    app, _ = make_app()
+    client = app.test_client()
+    assert statuses(client, {}, 2) == [200, 200]
+    response = client.get('/scan')
+    assert response.status_code == 429
+    assert int(response.headers['Retry-After']) >= 1
+
+
+def test_unknown_api_keys_share_the_ip_bucket():
+    app, admission = make_app(api_keys=['partner'])
+    client = app.test_client()
+    codes = [client.get('/scan', headers={'X-API-Key': f'random-{i}'}).status_code for i in range(4)]
+    assert codes == [200, 200, 429, 429]
+    assert len(admission.buckets) == 1
+    # A configured key gets its own bucket
+    assert statuses(client, {'X-API-Key': 'partner'}, 3) == [200, 200, 429]
+    assert len(admission.buckets) == 2
+
+
+def test_spoofed_forwarded_for_shares_one_bucket():
+    app, admission = make_app(trust_proxy=1)
+    client = app.test_client()
+    # The proxy appends the real client address after whatever the client sent
+    codes = [client.get('/scan', headers={'X-Forwarded-For': f'10.0.0.{i}, 203.0.113.7'}).status_code
+             for i in range(4)]
+    assert codes == [200, 200, 429, 429]
+    assert list(admission.buckets._buckets) == ['ip:203.0.113.7']
+
+
+def test_trusted_hop_count_picks_the_outermost_proxys_entry():
+    app, admission = make_app(trust_proxy=2)
+    client = app.test_client()
+    client.get('/scan', headers={'X-Forwarded-For': 'spoofed, 203.0.113.7, 10.1.1.1'})
+    # Fewer entries than trusted proxies: the request bypassed them, use the socket address
+    client.get('/scan', headers={'X-Forwarded-For': '10.1.1.1'})
+    assert list(admission.buckets._buckets) == ['ip:203.0.113.7', 'ip:127.0.0.1']
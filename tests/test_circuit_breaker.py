@@ -0,0 +1,160 @@
+import sys
+import time
+from pathlib import Path
+
+import pytest
+from flask import Flask, jsonify
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'backend'))
+
+from circuit_breaker import (CLOSED, HALF_OPEN, OPEN, ChainUnavailableError, CircuitBreaker,  # noqa: E402
+                             CircuitOpenError, StaleCache)
+from conditional_get import conditional  # noqa: E402
+
+
+def make_breaker():
+    return CircuitBreaker('test', failure_threshold=3, slow_call_seconds=1.0, reset_seconds=10.0)
+
+
+def trip(breaker, now=0.0):
+    for _ in range(breaker.failure_threshold):
+        assert breaker.allow(now)
+        breaker.record(0.01, OSError("refused"), now)
+
+
+def test_opens_after_consecutive_failures():
+    breaker = make_breaker()
+    breaker.record(0.01, OSError("refused"), 0)
+    breaker.record(0.01, OSError("refused"), 0)
+    breaker.record(0.01, None, 0)  # A success resets the count
+    breaker.record(0.01, OSError("refused"), 0)
+    breaker.record(0.01, OSError("refused"), 0)
+    assert breaker.state == CLOSED
+    breaker.record(0.01, OSError("refused"), 0)
+    assert breaker.state == OPEN
+
+
+def test_slow_calls_count_as_failures():
+    breaker = make_breaker()
+    for _ in range(3):
+        breaker.record(1.5, None, 0)
+    assert breaker.state == OPEN
+    assert breaker.counts['slow'] == 3
+
+
+def test_open_rejects_until_reset():
+    breaker = make_breaker()
+    trip(breaker, now=100)
+    assert not breaker.allow(105)
+    assert breaker.retry_after(105) == 5
+    assert breaker.counts['rejected'] == 1
+
+
+def test_half_open_lets_one_probe_through():
+    breaker = make_breaker()
+    trip(breaker, now=0)
+    assert breaker.allow(10)
+    assert breaker.state == HALF_OPEN
+    assert not breaker.allow(10)
+    assert not breaker.allow(11)
+    assert breaker.counts['probes'] == 1
+
+
+def test_successful_probe_closes():
+    breaker = make_breaker()
+    trip(breaker, now=0)
+    assert breaker.allow(10)
+    breaker.record(0.01, None, 10)
+    assert breaker.state == CLOSED
+    assert breaker.allow(10)
+
+
+def test_failed_probe_reopens_for_another_period():
+    breaker = make_breaker()
+    trip(breaker, now=0)
+    assert breaker.allow(10)
+    breaker.record(0.01, OSError("refused"), 10)
+    assert breaker.state == OPEN
+    assert not breaker.allow(19)
+    assert breaker.allow(20)
+
+
+def test_call_translates_transport_errors():
+    breaker = make_breaker()
+
+    def refused():
+        raise ConnectionRefusedError("refused")
+
+    for _ in range(3):
+        with pytest.raises(ChainUnavailableError):
+            breaker.call(refused)
+    with pytest.raises(CircuitOpenError):
+        breaker.call(lambda: 'never called')
+
+
+def test_call_errors_from_a_live_node_are_not_failures():
+    breaker = make_breaker()
+
+    def reverted():
+        raise ValueError("execution reverted")
+
+    for _ in range(5):
+        with pytest.raises(ValueError):
+            breaker.call(reverted)
+    assert breaker.state == CLOSED
+    assert breaker.call(lambda: 42) == 42
+
+
+def test_stale_cache_serves_last_good_body():
+    app = Flask(__name__)
+    cache = StaleCache()
+    down = []
+
+    @app.route('/stats')
+    @cache.fallback
+    def stats():
+        if down:
+            raise ChainUnavailableError("node down", retry_after=7)
+        return jsonify({"projects": 3})
+
+    client = app.test_client()
+    assert client.get('/stats').get_json() == {"projects": 3}
+    down.append(True)
+    body = client.get('/stats').get_json()
+    assert body["projects"] == 3 and body["stale"] is True
+    assert cache.served == 1
+
+    response = client.get('/stats?other=1')
+    assert response.status_code == 503
+    assert response.headers['Retry-After'] == '7'
+
+
+def test_stale_body_behind_open_circuit_gets_no_etag():
+    app = Flask(__name__)
+    cache = StaleCache()
+    breaker = make_breaker()
+    node = {"up": True}
+
+    def read_chain():
+        if not node["up"]:
+            raise ConnectionRefusedError("refused")
+        return {"projects": 3}
+
+    @app.route('/stats')
+    @conditional(lambda: 'block-7')
+    @cache.fallback
+    def stats():
+        return jsonify(breaker.call(read_chain))
+
+    client = app.test_client()
+    fresh = client.get('/stats')
+    assert fresh.headers['ETag'] == '"block-7"'
+
+    node["up"] = False
+    trip(breaker, now=time.monotonic())
+    stale = client.get('/stats', headers={'If-None-Match': '"block-6"'})
+    assert stale.status_code == 200
+    assert stale.get_json()["stale"] is True
+    # Tagging it block-7 would let a later revalidation 304 onto the stale body
+    assert 'ETag' not in stale.headers
+    assert stale.headers['Cache-Control'] == 'no-store'
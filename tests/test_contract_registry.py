@@ -0,0 +1,83 @@
+import sys
+from pathlib import Path
+
+import pytest
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent / 'backend'
+sys.path.insert(0, str(BACKEND_DIR))
+sys.path.insert(0, str(BACKEND_DIR / 'benchmarks'))
+
+from contract_registry import ContractEntry, FunctionCodec  # noqa: E402
+
+
+@pytest.fixture(scope='module')
+def chain():
+    pytest.importorskip('eth_tester')
+    from chain_fixture import build
+    return build(None, None, projects=2, tenders=1, milestones=2, expenditures=1, seed=1)
+
+
+@pytest.fixture(scope='module')
+def entry(chain):
+    return ContractEntry('FundTracker', chain.w3, chain.address, chain.abi)
+
+
+def fn_abi(abi, name):
+    return next(item for item in abi if item.get('type') == 'function' and item['name'] == name)
+
+
+def web3_call(chain, name, *args):
+    return getattr(chain.contract.functions, name)(*args).call()
+
+
+def test_selector_matches_the_signature(chain):
+    codec = FunctionCodec(fn_abi(chain.abi, 'getProject'))
+    assert codec.selector == bytes(chain.w3.keccak(text='getProject(uint256)')[:4])
+    # The struct output collapses to one tuple type
+    assert len(codec.output_types) == 1 and codec.output_types[0].startswith('(uint256,string,')
+    # No inputs: the call data is the bare selector
+    count = FunctionCodec(fn_abi(chain.abi, 'projectCount'))
+    assert count.encode() == count.selector == bytes(chain.w3.keccak(text='projectCount()')[:4])
+
+
+@pytest.mark.parametrize('name, args', [
+    ('getProject', (1,)),
+    ('calculateDistance', (1, -18569613, -73773243)),   # Negative int256 arguments
+    ('verifyGPS', (1, 18569613, 73773243)),
+    ('projectTenders', (1, 0)),
+])
+def test_encoding_matches_web3(chain, name, args):
+    codec = FunctionCodec(fn_abi(chain.abi, name))
+    expected = getattr(chain.contract.functions, name)(*args)._encode_transaction_data()
+    assert '0x' + codec.encode(*args).hex() == expected
+
+
+def test_address_argument_is_encoded(chain, entry):
+    contractor = chain.contractors[0]
+    assert entry.call('getContractorProfile', contractor) == web3_call(chain, 'getContractorProfile', contractor)
+    assert entry.call('contractorEligible', contractor.lower()) == web3_call(chain, 'contractorEligible', contractor)
+
+
+def test_single_outputs_are_returned_bare(chain, entry):
+    assert entry.call('projectCount') == 2
+    milestones = entry.call('getProjectMilestones', 1)
+    assert milestones == web3_call(chain, 'getProjectMilestones', 1) == [1, 2]
+    assert isinstance(milestones, list)
+    assert entry.call('verifyGPS', 1, 18569613, 73773243) is web3_call(chain, 'verifyGPS', 1, 18569613, 73773243)
+
+
+def test_struct_output_is_one_tuple(chain, entry):
+    project = entry.call('getProject', 1)
+    assert project == web3_call(chain, 'getProject', 1)
+    assert isinstance(project, tuple) and project[0] == 1
+    # Addresses inside the tuple are checksummed like web3's
+    assert project[5] == chain.admin
+
+
+def test_multiple_outputs_are_a_list(chain, entry):
+    details = entry.call('getTenderDetails', 1)
+    assert details == web3_call(chain, 'getTenderDetails', 1)
+    assert isinstance(details, list) and len(details) == 4
+    assert details[3] == chain.w3.to_checksum_address(details[3])
+    assert entry.call('isContractorEligible', chain.contractors[0]) == \
+        web3_call(chain, 'isContractorEligible', chain.contractors[0])
@@ -0,0 +1,104 @@
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'backend'))
+
+from event_stream import RETRY_MILLISECONDS, EventBroker  # noqa: E402
+
+HEARTBEAT = 0.01
+
+
+def parse(frame):
+    """SSE frame -> {field: value}; comments come back as {'comment': ...}"""
+    fields = {}
+    for line in frame.strip('\n').split('\n'):
+        if line.startswith(':'):
+            fields['comment'] = line[1:].strip()
+        else:
+            name, _, value = line.partition(': ')
+            fields[name] = value
+    return fields
+
+
+def open_stream(broker, last_event_id=None, types=None):
+    frames = broker.stream(last_event_id, types, heartbeat=HEARTBEAT)
+    assert parse(next(frames)) == {'retry': str(RETRY_MILLISECONDS)}
+    return frames
+
+
+def take(frames, n):
+    return [parse(next(frames)) for _ in range(n)]
+
+
+def test_new_client_gets_only_new_events():
+    broker = EventBroker()
+    broker.publish('tender.submitted', {'id': 1})
+    frames = open_stream(broker)
+    assert 'comment' in parse(next(frames))  # Heartbeat, nothing new yet
+    broker.publish('tender.approved', {'id': 1})
+    assert take(frames, 1) == [{'id': f'{broker.boot_id}-2', 'event': 'tender.approved', 'data': '{"id":1}'}]
+
+
+def test_resume_after_last_event_id():
+    broker = EventBroker()
+    for i in range(1, 5):
+        broker.publish('milestone.submitted', {'id': i})
+    frames = open_stream(broker, f'{broker.boot_id}-2')
+    events = take(frames, 2)
+    assert [e['id'] for e in events] == [f'{broker.boot_id}-3', f'{broker.boot_id}-4']
+    assert [e['data'] for e in events] == ['{"id":3}', '{"id":4}']
+
+
+def test_resume_point_is_fixed_when_the_stream_opens():
+    broker = EventBroker()
+    frames = broker.stream(heartbeat=HEARTBEAT)
+    # Published before the first frame was pulled, after the client connected
+    broker.publish('tender.submitted', {'id': 1})
+    next(frames)
+    assert take(frames, 1)[0]['id'] == f'{broker.boot_id}-1'
+
+
+def test_id_that_fell_out_of_the_backlog_gets_a_reset():
+    broker = EventBroker(backlog=3)
+    for i in range(1, 7):
+        broker.publish('tender.submitted', {'id': i})
+    # Events 4-6 are buffered; resuming after 2 would silently skip 3
+    frames = open_stream(broker, f'{broker.boot_id}-2')
+    assert take(frames, 1) == [{'id': f'{broker.boot_id}-6', 'event': 'reset', 'data': '{}'}]
+    broker.publish('tender.approved', {'id': 7})
+    assert take(frames, 1)[0]['id'] == f'{broker.boot_id}-7'
+
+
+def test_oldest_buffered_predecessor_still_resumes():
+    broker = EventBroker(backlog=3)
+    for i in range(1, 7):
+        broker.publish('tender.submitted', {'id': i})
+    frames = open_stream(broker, f'{broker.boot_id}-3')
+    assert [e['event'] for e in take(frames, 3)] == ['tender.submitted'] * 3
+
+
+def test_ids_from_another_process_or_garbage_reset():
+    broker = EventBroker()
+    broker.publish('tender.submitted', {'id': 1})
+    for last_event_id in ('deadbeef-1', f'{broker.boot_id}-x', f'{broker.boot_id}-9', 'nonsense'):
+        frames = open_stream(broker, last_event_id)
+        assert take(frames, 1)[0]['event'] == 'reset'
+
+
+def test_slow_client_that_falls_behind_mid_stream_resets():
+    broker = EventBroker(backlog=2)
+    frames = open_stream(broker)
+    for i in range(1, 5):
+        broker.publish('tender.submitted', {'id': i})
+    assert take(frames, 1) == [{'id': f'{broker.boot_id}-4', 'event': 'reset', 'data': '{}'}]
+
+
+def test_type_filter_still_advances_the_cursor():
+    broker = EventBroker()
+    frames = open_stream(broker, types=('milestone.verified',))
+    broker.publish('tender.submitted', {'id': 1})
+    broker.publish('milestone.verified', {'id': 2})
+    broker.publish('milestone.rejected', {'id': 3})
+    assert take(frames, 1)[0]['id'] == f'{broker.boot_id}-2'
+    assert 'comment' in parse(next(frames))
+    assert broker.stats() == {'last_event_id': f'{broker.boot_id}-3', 'buffered': 3}
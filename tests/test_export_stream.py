@@ -0,0 +1,126 @@
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'backend'))
+
+from circuit_breaker import ChainUnavailableError  # noqa: E402
+from export_stream import (CURSOR_FIELD, ERROR_FIELD, RowEncoder, decode_cursor, encode_cursor,  # noqa: E402
+                           export_chunks)
+
+
+class FakeContract:
+    """FundTracker with `count` projects; ids in `unreadable` fail to decode, from `down_at` on the node is gone"""
+
+    address = '0x' + '11' * 20
+
+    def __init__(self, count=5, unreadable=(), down_at=None):
+        self.count = count
+        self.unreadable = set(unreadable)
+        self.down_at = down_at
+
+    def call(self, name, *args):
+        if name == 'projectCount':
+            return self.count
+        item_id = args[0]
+        if self.down_at is not None and item_id >= self.down_at:
+            raise ChainUnavailableError("node down", retry_after=5)
+        if item_id in self.unreadable:
+            raise ValueError("decode failed")
+        return (item_id, f'Project {item_id}', '', 'Pune', 100, 50, 10, '0xAdmin', 1, 1698153600)
+
+
+@pytest.fixture
+def export(monkeypatch):
+    """GET an export from server_fixed against a FakeContract; returns (status, rows or error body)"""
+    server_fixed = pytest.importorskip('server_fixed')
+    # Exports cost 20 tokens; the suite makes more of them than one client's burst allows
+    monkeypatch.setitem(server_fixed.admission.costs, 'export_entity', 0)
+    client = server_fixed.app.test_client()
+
+    def get(contract, query=''):
+        monkeypatch.setattr(server_fixed.contracts, 'get', lambda name: contract)
+        response = client.get('/api/export/projects' + query)
+        if response.status_code != 200:
+            return response.status_code, response.get_json()
+        return 200, [json.loads(line) for line in response.get_data(as_text=True).splitlines()]
+
+    return get
+
+
+def test_cursor_round_trip():
+    for key in (0, 7, 'tx-9', [3, 'abc']):
+        cursor = encode_cursor('projects', key)
+        assert '=' not in cursor
+        assert decode_cursor(cursor, 'projects') == key
+
+
+@pytest.mark.parametrize('cursor', ['', 'junk!!', 'bm90IGpzb24', encode_cursor('projects', 3)[:-2]])
+def test_garbage_cursor_is_rejected(cursor):
+    with pytest.raises(ValueError, match="Invalid cursor"):
+        decode_cursor(cursor, 'projects')
+
+
+def test_cursor_from_another_export_is_rejected():
+    with pytest.raises(ValueError, match="tenders"):
+        decode_cursor(encode_cursor('tenders', 3), 'projects')
+
+
+def test_chunks_are_flushed_by_size_and_csv_gets_one_header():
+    encoder = RowEncoder('csv', ['id', 'tags'])
+    rows = [{'id': i, 'tags': ['a', 'b'], CURSOR_FIELD: encode_cursor('x', i)} for i in range(50)]
+    chunks = list(export_chunks(rows, encoder, chunk_bytes=256))
+    assert len(chunks) > 1
+    lines = b''.join(chunks).decode().splitlines()
+    assert lines[0] == '_cursor,id,tags'
+    assert len(lines) == 51 and lines[1].endswith(',0,"[""a"",""b""]"')
+
+
+def test_export_resumes_after_the_cursor(export):
+    contract = FakeContract(count=5)
+    status, rows = export(contract)
+    assert status == 200
+    assert [row['id'] for row in rows] == [1, 2, 3, 4, 5]
+
+    status, resumed = export(contract, '?cursor=' + rows[1][CURSOR_FIELD])
+    assert [row['id'] for row in resumed] == [3, 4, 5]
+    assert resumed == rows[2:]
+
+
+@pytest.mark.parametrize('cursor', [
+    'junk!!',
+    encode_cursor('tenders', 2),          # Another export's cursor
+    encode_cursor('projects', -3),
+    encode_cursor('projects', [1]),
+    encode_cursor('projects', None),
+    encode_cursor('projects', True),
+])
+def test_tampered_cursor_is_a_400(export, cursor):
+    status, body = export(FakeContract(), '?cursor=' + cursor)
+    assert status == 400
+    assert body['error'].startswith(("Invalid cursor", "Cursor belongs"))
+
+
+def test_unreadable_item_becomes_an_error_row(export):
+    status, rows = export(FakeContract(count=3, unreadable={2}))
+    assert status == 200
+    assert [row['id'] for row in rows] == [1, 2, 3]
+    assert rows[1][ERROR_FIELD].startswith("Unreadable item")
+    assert ERROR_FIELD not in rows[0] and ERROR_FIELD not in rows[2]
+
+
+def test_node_failure_mid_stream_ends_with_a_resumable_error_row(export):
+    contract = FakeContract(count=5, down_at=4)
+    status, rows = export(contract)
+    assert status == 200
+    assert [row.get('id') for row in rows] == [1, 2, 3, None]
+    trailer = rows[-1]
+    assert trailer[ERROR_FIELD].startswith("Export interrupted")
+    # The trailer's cursor resumes at the item that failed
+    assert decode_cursor(trailer[CURSOR_FIELD], 'projects') == 3
+
+    contract.down_at = None
+    status, rest = export(contract, '?cursor=' + trailer[CURSOR_FIELD])
+    assert [row['id'] for row in rest] == [4, 5]
@@ -0,0 +1,111 @@
+import math
+import random
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'backend'))
+
+from geofence import (CONTRACT_COORDINATE_SCALE, EARTH_RADIUS_METERS, GeofenceIndex,  # noqa: E402
+                      contract_distance_meters, haversine_meters, parse_gps_coordinates)
+
+
+def scalar_haversine(lat1, lon1, lat2, lon2):
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    a = (math.sin((phi2 - phi1) / 2) ** 2
+         + math.cos(phi1) * math.cos(phi2) * math.sin(math.radians(lon2 - lon1) / 2) ** 2)
+    return 2 * EARTH_RADIUS_METERS * math.asin(math.sqrt(min(a, 1.0)))
+
+
+def scalar_contract_distance(lat1, lon1, lat2, lon2):
+    """FundTracker.calculateDistance line by line, with Python's exact integer sqrt"""
+    lat_dist = abs(lat2 - lat1) * 111000 // 1000000
+    lon_dist = abs(lon2 - lon1) * 111000 // 1000000
+    return math.isqrt(lat_dist * lat_dist + lon_dist * lon_dist)
+
+
+@pytest.mark.parametrize('text, expected', [
+    ('40.7128° N, 74.0060° W', (40.7128, -74.006)),
+    ('28.6328,77.2167', (28.6328, 77.2167)),
+    ('N 40.7128 W 74.0060', (40.7128, -74.006)),
+    ('40.7128 N 74.0060 W', (40.7128, -74.006)),
+    ('-33.8688, 151.2093', (-33.8688, 151.2093)),
+    ('74.0060° W, 40.7128° N', (40.7128, -74.006)),
+    ('18.7546 deg S, 73.4062 degrees E', (-18.7546, 73.4062)),
+])
+def test_parse_accepts(text, expected):
+    assert parse_gps_coordinates(text) == pytest.approx(expected)
+
+
+@pytest.mark.parametrize('text', [
+    None, '', '   ', '40.7128', '1, 2, 3', 'abc, def',
+    '91, 0', '0, 181',
+    '-40.7 N, 74.0 W',           # Negative with a hemisphere
+    'N 40.7 N, 74.0',            # Letter on both sides
+    '40.7 N, 74.0 S',            # Two latitudes
+    '40.7128 74.0060 W',         # Mixed styles without a comma
+])
+def test_parse_rejects(text):
+    with pytest.raises(ValueError):
+        parse_gps_coordinates(text)
+
+
+def test_nearest_match_across_the_antimeridian():
+    index = GeofenceIndex(['east', 'west', 'far'], [0.0, 0.0, 0.0], [179.9995, -179.9990, 170.0], [500, 500, 500])
+    hits = index.nearby(0.0, -179.9999)
+    assert [hit['project_id'] for hit in hits] == ['east', 'west']
+    assert hits[0]['distance_meters'] == pytest.approx(scalar_haversine(0, -179.9999, 0, 179.9995), abs=0.1)
+    assert all(hit['within_radius'] for hit in hits)
+    # The batch path buckets the same way
+    assert index.nearby_many([0.0], [179.9999])[0] == index.nearby(0.0, 179.9999)
+
+
+def test_check_many_agrees_with_scalar_haversine_and_contract():
+    rng = random.Random(7)
+    sites = [(18.5 + rng.random(), 73.5 + rng.random()) for _ in range(20)]
+    index = GeofenceIndex(range(20), [lat for lat, _ in sites], [lon for _, lon in sites], [800] * 20)
+
+    project_ids, latitudes, longitudes = [], [], []
+    for _ in range(200):
+        pid = rng.randrange(20)
+        project_ids.append(pid)
+        latitudes.append(round(sites[pid][0] + rng.uniform(-0.01, 0.01), 6))
+        longitudes.append(round(sites[pid][1] + rng.uniform(-0.01, 0.01), 6))
+    project_ids.append('unknown')
+    latitudes.append(0.0)
+    longitudes.append(0.0)
+
+    known, distances, within, contract_distances, contract_passed = index.check_many(
+        project_ids, latitudes, longitudes
+    )
+    assert known.tolist() == [True] * 200 + [False]
+    assert math.isnan(distances[-1]) and contract_distances[-1] == -1 and not contract_passed[-1]
+
+    scale = CONTRACT_COORDINATE_SCALE
+    for i, pid in enumerate(project_ids[:-1]):
+        lat, lon = sites[pid]
+        expected = scalar_haversine(latitudes[i], longitudes[i], lat, lon)
+        assert distances[i] == pytest.approx(expected, rel=1e-9)
+        assert within[i] == (expected <= 800)
+        assert index.check(pid, latitudes[i], longitudes[i]) == (pytest.approx(expected, rel=1e-9), expected <= 800)
+        on_chain = scalar_contract_distance(round(lat * scale), round(lon * scale),
+                                            round(latitudes[i] * scale), round(longitudes[i] * scale))
+        assert contract_distances[i] == on_chain
+        assert contract_passed[i] == (on_chain <= 800)
+
+
+def test_contract_distance_integer_sqrt_is_exact_for_large_offsets():
+    rng = random.Random(3)
+    lat1 = [rng.randrange(-90_000_000, 90_000_001) for _ in range(500)]
+    lon1 = [rng.randrange(-180_000_000, 180_000_001) for _ in range(500)]
+    lat2 = [rng.randrange(-90_000_000, 90_000_001) for _ in range(500)]
+    lon2 = [rng.randrange(-180_000_000, 180_000_001) for _ in range(500)]
+    expected = [scalar_contract_distance(*args) for args in zip(lat1, lon1, lat2, lon2)]
+    assert contract_distance_meters(lat1, lon1, lat2, lon2).tolist() == expected
+
+
+def test_vectorized_haversine_broadcasts():
+    distances = haversine_meters(0.0, 0.0, np.array([0.0, 1.0]), np.array([1.0, 0.0]))
+    assert distances.tolist() == pytest.approx([scalar_haversine(0, 0, 0, 1)] * 2)
@@ -0,0 +1,84 @@
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'backend'))
+
+import server_demo  # noqa: E402
+
+# Project 1's center, contract-scaled
+LAT, LON = 18754600, 73406200
+
+
+@pytest.fixture
+def client():
+    return server_demo.app.test_client()
+
+
+def gps_check(client, body):
+    return client.post('/api/oracle/gps-check', json=body)
+
+
+def test_batch_checks_every_item(client):
+    response = gps_check(client, {'items': [
+        {'project_id': 1, 'latitude': LAT, 'longitude': LON},
+        {'project_id': 1, 'latitude': LAT + 2000, 'longitude': LON},            # ~222 m north
+        {'project_id': 1, 'latitude': LAT + 10000, 'longitude': str(LON)},      # ~1.1 km north
+        {'project_id': 1, 'gps_coordinates': '18.7546° N, 73.4062° E'},
+        {'project_id': 2, 'latitude': LAT, 'longitude': LON},                   # Pune is far from Bangalore
+    ]})
+    assert response.status_code == 200
+    body = response.get_json()
+    results = body['results']
+    assert [r['index'] for r in results] == [0, 1, 2, 3, 4]
+    assert [r['passed'] for r in results] == [True, True, False, True, False]
+    assert [r['contract_distance_meters'] for r in results[:3]] == [0, 222, 1110]
+    assert results[0]['radius_meters'] == 500
+    assert results[3]['latitude'] == LAT and results[3]['longitude'] == LON
+    assert results[4]['distance_meters'] > 500_000
+    assert (body['total'], body['passed'], body['failed'], body['errors']) == (5, 3, 2, 0)
+
+
+def test_malformed_items_get_errors_without_failing_the_batch(client):
+    response = gps_check(client, {'items': [
+        'not an object',
+        {'project_id': '1', 'latitude': LAT, 'longitude': LON},
+        {'project_id': True, 'latitude': LAT, 'longitude': LON},
+        {'project_id': 1, 'milestone_id': 1.5, 'latitude': LAT, 'longitude': LON},
+        {'project_id': 1, 'milestone_id': 99, 'latitude': LAT, 'longitude': LON},
+        {'project_id': 1, 'latitude': 18.7546, 'longitude': 73.4062},           # Degrees, not scaled
+        {'project_id': 1, 'latitude': LAT},
+        {'project_id': 1, 'latitude': 91_000_000, 'longitude': LON},
+        {'project_id': 1, 'gps_coordinates': 'somewhere'},
+        {'project_id': 404, 'latitude': LAT, 'longitude': LON},
+        {'project_id': 1, 'latitude': LAT, 'longitude': LON},
+    ]})
+    assert response.status_code == 200
+    body = response.get_json()
+    results = body['results']
+    errors = [r.get('error', '') for r in results]
+    assert errors[0] == "Item must be an object"
+    assert errors[1] == errors[2] == "project_id must be an integer"
+    assert errors[3] == "milestone_id must be an integer"
+    assert errors[4] == "Milestone not found"
+    assert all(e.startswith("Invalid coordinates") for e in errors[5:9])
+    assert errors[9] == "Project has no GPS center"
+    assert errors[10] == '' and results[10]['passed'] is True
+    assert (body['total'], body['passed'], body['failed'], body['errors']) == (11, 1, 0, 10)
+
+
+@pytest.mark.parametrize('body', [[], [{'project_id': 1}], 5, 'items', {}, {'items': []}, {'items': {}}])
+def test_body_without_an_items_list_is_rejected(client, body):
+    response = gps_check(client, body)
+    assert response.status_code == 400
+    assert response.get_json() == {"error": "items must be a non-empty list"}
+
+
+def test_size_limit(client, monkeypatch):
+    monkeypatch.setattr(server_demo, 'MAX_GPS_CHECK_ITEMS', 3)
+    item = {'project_id': 1, 'latitude': LAT, 'longitude': LON}
+    assert gps_check(client, {'items': [item] * 3}).status_code == 200
+    response = gps_check(client, {'items': [item] * 4})
+    assert response.status_code == 400
+    assert response.get_json() == {"error": "At most 3 items per request"}
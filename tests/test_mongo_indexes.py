@@ -0,0 +1,73 @@
+import asyncio
+import os
+import sys
+import uuid
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'backend'))
+
+from mongo_indexes import ensure_indexes, plan_stages, time_range_query  # noqa: E402
+
+MONGO_URL = os.environ.get('MONGO_URL', 'mongodb://localhost:27017')
+
+
+async def _explain_queries(motor_asyncio):
+    client = motor_asyncio.AsyncIOMotorClient(MONGO_URL, serverSelectionTimeoutMS=2000)
+    try:
+        await client.admin.command('ping')
+    except Exception as e:
+        client.close()
+        pytest.skip(f"MongoDB not reachable at {MONGO_URL}: {e}")
+
+    db_name = f"test_indexes_{uuid.uuid4().hex[:8]}"
+    db = client[db_name]
+    try:
+        start = datetime(2025, 1, 1, tzinfo=timezone.utc)
+        await db.transactions.insert_many([
+            {
+                'id': str(uuid.uuid4()),
+                'tx_hash': f"0x{i:064x}",
+                'type': ['project_create', 'expenditure'][i % 2],
+                'project_id': f"project-{i % 20}",
+                'details': {},
+                'timestamp': start + timedelta(hours=i),
+            }
+            for i in range(500)
+        ])
+        assert await ensure_indexes(db) == []
+
+        since = start + timedelta(hours=100)
+        queries = {
+            'project': time_range_query({'project_id': 'project-3'}, since=since),
+            'type': time_range_query({'type': 'expenditure'}, since=since),
+            'all': time_range_query({}, since=since),
+        }
+        plans = {}
+        for name, query in queries.items():
+            explain = await db.transactions.find(query).sort('timestamp', -1).explain()
+            plans[name] = plan_stages(explain)
+        return plans
+    finally:
+        await client.drop_database(db_name)
+        client.close()
+
+
+def test_transaction_queries_use_indexes():
+    motor_asyncio = pytest.importorskip('motor.motor_asyncio')
+    plans = asyncio.run(_explain_queries(motor_asyncio))
+    for name, stages in plans.items():
+        assert 'IXSCAN' in stages, f"{name}: {stages}"
+        assert 'COLLSCAN' not in stages, f"{name}: {stages}"
+        # Index order satisfies sort("timestamp", -1) - no in-memory sort
+        assert 'SORT' not in stages, f"{name}: {stages}"
+
+
+def test_time_range_query():
+    since = datetime(2025, 1, 1, tzinfo=timezone.utc)
+    until = datetime(2025, 2, 1, tzinfo=timezone.utc)
+    assert time_range_query({'type': 'expenditure'}) == {'type': 'expenditure'}
+    assert time_range_query({}, since, until) == {'timestamp': {'$gte': since, '$lte': until}}
+    assert time_range_query({}, until=until) == {'timestamp': {'$lte': until}}
@@ -0,0 +1,128 @@
+import sys
+import threading
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'backend'))
+
+from rpc_pool import MIN_SAMPLES, RpcPool  # noqa: E402
+
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class FakeProvider:
+    """Answers with its own name; `fail` raises a transport error, `hold` blocks until released"""
+
+    def __init__(self, name):
+        self.name = name
+        self.calls = []
+        self.fail = False
+        self.hold = None
+
+    def make_request(self, method, params):
+        self.calls.append(method)
+        if self.hold is not None:
+            assert self.hold.wait(5)
+        if self.fail:
+            raise ConnectionRefusedError(f"{self.name} refused")
+        return {"jsonrpc": "2.0", "id": 1, "result": self.name}
+
+    def is_connected(self, show_traceback=False):
+        return not self.fail
+
+
+def make_pool(n=3, **kwargs):
+    clock = Clock()
+    pool = RpcPool([f"http://node{i}" for i in range(n)], max_failures=2, cooldown=15, clock=clock, **kwargs)
+    providers = []
+    for i, node in enumerate(pool.nodes):
+        node.provider = FakeProvider(f"node{i}")
+        providers.append(node.provider)
+        # Measured, node0 fastest; a full window so hedge delays come from the percentile
+        for _ in range(MIN_SAMPLES):
+            node.observe(0.001 * (i + 1))
+    return pool, providers, clock
+
+
+def result(response):
+    return response["result"]
+
+
+def test_reads_go_to_the_fastest_node():
+    pool, providers, _ = make_pool()
+    assert result(pool.make_request('eth_call', [])) == 'node0'
+    assert providers[1].calls == [] and providers[2].calls == []
+
+
+def test_writes_stay_on_the_primary():
+    pool, providers, _ = make_pool()
+    providers[0].fail = True
+    with pytest.raises(ConnectionRefusedError):
+        pool.make_request('eth_sendRawTransaction', ['0x00'])
+    assert providers[1].calls == [] and providers[2].calls == []
+
+
+def test_transport_error_fails_over():
+    pool, providers, _ = make_pool()
+    providers[0].fail = True
+    assert result(pool.make_request('eth_call', [])) == 'node1'
+    assert pool.counts['failed_over'] == 1
+    assert pool.nodes[0].failures == 1
+
+
+def test_all_nodes_failing_raises_the_last_error():
+    pool, providers, _ = make_pool()
+    for provider in providers:
+        provider.fail = True
+    with pytest.raises(ConnectionRefusedError):
+        pool.make_request('eth_call', [])
+
+
+def test_slow_node_is_hedged_and_the_hedge_wins():
+    pool, providers, _ = make_pool(hedge_percentile=95)
+    providers[0].hold = threading.Event()
+    try:
+        assert result(pool.make_request('eth_call', [])) == 'node1'
+    finally:
+        providers[0].hold.set()
+    assert pool.counts['hedged'] == 1
+    assert pool.counts['won_by_hedge'] == 1
+
+
+def test_no_hedging_when_percentile_is_zero():
+    pool, providers, _ = make_pool(hedge_percentile=0)
+    assert pool.hedge_delay(pool.nodes[0]) is None
+
+
+def test_failing_node_cools_down_then_returns():
+    pool, providers, clock = make_pool()
+    providers[0].fail = True
+    # Primary-only calls don't fail over, so node0 takes both failures
+    for _ in range(2):
+        with pytest.raises(ConnectionRefusedError):
+            pool.make_request('eth_getTransactionCount', [])
+    assert not pool.nodes[0].healthy(clock.now)
+    assert pool.nodes[0] not in pool.ranked()
+
+    providers[0].fail = False
+    clock.now = 14.9
+    assert result(pool.make_request('eth_call', [])) == 'node1'
+    clock.now = 15
+    assert pool.nodes[0] in pool.ranked()
+    # Its failures were charged as latency, so it has to win back the lead
+    assert pool.ranked()[0] is not pool.nodes[0]
+
+
+def test_all_nodes_down_still_tries_them():
+    pool, providers, clock = make_pool(n=2)
+    for node in pool.nodes:
+        node.down_until = 100
+    assert len(pool.ranked()) == 2
+    assert result(pool.make_request('eth_call', [])) == 'node0'
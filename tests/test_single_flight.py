@@ -0,0 +1,108 @@
+import sys
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'backend'))
+
+from single_flight import SingleFlight  # noqa: E402
+
+WAITERS = 5
+
+
+def wait_for(predicate, timeout=5):
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        assert time.monotonic() < deadline, "timed out"
+        time.sleep(0.005)
+
+
+def run_concurrently(flights, key, fn):
+    """WAITERS + 1 threads calling flights.do(key, fn); fn should block until they have all joined"""
+    outcomes = []
+
+    def call():
+        try:
+            outcomes.append(('ok', flights.do(key, fn)))
+        except Exception as e:
+            outcomes.append(('error', e))
+
+    threads = [threading.Thread(target=call) for _ in range(WAITERS + 1)]
+    for thread in threads:
+        thread.start()
+    return threads, outcomes
+
+
+class Leader:
+    def __init__(self, result=None, error=None):
+        self.calls = 0
+        self.release = threading.Event()
+        self.result = result
+        self.error = error
+
+    def __call__(self):
+        self.calls += 1
+        assert self.release.wait(5)
+        if self.error is not None:
+            raise self.error
+        return self.result
+
+
+def test_waiters_share_the_leaders_result():
+    flights = SingleFlight()
+    leader = Leader(result=['shared'])
+    threads, outcomes = run_concurrently(flights, ('scan', 1), leader)
+    wait_for(lambda: flights.stats()['scan']['deduplicated'] == WAITERS)
+    leader.release.set()
+    for thread in threads:
+        thread.join(5)
+
+    assert leader.calls == 1
+    assert len(outcomes) == WAITERS + 1
+    assert all(kind == 'ok' and value is outcomes[0][1] for kind, value in outcomes)
+    assert flights.stats() == {'scan': {'executed': 1, 'deduplicated': WAITERS, 'in_flight': 0}}
+
+
+def test_waiters_share_the_leaders_exception():
+    flights = SingleFlight()
+    error = OSError("node down")
+    leader = Leader(error=error)
+    threads, outcomes = run_concurrently(flights, ('scan', 1), leader)
+    wait_for(lambda: flights.stats()['scan']['deduplicated'] == WAITERS)
+    leader.release.set()
+    for thread in threads:
+        thread.join(5)
+
+    assert leader.calls == 1
+    assert outcomes == [('error', error)] * (WAITERS + 1)
+
+
+def test_nothing_is_cached_after_the_flight():
+    flights = SingleFlight()
+    calls = []
+    assert flights.do(('scan',), lambda: calls.append(1) or len(calls)) == 1
+    assert flights.do(('scan',), lambda: calls.append(1) or len(calls)) == 2
+
+
+def test_failed_flight_is_forgotten():
+    flights = SingleFlight()
+    with pytest.raises(ValueError):
+        flights.do(('scan',), lambda: int('x'))
+    assert flights.do(('scan',), lambda: 'recovered') == 'recovered'
+
+
+def test_coalesce_keys_on_group_and_arguments():
+    flights = SingleFlight()
+    seen = []
+
+    @flights.coalesce('project')
+    def read_project(contract, project_id):
+        seen.append((contract, project_id))
+        return project_id
+
+    assert read_project('c', 1) == 1
+    assert read_project('c', 2) == 2
+    assert seen == [('c', 1), ('c', 2)]
+    assert flights.stats()['project']['executed'] == 2
@@ -0,0 +1,164 @@
+import sys
+import threading
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'backend'))
+
+from swr_cache import HOT_HITS, SwrCache  # noqa: E402
+
+KEY = ('project_scan', 'contract')
+
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class Loader:
+    """Returns v1, v2, ...; calls listed in `block` wait for release()"""
+
+    def __init__(self, block=()):
+        self.calls = 0
+        self.block = set(block)
+        self.entered = threading.Event()
+        self.released = threading.Event()
+
+    def __call__(self):
+        self.calls += 1
+        call = self.calls
+        if call in self.block:
+            self.entered.set()
+            assert self.released.wait(5)
+        return f"v{call}"
+
+    def release(self):
+        self.released.set()
+
+
+def wait_for(predicate, timeout=5):
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        assert time.monotonic() < deadline, "timed out"
+        time.sleep(0.005)
+
+
+def make_cache():
+    clock = Clock()
+    # The scheduler thread never wakes up; tests call refresh_due() themselves
+    return SwrCache(tick=3600, clock=clock), clock
+
+
+def idle(cache):
+    return lambda: not any(entry.refreshing for entry in cache._entries.values())
+
+
+def test_fresh_within_soft_ttl():
+    cache, clock = make_cache()
+    loader = Loader()
+    assert cache.get(KEY, loader, 5, 60) == ('v1', 0.0)
+    clock.now = 4
+    assert cache.get(KEY, loader, 5, 60) == ('v1', 4)
+    assert loader.calls == 1
+    assert cache.stats()['project_scan']['fresh'] == 1
+
+
+def test_stale_served_while_refreshing():
+    cache, clock = make_cache()
+    loader = Loader(block=[2])
+    cache.get(KEY, loader, 5, 60)
+    clock.now = 10
+    assert cache.get(KEY, loader, 5, 60) == ('v1', 10)
+    assert loader.entered.wait(5)
+    # Still refreshing: readers keep getting the old value, no second refresh starts
+    assert cache.get(KEY, loader, 5, 60) == ('v1', 10)
+    loader.release()
+    wait_for(idle(cache))
+    assert cache.get(KEY, loader, 5, 60) == ('v2', 0)
+    assert loader.calls == 2
+    assert cache.stats()['project_scan']['refresh'] == 1
+
+
+def test_hard_ttl_loads_in_request():
+    cache, clock = make_cache()
+    loader = Loader()
+    cache.get(KEY, loader, 5, 60)
+    clock.now = 60
+    assert cache.get(KEY, loader, 5, 60) == ('v2', 0)
+    assert cache.stats()['project_scan']['miss'] == 2
+
+
+def test_failed_refresh_keeps_old_value():
+    cache, clock = make_cache()
+    calls = []
+
+    def loader():
+        calls.append(1)
+        if len(calls) > 1:
+            raise OSError("node down")
+        return 'v1'
+
+    cache.get(KEY, loader, 5, 60)
+    clock.now = 10
+    assert cache.get(KEY, loader, 5, 60)[0] == 'v1'
+    wait_for(idle(cache))
+    assert cache.get(KEY, loader, 5, 60)[0] == 'v1'
+    assert cache.stats()['project_scan']['refresh_error'] == 1
+
+
+def test_miss_during_refresh_shares_the_refresh():
+    # /api/stats keeps the entry past /api/projects' hard TTL and refreshes it;
+    # a projects miss arriving meanwhile must wait for that load, not crash on it
+    cache, clock = make_cache()
+    loader = Loader(block=[2])
+    cache.get(KEY, loader, 5, 120)
+    clock.now = 90
+    assert cache.get(KEY, loader, 15, 120)[0] == 'v1'
+    assert loader.entered.wait(5)
+
+    results = []
+    miss = threading.Thread(target=lambda: results.append(cache.get(KEY, loader, 5, 60)))
+    miss.start()
+    wait_for(lambda: cache._flights.stats()['project_scan']['deduplicated'] == 1)
+    loader.release()
+    miss.join(5)
+
+    assert results == [('v2', 0)]
+    assert loader.calls == 2
+
+
+def test_hot_entry_refreshed_before_soft_ttl():
+    cache, clock = make_cache()
+    loader = Loader()
+    cache.get(KEY, loader, 10, 60)
+    for _ in range(HOT_HITS):
+        cache.get(KEY, loader, 10, 60)
+    clock.now = 7
+    cache.refresh_due()
+    assert loader.calls == 1
+    clock.now = 8
+    cache.refresh_due()
+    wait_for(idle(cache))
+    assert loader.calls == 2
+    assert cache.get(KEY, loader, 10, 60) == ('v2', 0)
+    assert cache.stats()['project_scan']['proactive_refresh'] == 1
+
+
+def test_unread_entry_evicted_after_hard_ttl():
+    cache, clock = make_cache()
+    loader = Loader()
+    cache.get(KEY, loader, 5, 60)
+    clock.now = 61
+    cache.refresh_due()
+    assert loader.calls == 1
+    assert cache.stats()['project_scan']['entries'] == 0
+
+
+def test_disabled_always_loads():
+    cache = SwrCache(enabled=False)
+    loader = Loader()
+    cache.get(KEY, loader, 5, 60)
+    assert cache.get(KEY, loader, 5, 60) == ('v2', 0.0)